@@ -0,0 +1,47 @@
+"""
+Cancellation - Stop request work when the HTTP client goes away.
+"""
+
+import asyncio
+from collections.abc import Awaitable
+from typing import TypeVar
+
+from fastapi import HTTPException, Request
+
+T = TypeVar("T")
+
+# How often to check whether the client is still connected
+DISCONNECT_POLL_SECONDS = 0.5
+# Non-standard status used by nginx for requests the client abandoned
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def cancel_on_disconnect(request: Request, awaitable: Awaitable[T]) -> T:
+    """
+    Await request work, cancelling it if the client disconnects first.
+
+    Starlette keeps running a handler after its client is gone, so work that
+    costs upstream quota would otherwise complete for nobody.
+
+    Args:
+        request: Incoming request to watch
+        awaitable: Work done on behalf of the request
+
+    Returns:
+        Result of the awaitable
+
+    Raises:
+        HTTPException: 499 if the client disconnected
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
+    finally:
+        task.cancel()
@@ -0,0 +1,136 @@
+"""
+Control Socket - Persistent WebSocket session for play, skip, stop and volume commands.
+"""
+
+import asyncio
+import json
+import logging
+
+from fastapi import HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, ValidationError
+
+from app.models import ControlAction, ControlCommand, ControlReplyDTO, ControlReplyStatus, PlayCommand
+from app.services import discord_bot_service
+from app.services.deadline import Deadline
+from app.api.playback_errors import playback_http_error
+
+logger = logging.getLogger(__name__)
+
+# Status FastAPI answers REST requests with an invalid body with
+INVALID_COMMAND_STATUS = 422
+
+
+class ControlSession:
+    """
+    One WebSocket client sending control commands.
+
+    Every command is acknowledged as accepted right away and answered with
+    completed or failed once done, carrying the status code the REST endpoint
+    would have answered with. Play commands run concurrently and go through the
+    same bot manager queue as POST /discord-bot/play, so a newer play supersedes
+    an older one still synthesizing. Bot events are forwarded on the same
+    socket, so clients see playback start and finish without polling.
+    """
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self._send_lock = asyncio.Lock()
+        self._plays: set[asyncio.Task] = set()
+
+    async def run(self) -> None:
+        """
+        Serve the session until the client disconnects, then cancel its pending plays.
+        """
+        events = asyncio.create_task(self._forward_events())
+        try:
+            while True:
+                message = await self.websocket.receive_text()
+                await self._handle(message)
+        except WebSocketDisconnect:
+            logger.debug("Control socket client disconnected")
+        finally:
+            # Abandoned plays stop their synthesis like a disconnected REST client's
+            tasks = [events, *self._plays]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _handle(self, message: str) -> None:
+        try:
+            command = ControlCommand.model_validate_json(message)
+        except ValidationError as e:
+            await self._reply(
+                self._message_id(message),
+                ControlReplyStatus.failed,
+                INVALID_COMMAND_STATUS,
+                str(e)
+            )
+            return
+
+        if command.action == ControlAction.play and command.play is None:
+            await self._reply(command.id, ControlReplyStatus.failed, INVALID_COMMAND_STATUS, "play is required for the play action")
+            return
+        if command.action == ControlAction.volume and command.volume is None:
+            await self._reply(command.id, ControlReplyStatus.failed, INVALID_COMMAND_STATUS, "volume is required for the volume action")
+            return
+
+        await self._reply(command.id, ControlReplyStatus.accepted)
+        if command.action == ControlAction.play:
+            # Playback start can take seconds, keep reading commands meanwhile
+            task = asyncio.create_task(self._play(command.id, command.play))
+            self._plays.add(task)
+            task.add_done_callback(self._plays.discard)
+        else:
+            await self._control(command)
+
+    async def _play(self, command_id: str, play: PlayCommand) -> None:
+        manager = discord_bot_service.get_discord_bot_manager()
+        try:
+            await manager.play_audio(play, Deadline.after(play.timeout))
+        except Exception as e:
+            await self._fail(command_id, playback_http_error(e, play.timeout))
+            return
+        await self._reply(command_id, ControlReplyStatus.completed)
+
+    async def _control(self, command: ControlCommand) -> None:
+        manager = discord_bot_service.get_discord_bot_manager()
+        try:
+            if command.action == ControlAction.skip:
+                await manager.skip()
+            elif command.action == ControlAction.stop:
+                await manager.stop()
+            else:
+                await manager.set_volume(command.volume)
+        except Exception as e:
+            await self._fail(command.id, playback_http_error(e))
+            return
+        await self._reply(command.id, ControlReplyStatus.completed)
+
+    async def _forward_events(self) -> None:
+        manager = discord_bot_service.get_discord_bot_manager()
+        async for event in manager.stream_events():
+            await self._send(event)
+
+    async def _fail(self, command_id: str, error: HTTPException) -> None:
+        await self._reply(command_id, ControlReplyStatus.failed, error.status_code, error.detail)
+
+    async def _reply(self, command_id: str | None, reply_status: ControlReplyStatus, status_code: int | None = None, detail: str | None = None) -> None:
+        await self._send(ControlReplyDTO(id=command_id, status=reply_status, status_code=status_code, detail=detail))
+
+    async def _send(self, dto: BaseModel) -> None:
+        # Replies and events come from different tasks, frames must not interleave
+        async with self._send_lock:
+            try:
+                await self.websocket.send_text(dto.model_dump_json(by_alias=True))
+            except (WebSocketDisconnect, RuntimeError):
+                # The client is gone, run() cleans up once the receive loop notices
+                pass
+
+    @staticmethod
+    def _message_id(message: str) -> str | None:
+        """Best-effort command ID of an invalid message, so the client can match the failure."""
+        try:
+            command_id = json.loads(message).get("id")
+        except (ValueError, AttributeError):
+            return None
+        return command_id if isinstance(command_id, str) else None
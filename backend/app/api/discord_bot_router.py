@@ -2,21 +2,32 @@
 Discord Bot API Router - Endpoints for Discord bot operations.
 """
 
-from fastapi import APIRouter, HTTPException, status, File, UploadFile, Form
+from collections.abc import AsyncIterator
+from fastapi import APIRouter, HTTPException, Request, WebSocket, status, File, UploadFile, Form, Query
 import logging
 
 from app.models import (
     DiscordBotStatusDTO, 
+    ShardStatusDTO,
     VoiceChannelDTO, 
     ConnectBotCommand, 
     BotConfigResponseDTO,
-    PlayCommand
+    PlayCommand,
+    VolumeCommand
 )
 from app.services import discord_bot_service
+from app.services.deadline import Deadline
+from app.api.cancellation import cancel_on_disconnect
+from app.api.control_socket import ControlSession
+from app.api.playback_errors import playback_http_error
+from app.api.responses import EventSourceResponse, format_sse
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Comment line sent on idle event streams so proxies do not close them
+EVENT_STREAM_HEARTBEAT_SECONDS = 15
+
 router = APIRouter(prefix="/discord-bot", tags=["discord-bot"])
 
 
@@ -34,7 +45,7 @@ async def get_status() -> DiscordBotStatusDTO:
     """
     try:
         status_dto = await discord_bot_service.get_status()
-        logger.info(f"Discord bot status retrieved: connected={status_dto.connected}, channel_id={status_dto.channel_id}")
+        logger.debug(f"Discord bot status retrieved: connected={status_dto.connected}, channel_id={status_dto.channel_id}")
         return status_dto
         
     except Exception as e:
@@ -45,11 +56,75 @@ async def get_status() -> DiscordBotStatusDTO:
         )
 
 
+@router.get("/shards", response_model=list[ShardStatusDTO])
+async def list_shards() -> list[ShardStatusDTO]:
+    """
+    Get the status and gateway latency of every shard run by this process.
+    
+    Without sharding the bot is reported as shard 0 of 1.
+    
+    Returns:
+        list[ShardStatusDTO]: Shards ordered by ID
+        
+    Raises:
+        HTTPException:
+            - 503 Service Unavailable: If Discord bot is not initialized
+    """
+    try:
+        manager = discord_bot_service.get_discord_bot_manager()
+        return await manager.get_shards()
+    except Exception as e:
+        logger.error(f"Failed to get Discord shard status: {str(e)}")
+        if "not initialized" in str(e):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Discord bot is not ready"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get Discord shard status: {str(e)}"
+        )
+
+
+async def _bot_event_stream() -> AsyncIterator[bytes]:
+    manager = discord_bot_service.get_discord_bot_manager()
+    async for event in manager.stream_events(heartbeat_seconds=EVENT_STREAM_HEARTBEAT_SECONDS):
+        if event is None:
+            yield b": keep-alive\n\n"
+        else:
+            yield format_sse(event, event=event.type.value)
+
+
+@router.get("/events")
+async def stream_bot_events() -> EventSourceResponse:
+    """
+    Subscribe to bot and playback state changes as Server-Sent Events, instead of polling /status.
+    
+    The stream starts with a snapshot event of the current state. Then it sends
+    gateway ready/disconnected, voice connected/disconnected, playback
+    started/finished/failed and queue_changed events. Events are named after
+    their type, and each one carries the bot status after the change and the queue depth.
+    
+    Returns:
+        SSE stream of BotEventDTO events
+    """
+    return EventSourceResponse(_bot_event_stream())
+
+
 @router.get("/channels", response_model=list[VoiceChannelDTO])
-async def list_channels() -> list[VoiceChannelDTO]:
+async def list_channels(
+    guild_id: str | None = Query(None, alias="guildId", description="Only list channels of this guild"),
+    page: int = Query(1, ge=1, description="1-based page number, used with limit"),
+    limit: int | None = Query(None, ge=1, le=1000, description="Page size, all channels if omitted")
+) -> list[VoiceChannelDTO]:
     """
     List all available voice channels across all guilds.
     
+    Args:
+        guild_id: Only list channels of this guild
+        page: 1-based page number, used with limit
+        limit: Page size, all channels if omitted
+    
     Returns:
         list[VoiceChannelDTO]: List of available voice channels
         
@@ -60,7 +135,7 @@ async def list_channels() -> list[VoiceChannelDTO]:
     """
     try:
         manager = discord_bot_service.get_discord_bot_manager()
-        channels = await manager.list_channels()
+        channels = await manager.list_channels(guild_id=guild_id, page=page, limit=limit)
         logger.info(f"Listed {len(channels)} available voice channels")
         return channels
         
@@ -177,6 +252,42 @@ async def disconnect_bot() -> DiscordBotStatusDTO:
             )
 
 
+async def read_avatar_upload(avatar: UploadFile | None) -> bytes | None:
+    """
+    Read and validate an uploaded avatar image.
+    
+    Args:
+        avatar: Uploaded file, None if no avatar was given
+        
+    Returns:
+        Image bytes or None
+        
+    Raises:
+        HTTPException:
+            - 400 Bad Request: If the file is not a JPEG or PNG image or larger than 2MB
+    """
+    if not avatar:
+        return None
+    
+    # Validate file type
+    if not avatar.content_type or avatar.content_type not in ["image/jpeg", "image/png"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Avatar must be a JPEG or PNG image"
+        )
+    
+    # Read avatar file
+    avatar_bytes = await avatar.read()
+    
+    # Validate file size (2MB limit)
+    if len(avatar_bytes) > 2 * 1024 * 1024:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Avatar file size must not exceed 2MB"
+        )
+    return avatar_bytes
+
+
 @router.patch("/config", response_model=BotConfigResponseDTO)
 async def update_bot_config(
     nickname: str = Form(..., min_length=1, max_length=32),
@@ -185,12 +296,14 @@ async def update_bot_config(
     """
     Update bot configuration (server nickname and avatar).
     
+    For bots in many guilds, POST /jobs/bot-config runs the same update in the background with progress.
+    
     Args:
         nickname: New bot nickname for all servers (1-32 characters)
         avatar: Optional avatar image file (jpg/png, max 2MB)
         
     Returns:
-        BotConfigResponseDTO: Updated bot configuration
+        BotConfigResponseDTO: Updated bot configuration with per-guild counts
         
     Raises:
         HTTPException:
@@ -206,24 +319,7 @@ async def update_bot_config(
                 detail="Bot nickname must be between 1 and 32 characters"
             )
         
-        avatar_bytes = None
-        if avatar:
-            # Validate file type
-            if not avatar.content_type or avatar.content_type not in ["image/jpeg", "image/png"]:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Avatar must be a JPEG or PNG image"
-                )
-            
-            # Read avatar file
-            avatar_bytes = await avatar.read()
-            
-            # Validate file size (2MB limit)
-            if len(avatar_bytes) > 2 * 1024 * 1024:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Avatar file size must not exceed 2MB"
-                )
+        avatar_bytes = await read_avatar_upload(avatar)
         
         manager = discord_bot_service.get_discord_bot_manager()
         result = await manager.update_config(nickname.strip(), avatar_bytes)
@@ -259,12 +355,13 @@ async def update_bot_config(
 
 
 @router.post("/play", status_code=status.HTTP_202_ACCEPTED)
-async def play(command: PlayCommand):
+async def play(command: PlayCommand, request: Request):
     """
-    Play audio in the currently connected voice channel.
+    Play audio in the currently connected voice channel, or in command.channel_id,
+    connecting to it on demand.
     
     Args:
-        command: PlayCommand with voice_id and text
+        command: PlayCommand with voice_id, text and optionally channel_id
         
     Returns:
         202 Accepted: Request accepted for processing
@@ -273,48 +370,92 @@ async def play(command: PlayCommand):
         HTTPException:
             - 400 Bad Request: Invalid input data
             - 404 Not Found: Voice not found
-            - 409 Conflict: Bot not connected to voice channel
+            - 409 Conflict: Bot not connected to voice channel, or superseded by a newer play request
+            - 429 Too Many Requests: Character quota nearly exhausted and the audio is not cached
+            - 499 Client Closed Request: Client disconnected, synthesis was cancelled
             - 500 Internal Server Error: TTS generation or playback failed
+            - 504 Gateway Timeout: Playback did not start within command.timeout seconds
     """
+    # One budget for the whole request: TTS queueing, synthesis, download and playback start
+    deadline = Deadline.after(command.timeout)
     try:
-        await discord_bot_service.play_audio(command)
+        await cancel_on_disconnect(request, discord_bot_service.play_audio(command, deadline))
         logger.info(f"Audio playback started for voice_id={command.voice_id}")
         
-    except ValueError as e:
-        # Handle validation errors and voice not found
-        error_message = str(e)
-        if "voice" in error_message.lower() and "not found" in error_message.lower():
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=error_message
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=error_message
-            )
     except Exception as e:
-        error_message = str(e)
-        logger.error(f"Failed to play audio: {error_message}")
+        raise playback_http_error(e, command.timeout)
+
+
+@router.post("/skip", response_model=DiscordBotStatusDTO)
+async def skip() -> DiscordBotStatusDTO:
+    """
+    Stop the audio playing now. Audio still being synthesized plays when ready.
+    
+    Returns:
+        DiscordBotStatusDTO: Bot status after skipping
         
-        # Map specific errors to appropriate HTTP status codes
-        if "not connected" in error_message.lower():
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Bot is not connected to a voice channel"
-            )
-        elif "not initialized" in error_message.lower() or "not ready" in error_message.lower():
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Discord bot is not ready"
-            )
-        elif "rate limit" in error_message.lower():
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="API rate limit exceeded"
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to play audio: {error_message}"
-            ) 
\ No newline at end of file
+    Raises:
+        HTTPException:
+            - 409 Conflict: Bot not connected to voice channel
+            - 503 Service Unavailable: If Discord bot is not ready
+    """
+    try:
+        manager = discord_bot_service.get_discord_bot_manager()
+        await manager.skip()
+        return await manager.get_status()
+    except Exception as e:
+        raise playback_http_error(e)
+
+
+@router.post("/stop", response_model=DiscordBotStatusDTO)
+async def stop() -> DiscordBotStatusDTO:
+    """
+    Stop the audio playing now and cancel audio still being synthesized.
+    
+    Returns:
+        DiscordBotStatusDTO: Bot status after stopping
+        
+    Raises:
+        HTTPException:
+            - 409 Conflict: Bot not connected to voice channel
+            - 503 Service Unavailable: If Discord bot is not ready
+    """
+    try:
+        manager = discord_bot_service.get_discord_bot_manager()
+        await manager.stop()
+        return await manager.get_status()
+    except Exception as e:
+        raise playback_http_error(e)
+
+
+@router.put("/volume", response_model=VolumeCommand)
+async def set_volume(command: VolumeCommand) -> VolumeCommand:
+    """
+    Set the playback volume, including for the audio playing now.
+    
+    Args:
+        command: VolumeCommand with volume from 0.0 (muted) to 2.0, 1.0 plays audio as synthesized
+        
+    Returns:
+        VolumeCommand: The new volume
+    """
+    try:
+        manager = discord_bot_service.get_discord_bot_manager()
+        return VolumeCommand(volume=await manager.set_volume(command.volume))
+    except Exception as e:
+        raise playback_http_error(e)
+
+
+@router.websocket("/control")
+async def control(websocket: WebSocket):
+    """
+    Persistent control channel for clients sending many commands, e.g. soundboards.
+    
+    Send ControlCommand JSON messages with a client-chosen id and action play,
+    skip, stop or volume. Every command is answered with an accepted reply
+    and then a completed or failed reply with the status code the REST endpoint
+    would return. Bot events, as on /events, are sent on the same socket and are
+    told apart from replies by their type.
+    """
+    await websocket.accept()
+    await ControlSession(websocket).run()
@@ -0,0 +1,158 @@
+"""
+Jobs API Router - Endpoints for background voice design and creation.
+"""
+
+from collections.abc import AsyncIterator
+from fastapi import APIRouter, HTTPException, status, File, UploadFile, Form
+from app.models import JobDTO, DesignVoiceCommand, CreateVoiceCommand
+from app.services.voice_service import submit_design_voice_job, submit_create_voice_job
+from app.services.job_service import get_job_manager
+from app.services import discord_bot_service
+from app.api.discord_bot_router import read_avatar_upload
+from app.api.responses import EventSourceResponse, format_sse
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.post("/design", response_model=JobDTO, status_code=status.HTTP_202_ACCEPTED)
+async def submit_design_job(command: DesignVoiceCommand) -> JobDTO:
+    """
+    Start a voice design in the background.
+    
+    Args:
+        command: DesignVoiceCommand with prompt, sample_text, loudness, and creativity
+        
+    Returns:
+        JobDTO: Pending job; poll /jobs/{id} or subscribe to /jobs/{id}/events for the previews
+        
+    Raises:
+        HTTPException:
+            - 503 Service Unavailable: If the job queue is full
+    """
+    try:
+        return await submit_design_voice_job(command)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+
+
+@router.post("/voices", response_model=JobDTO, status_code=status.HTTP_202_ACCEPTED)
+async def submit_create_voice_job_endpoint(command: CreateVoiceCommand) -> JobDTO:
+    """
+    Start creating a voice from a selected preview in the background.
+    
+    Args:
+        command: CreateVoiceCommand with voice_name, voice_description, and generated_voice_id
+        
+    Returns:
+        JobDTO: Pending job; poll /jobs/{id} or subscribe to /jobs/{id}/events for the created voice
+        
+    Raises:
+        HTTPException:
+            - 503 Service Unavailable: If the job queue is full
+    """
+    try:
+        return await submit_create_voice_job(command)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+
+
+@router.post("/bot-config", response_model=JobDTO, status_code=status.HTTP_202_ACCEPTED)
+async def submit_bot_config_job(
+    nickname: str = Form(..., min_length=1, max_length=32),
+    avatar: UploadFile = File(None)
+) -> JobDTO:
+    """
+    Start updating the bot nickname and avatar on all servers in the background.
+    
+    Args:
+        nickname: New bot nickname for all servers (1-32 characters)
+        avatar: Optional avatar image file (jpg/png, max 2MB)
+        
+    Returns:
+        JobDTO: Pending job; its progress follows the nickname updates, the result is a BotConfigResponseDTO
+        
+    Raises:
+        HTTPException:
+            - 400 Bad Request: If validation fails
+            - 503 Service Unavailable: If the Discord bot is not ready or the job queue is full
+    """
+    avatar_bytes = await read_avatar_upload(avatar)
+    try:
+        manager = discord_bot_service.get_discord_bot_manager()
+        return await manager.submit_update_config_job(nickname.strip(), avatar_bytes)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+    except Exception as e:
+        if "not initialized" in str(e) or "not ready" in str(e):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Discord bot is not ready"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/{job_id}", response_model=JobDTO)
+async def get_job(job_id: str) -> JobDTO:
+    """
+    Get the status and, once finished, the result of a job.
+    
+    Args:
+        job_id: ID of the job
+        
+    Returns:
+        JobDTO: Current job state
+        
+    Raises:
+        HTTPException:
+            - 404 Not Found: Unknown or expired job
+    """
+    job = await get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with ID {job_id} not found"
+        )
+    return job
+
+
+async def _job_event_stream(job_id: str) -> AsyncIterator[bytes]:
+    async for job in get_job_manager().subscribe(job_id):
+        yield format_sse(job, event=job.status.value)
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str) -> EventSourceResponse:
+    """
+    Subscribe to job state changes as Server-Sent Events.
+    
+    The stream sends the current state immediately, then one event per change,
+    and closes after the job succeeds or fails. Events are named after the status.
+    
+    Args:
+        job_id: ID of the job
+        
+    Returns:
+        SSE stream of JobDTO events
+        
+    Raises:
+        HTTPException:
+            - 404 Not Found: Unknown or expired job
+    """
+    if await get_job_manager().get(job_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with ID {job_id} not found"
+        )
+    return EventSourceResponse(_job_event_stream(job_id))
@@ -0,0 +1,33 @@
+"""
+Metrics API Router - Endpoints for runtime metrics.
+"""
+
+import asyncio
+from fastapi import APIRouter
+from app.models import RuntimeMetricsDTO, QuotaStatusDTO
+from app.services.metrics import get_metrics_registry
+from app.services.quota_service import get_quota_ledger
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/runtime", response_model=RuntimeMetricsDTO)
+async def get_runtime_metrics() -> RuntimeMetricsDTO:
+    """
+    Get in-process counters for upstream usage and runtime behaviour.
+    
+    Returns:
+        RuntimeMetricsDTO: Snapshot of all counters since startup
+    """
+    return get_metrics_registry().snapshot()
+
+
+@router.get("/quota", response_model=QuotaStatusDTO)
+async def get_quota_status() -> QuotaStatusDTO:
+    """
+    Get ElevenLabs character usage against the configured budgets.
+    
+    Returns:
+        QuotaStatusDTO: Usage per budget and whether /play is limited to cached audio
+    """
+    return await asyncio.to_thread(get_quota_ledger().status)
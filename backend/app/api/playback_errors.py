@@ -0,0 +1,87 @@
+"""
+Playback Errors - Map playback failures to HTTP status codes for every control API.
+"""
+
+import logging
+
+from fastapi import HTTPException, status
+
+from app.services.deadline import DeadlineExceededError, OperationCancelledError
+from app.services.quota_service import QuotaExceededError
+
+logger = logging.getLogger(__name__)
+
+
+def playback_http_error(error: Exception, timeout: int | None = None) -> HTTPException:
+    """
+    Translate an error from play, skip, stop or volume into the HTTP error the REST API answers with.
+
+    The WebSocket control channel reports the same status codes, so clients
+    handle failures the same way whichever transport they use.
+
+    Args:
+        error: Error raised by the Discord bot manager
+        timeout: Playback start timeout of the request, for the 504 message
+
+    Returns:
+        HTTPException to raise or report
+    """
+    if isinstance(error, HTTPException):
+        return error
+    if isinstance(error, DeadlineExceededError):
+        return HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"Playback did not start within {timeout}s: {str(error)}"
+        )
+    if isinstance(error, OperationCancelledError):
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Playback request was cancelled: {error.reason}"
+        )
+    if isinstance(error, QuotaExceededError):
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(error)
+        )
+
+    error_message = str(error)
+    if isinstance(error, ValueError):
+        # Handle validation errors and voice not found
+        if "voice" in error_message.lower() and "not found" in error_message.lower():
+            return HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=error_message
+            )
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_message
+        )
+
+    logger.error(f"Failed to play audio: {error_message}")
+
+    # Map specific errors to appropriate HTTP status codes
+    if "not connected" in error_message.lower():
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Bot is not connected to a voice channel"
+        )
+    elif "not initialized" in error_message.lower() or "not ready" in error_message.lower():
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Discord bot is not ready"
+        )
+    elif "rate limit" in error_message.lower():
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="API rate limit exceeded"
+        )
+    elif "temporarily unavailable" in error_message.lower():
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="ElevenLabs API is temporarily unavailable"
+        )
+    else:
+        return HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to play audio: {error_message}"
+        )
@@ -1,6 +1,9 @@
+from collections.abc import AsyncIterator, Callable
 from fastapi import APIRouter, HTTPException
-from app.models import PromptImprovementCommand, PromptImprovementResponseDTO, GenerateSampleTextCommand, GenerateSampleTextResponseDTO, TranslateVoiceDescriptionCommand, TranslateVoiceDescriptionResponseDTO
+from pydantic import BaseModel
+from app.models import PromptImprovementCommand, PromptImprovementResponseDTO, GenerateSampleTextCommand, GenerateSampleTextResponseDTO, TranslateVoiceDescriptionCommand, TranslateVoiceDescriptionResponseDTO, TextDeltaDTO, StreamErrorDTO
 from app.services import prompt_service
+from app.api.responses import EventSourceResponse, format_sse
 
 router = APIRouter(prefix="/prompts", tags=["prompts"])
 
@@ -86,4 +89,74 @@ async def translate_voice_description(cmd: TranslateVoiceDescriptionCommand) ->
         if "External API failure" in str(e):
             raise HTTPException(status_code=503, detail="External AI service unavailable")
         else:
-            raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+            raise HTTPException(status_code=500, detail="Internal server error")
+
+
+async def _prompt_event_stream(deltas: AsyncIterator[str], to_response: Callable[[str], BaseModel]) -> AsyncIterator[bytes]:
+    """
+    Forward text deltas as SSE "delta" events and finish with a "done" event.
+    
+    The "done" event carries the same DTO as the non-streaming endpoint. Errors
+    after the stream has started are reported as an "error" event.
+    """
+    parts = []
+    try:
+        async for delta in deltas:
+            parts.append(delta)
+            yield format_sse(TextDeltaDTO(delta=delta), event="delta")
+        yield format_sse(to_response("".join(parts).strip()), event="done")
+    
+    except Exception as e:
+        detail = "External AI service unavailable" if "External API failure" in str(e) else "Internal server error"
+        yield format_sse(StreamErrorDTO(detail=detail), event="error")
+
+
+@router.post("/improve/stream")
+async def improve_prompt_stream(cmd: PromptImprovementCommand) -> EventSourceResponse:
+    """
+    Improve a prompt, streaming the text as Server-Sent Events while it is generated.
+    
+    Args:
+        cmd: Command containing the prompt to improve
+        
+    Returns:
+        SSE stream of "delta" events followed by a "done" event with PromptImprovementResponseDTO
+    """
+    return EventSourceResponse(_prompt_event_stream(
+        prompt_service.stream_improve_prompt(cmd),
+        lambda text: PromptImprovementResponseDTO(improved_prompt=text)
+    ))
+
+
+@router.post("/generate-sample-text/stream")
+async def generate_sample_text_stream(cmd: GenerateSampleTextCommand) -> EventSourceResponse:
+    """
+    Generate sample text, streaming it as Server-Sent Events while it is generated.
+    
+    Args:
+        cmd: Command containing the voice description
+        
+    Returns:
+        SSE stream of "delta" events followed by a "done" event with GenerateSampleTextResponseDTO
+    """
+    return EventSourceResponse(_prompt_event_stream(
+        prompt_service.stream_generate_sample_text(cmd),
+        lambda text: GenerateSampleTextResponseDTO(sample_text=text)
+    ))
+
+
+@router.post("/translate-voice-description/stream")
+async def translate_voice_description_stream(cmd: TranslateVoiceDescriptionCommand) -> EventSourceResponse:
+    """
+    Translate a voice description, streaming the translation as Server-Sent Events.
+    
+    Args:
+        cmd: Command containing the voice description to translate
+        
+    Returns:
+        SSE stream of "delta" events followed by a "done" event with TranslateVoiceDescriptionResponseDTO
+    """
+    return EventSourceResponse(_prompt_event_stream(
+        prompt_service.stream_translate_voice_description(cmd),
+        lambda text: TranslateVoiceDescriptionResponseDTO(translated_description=text)
+    ))
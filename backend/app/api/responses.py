@@ -0,0 +1,53 @@
+"""
+Response classes shared by the API routers.
+"""
+
+from collections.abc import AsyncIterator
+from typing import Any
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+
+# Compiled once; dispatches to each DTO's precompiled pydantic-core serializer
+_TRUSTED_ADAPTER: TypeAdapter[Any] = TypeAdapter(Any)
+
+
+class TrustedJSONResponse(JSONResponse):
+    """
+    JSON response for DTOs built from already-validated data.
+    
+    Returning a response instance makes FastAPI skip the response_model
+    re-validation, and the DTOs are serialized straight to camelCase JSON bytes.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return _TRUSTED_ADAPTER.dump_json(content, by_alias=True)
+
+
+class EventSourceResponse(StreamingResponse):
+    """
+    Server-Sent Events response for an async iterator of formatted events.
+    """
+    
+    media_type = "text/event-stream"
+    
+    def __init__(self, content: AsyncIterator[bytes], **kwargs: Any):
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        headers.update(kwargs.pop("headers", None) or {})
+        super().__init__(content, headers=headers, **kwargs)
+
+
+def format_sse(data: BaseModel, event: str | None = None) -> bytes:
+    """
+    Format a DTO as a single Server-Sent Event.
+    
+    Args:
+        data: DTO serialized as camelCase JSON into the data field
+        event: Optional event name
+        
+    Returns:
+        Encoded event terminated by a blank line
+    """
+    payload = data.model_dump_json(by_alias=True)
+    if event:
+        return f"event: {event}\ndata: {payload}\n\n".encode("utf-8")
+    return f"data: {payload}\n\n".encode("utf-8")
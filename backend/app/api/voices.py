@@ -2,10 +2,15 @@
 Voices API Router - Endpoints for voice management operations.
 """
 
-from fastapi import APIRouter, HTTPException, status
+import asyncio
+from collections.abc import AsyncIterator
+from fastapi import APIRouter, HTTPException, Query, status
 from typing import List
-from app.models import ListVoicesResponseDTO, VoiceDetailDTO, CreateVoiceCommand, VoiceDTO, DesignVoiceCommand, DesignVoiceResponseDTO
-from app.services.voice_service import list_voices, create_elevenlabs_client, create_voice, design_voice, delete_voice
+from app.models import ListVoicesResponseDTO, VoiceDetailDTO, CreateVoiceCommand, VoiceDTO, DesignVoiceCommand, DesignVoiceResponseDTO, VoiceChangesResponseDTO, DesignWizardCommand, StreamErrorDTO
+from app.services.voice_service import list_voices, create_elevenlabs_client, create_voice, design_voice, delete_voice, get_voice_changes, run_design_wizard, design_voice_variants, stream_design_voice_variants
+from app.services.voice_catalog import get_voice_catalog
+from app.services.quota_service import QuotaExceededError
+from app.api.responses import TrustedJSONResponse, EventSourceResponse, format_sse
 
 router = APIRouter(prefix="/voices", tags=["voices"])
 
@@ -28,11 +33,11 @@ async def get_voices() -> ListVoicesResponseDTO:
         # Create ElevenLabs client
         client = create_elevenlabs_client()
         
-        # Retrieve voices from ElevenLabs API
-        voices = list_voices(client)
+        # Retrieve voices from ElevenLabs API, with the catalog version they were synced into
+        voices, version = await asyncio.to_thread(lambda: (list_voices(client), get_voice_catalog().version))
         
-        # Return response
-        return ListVoicesResponseDTO(items=voices)
+        # Return response (DTOs are built from validated data, skip response_model re-validation)
+        return TrustedJSONResponse(ListVoicesResponseDTO(items=voices, version=version))
         
     except ValueError as e:
         # Handle configuration errors (missing API key, invalid response format)
@@ -48,7 +53,7 @@ async def get_voices() -> ListVoicesResponseDTO:
         if "timeout" in error_message.lower():
             status_code = status.HTTP_504_GATEWAY_TIMEOUT
             detail = "ElevenLabs API request timed out"
-        elif "network" in error_message.lower() or "connection" in error_message.lower():
+        elif "network" in error_message.lower() or "connection" in error_message.lower() or "temporarily unavailable" in error_message.lower():
             status_code = status.HTTP_503_SERVICE_UNAVAILABLE
             detail = "ElevenLabs API is temporarily unavailable"
         elif "unauthorized" in error_message.lower() or "401" in error_message:
@@ -73,28 +78,75 @@ async def get_voices() -> ListVoicesResponseDTO:
         )
 
 
+@router.get("/changes", response_model=VoiceChangesResponseDTO)
+async def get_voice_changes_endpoint(since: int = Query(0, ge=0, description="Catalog version the client already has")) -> VoiceChangesResponseDTO:
+    """
+    Retrieve only the voices added, updated or deleted since a catalog version.
+    
+    Args:
+        since: Catalog version returned by a previous listing (0 for everything)
+        
+    Returns:
+        VoiceChangesResponseDTO: Current catalog version with changed and deleted voices
+        
+    Raises:
+        HTTPException:
+            - 400 Bad Request: Invalid catalog version
+            - 500 Internal Server Error: If the catalog could not be loaded
+    """
+    try:
+        client = create_elevenlabs_client()
+        return TrustedJSONResponse(await asyncio.to_thread(get_voice_changes, client, since))
+        
+    except ValueError as e:
+        error_message = str(e)
+        if "api key" in error_message.lower():
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Configuration error: {error_message}"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_message
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve voice changes: {str(e)}"
+        )
+
+
 @router.post("/design", response_model=DesignVoiceResponseDTO, status_code=status.HTTP_200_OK)
 async def design_voice_endpoint(command: DesignVoiceCommand) -> DesignVoiceResponseDTO:
     """
     Design a voice and return previews for user selection.
     
     Args:
-        command: DesignVoiceCommand with prompt, sample_text, loudness, and creativity
+        command: DesignVoiceCommand with prompt, sample_text, loudness, and creativity,
+            or a list of variants designed concurrently
         
     Returns:
-        DesignVoiceResponseDTO: Voice previews with audio samples
+        DesignVoiceResponseDTO: Voice previews with audio samples (merged across variants)
         
     Raises:
         HTTPException:
             - 400 Bad Request: Invalid input data
+            - 429 Too Many Requests: Character quota nearly exhausted
             - 500 Internal Server Error: ElevenLabs API error or internal error
             - 503 Service Unavailable: Rate limit exceeded
     """
     try:
-        # Call voice service to design voice
-        response = design_voice(command)
+        # Call voice service to design voice, fanning out when variants are requested
+        if command.variants:
+            return await design_voice_variants(command)
+        response = await asyncio.to_thread(design_voice, command)
         return response
         
+    except QuotaExceededError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e)
+        )
     except ValueError as e:
         # Handle validation errors and ElevenLabs API issues
         error_message = str(e)
@@ -130,6 +182,9 @@ async def design_voice_endpoint(command: DesignVoiceCommand) -> DesignVoiceRespo
         elif "rate limit" in error_message.lower() or "429" in error_message:
             status_code = status.HTTP_503_SERVICE_UNAVAILABLE
             detail = "ElevenLabs API rate limit exceeded"
+        elif "temporarily unavailable" in error_message.lower():
+            status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+            detail = "ElevenLabs API is temporarily unavailable"
         else:
             status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
             detail = f"Failed to design voice: {error_message}"
@@ -140,6 +195,82 @@ async def design_voice_endpoint(command: DesignVoiceCommand) -> DesignVoiceRespo
         )
 
 
+async def _design_variants_event_stream(command: DesignVoiceCommand) -> AsyncIterator[bytes]:
+    """
+    Format each finished design variant as an SSE "variant" event, then the merged set as "done".
+    """
+    previews = []
+    text = ""
+    try:
+        async for response in stream_design_voice_variants(command):
+            previews.extend(response.previews)
+            text = text or response.text
+            yield format_sse(response, event="variant")
+        yield format_sse(DesignVoiceResponseDTO(previews=previews, text=text), event="done")
+    
+    except Exception as e:
+        error_message = str(e)
+        if "rate limit" in error_message.lower() or "429" in error_message:
+            detail = "ElevenLabs API rate limit exceeded"
+        else:
+            detail = f"Failed to design voice: {error_message}"
+        yield format_sse(StreamErrorDTO(detail=detail), event="error")
+
+
+@router.post("/design/stream")
+async def design_voice_stream_endpoint(command: DesignVoiceCommand) -> EventSourceResponse:
+    """
+    Design all requested variants concurrently and stream each preview set as it is ready.
+    
+    Args:
+        command: DesignVoiceCommand, optionally with a list of loudness/creativity variants
+        
+    Returns:
+        SSE stream of "variant" events (DesignVoiceResponseDTO per variant) and a final
+        "done" event with all previews merged
+    """
+    return EventSourceResponse(_design_variants_event_stream(command))
+
+
+async def _design_wizard_event_stream(command: DesignWizardCommand) -> AsyncIterator[bytes]:
+    """
+    Format design wizard stages as SSE events named after the stage.
+    
+    Failures after the stream has started are reported as an "error" event.
+    """
+    try:
+        async for stage in run_design_wizard(command):
+            yield format_sse(stage, event=stage.stage.value)
+    
+    except Exception as e:
+        error_message = str(e)
+        if "External API failure" in error_message:
+            detail = "External AI service unavailable"
+        elif "rate limit" in error_message.lower() or "429" in error_message:
+            detail = "ElevenLabs API rate limit exceeded"
+        else:
+            detail = f"Failed to design voice: {error_message}"
+        yield format_sse(StreamErrorDTO(detail=detail), event="error")
+
+
+@router.post("/design/wizard")
+async def design_voice_wizard_endpoint(command: DesignWizardCommand) -> EventSourceResponse:
+    """
+    Improve, translate, generate sample text and design a voice in one request.
+    
+    Independent steps run concurrently and each finished stage is streamed back
+    as a Server-Sent Event named after it (improve_prompt, translate, sample_text,
+    design), so the UI can fill in fields while the design call is still running.
+    
+    Args:
+        command: DesignWizardCommand with the raw description and design settings
+        
+    Returns:
+        SSE stream of DesignWizardStageDTO events, the "design" event carrying the previews
+    """
+    return EventSourceResponse(_design_wizard_event_stream(command))
+
+
 @router.post("/", response_model=VoiceDTO, status_code=status.HTTP_201_CREATED)
 async def create_voice_endpoint(command: CreateVoiceCommand) -> VoiceDTO:
     """
@@ -159,7 +290,7 @@ async def create_voice_endpoint(command: CreateVoiceCommand) -> VoiceDTO:
     """
     try:
         # Call voice service to create voice
-        voice_dto = create_voice(command)
+        voice_dto = await asyncio.to_thread(create_voice, command)
         return voice_dto
         
     except ValueError as e:
@@ -197,6 +328,9 @@ async def create_voice_endpoint(command: CreateVoiceCommand) -> VoiceDTO:
         elif "rate limit" in error_message.lower() or "429" in error_message:
             status_code = status.HTTP_503_SERVICE_UNAVAILABLE
             detail = "ElevenLabs API rate limit exceeded"
+        elif "temporarily unavailable" in error_message.lower():
+            status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+            detail = "ElevenLabs API is temporarily unavailable"
         else:
             status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
             detail = f"Failed to create voice: {error_message}"
@@ -253,6 +387,9 @@ async def delete_voice_endpoint(voice_id: str):
         elif "rate limit" in error_message.lower() or "429" in error_message:
             status_code = status.HTTP_503_SERVICE_UNAVAILABLE
             detail = "ElevenLabs API rate limit exceeded"
+        elif "temporarily unavailable" in error_message.lower():
+            status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+            detail = "ElevenLabs API is temporarily unavailable"
         else:
             status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
             detail = f"Failed to delete voice: {error_message}"
@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import Any
+from typing import Any, Literal
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -45,6 +45,19 @@ class VoiceDetailDTO(CamelModel):
 
 class ListVoicesResponseDTO(CamelModel):
     items: list[VoiceDetailDTO]
+    version: int = 0  # catalog version to pass to /voices/changes
+
+
+class VoiceChangesResponseDTO(CamelModel):
+    version: int
+    full_sync: bool = False  # true when upserted holds the whole catalog
+    upserted: list[VoiceDetailDTO] = Field(default_factory=list)
+    deleted: list[str] = Field(default_factory=list)
+
+
+class DesignVariant(CamelModel):
+    loudness: float = Field(0.5, ge=-1.0, le=1.0, description="Volume level (-1 to 1, 0 is roughly -24 LUFS)")
+    creativity: float = Field(5.0, ge=0.0, le=100.0, description="Guidance scale (0-100, lower = more creative)")
 
 
 class DesignVoiceCommand(CamelModel):
@@ -52,6 +65,7 @@ class DesignVoiceCommand(CamelModel):
     sample_text: str = Field(None, min_length=100, max_length=1000, description="Sample text for voice generation (100-1000 characters), optional - will auto-generate if not provided")
     loudness: float = Field(0.5, ge=-1.0, le=1.0, description="Volume level (-1 to 1, 0 is roughly -24 LUFS)")
     creativity: float = Field(5.0, ge=0.0, le=100.0, description="Guidance scale (0-100, lower = more creative)")
+    variants: list[DesignVariant] | None = Field(None, min_length=1, max_length=8, description="Loudness/creativity pairs designed concurrently, optional - overrides loudness and creativity")
 
 
 class VoicePreviewDTO(CamelModel):
@@ -59,6 +73,9 @@ class VoicePreviewDTO(CamelModel):
     audio_base64: str
     media_type: str
     duration_secs: float
+    loudness: float | None = None  # settings the preview was designed with
+    creativity: float | None = None
+    text: str | None = None  # text the preview speaks
 
 
 class DesignVoiceResponseDTO(CamelModel):
@@ -66,15 +83,64 @@ class DesignVoiceResponseDTO(CamelModel):
     text: str
 
 
+class WizardStage(str, Enum):
+    improve_prompt = 'improve_prompt'
+    translate = 'translate'
+    sample_text = 'sample_text'
+    design = 'design'
+
+
+class DesignWizardCommand(CamelModel):
+    prompt: str = Field(..., min_length=20, max_length=1000, description="Voice description, may be in Polish (20-1000 characters)")
+    sample_text: str | None = Field(None, min_length=100, max_length=1000, description="Sample text (100-1000 characters), optional - will be generated if not provided")
+    improve_prompt: bool = Field(True, description="Improve the description before designing")
+    translate: bool = Field(True, description="Translate the description to English before designing")
+    loudness: float = Field(0.5, ge=-1.0, le=1.0, description="Volume level (-1 to 1, 0 is roughly -24 LUFS)")
+    creativity: float = Field(5.0, ge=0.0, le=100.0, description="Guidance scale (0-100, lower = more creative)")
+
+
+class DesignWizardStageDTO(CamelModel):
+    stage: WizardStage
+    text: str | None = None  # output of the improve_prompt, translate and sample_text stages
+    design: DesignVoiceResponseDTO | None = None  # output of the design stage
+
+
 class CreateVoiceCommand(CamelModel):
     voice_name: str = Field(..., min_length=1, max_length=100, description="Name for the new voice")
     voice_description: str = Field(..., min_length=20, max_length=1000, description="Description for the new voice (20-1000 characters)")
     generated_voice_id: str = Field(..., description="ID of the selected voice preview from design endpoint")
 
 
+# Background Jobs
+class JobKind(str, Enum):
+    design_voice = 'design_voice'
+    create_voice = 'create_voice'
+    update_bot_config = 'update_bot_config'
+
+
+class JobStatus(str, Enum):
+    pending = 'pending'
+    running = 'running'
+    succeeded = 'succeeded'
+    failed = 'failed'
+
+
+class JobDTO(CamelModel):
+    id: str
+    kind: JobKind
+    status: JobStatus
+    created_at: datetime
+    updated_at: datetime
+    progress: float | None = None  # 0-1 for jobs that report progress
+    # BotConfigResponseDTO is defined with the Discord models, resolved by model_rebuild below them
+    result: "DesignVoiceResponseDTO | VoiceDTO | BotConfigResponseDTO | None" = None
+    error: str | None = None
+
+
 # Prompt Improvement
 class PromptImprovementCommand(CamelModel):
     prompt: str = Field(..., min_length=1, max_length=1000, description="Prompt to improve (1-1000 characters)")
+    fresh: bool = Field(False, description="Skip the response cache and request a new variation")
 
 
 class PromptImprovementResponseDTO(CamelModel):
@@ -93,17 +159,34 @@ class GenerateSampleTextResponseDTO(CamelModel):
 # Translation
 class TranslateVoiceDescriptionCommand(CamelModel):
     voice_description: str = Field(..., min_length=1, max_length=1000, description="Voice description to translate to English (1-1000 characters)")
+    fresh: bool = Field(False, description="Skip the response cache and request a new translation")
 
 
 class TranslateVoiceDescriptionResponseDTO(CamelModel):
     translated_description: str
 
 
+# Streaming
+class TextDeltaDTO(CamelModel):
+    delta: str
+
+
+class StreamErrorDTO(CamelModel):
+    detail: str
+
+
 # Text-to-Speech
+class SpeechQuality(str, Enum):
+    auto = 'auto'
+    fast = 'fast'
+    high = 'high'
+
+
 class TextToSpeechCommand(CamelModel):
     voice_id: str
     text: str
     timeout: int = Field(default=30)
+    quality: SpeechQuality = SpeechQuality.auto
 
 
 class TextToSpeechResponseDTO(CamelModel):
@@ -127,6 +210,31 @@ class GenerationMetricsResponseDTO(CamelModel):
     total: int
 
 
+class RuntimeMetricsDTO(CamelModel):
+    counters: dict[str, float]
+
+
+# Character Quota
+class QuotaPeriod(str, Enum):
+    daily = "daily"
+    monthly = "monthly"
+
+
+class QuotaUsageDTO(CamelModel):
+    scope: str  # "overall" or a voice ID
+    period: QuotaPeriod
+    used: int
+    reserved: int  # estimated characters of requests still in flight
+    limit: int
+
+
+class QuotaStatusDTO(CamelModel):
+    degraded: bool  # overall budget nearly exhausted, only cached audio is played
+    usages: list[QuotaUsageDTO]
+    subscription_used: int | None = None
+    subscription_limit: int | None = None
+
+
 # Error Logs
 class ErrorLogDTO(CamelModel):
     id: str
@@ -149,9 +257,18 @@ class DiscordBotStatusDTO(CamelModel):
     channel_id: str | None = None
 
 
+class ShardStatusDTO(CamelModel):
+    id: int
+    shard_count: int
+    connected: bool
+    latency_ms: float | None = None  # gateway heartbeat round trip, None before the first heartbeat
+    guild_count: int = 0
+
+
 class VoiceChannelDTO(CamelModel):
     id: str
     name: str
+    guild_id: str | None = None
 
 
 class ConnectBotCommand(CamelModel):
@@ -166,8 +283,76 @@ class BotConfigCommand(CamelModel):
 class BotConfigResponseDTO(CamelModel):
     nickname: str
     avatar_url: str
+    updated_guilds: int = 0
+    skipped_guilds: int = 0  # nickname already matched
+    failed_guilds: int = 0  # missing permission or Discord error
+    avatar_updated: bool = False  # False if no avatar was given or it matched the last upload
+
+
+JobDTO.model_rebuild()
 
 
 class PlayCommand(CamelModel):
     voice_id: str
-    text: str 
\ No newline at end of file
+    text: str
+    timeout: int = Field(default=30, ge=1, le=300)  # seconds until playback must have started
+    quality: SpeechQuality = SpeechQuality.auto  # fast: low-latency model, high: long-form model
+    # Voice channel to play in, connected to on demand; None plays in the connected channel
+    channel_id: str | None = Field(default=None, pattern=r"^\d+$")
+
+
+# Largest playback volume, 1.0 plays audio as synthesized
+MAX_VOLUME = 2.0
+
+
+class VolumeCommand(CamelModel):
+    volume: float = Field(..., ge=0.0, le=MAX_VOLUME)
+
+
+class BotEventType(str, Enum):
+    snapshot = 'snapshot'  # current state, sent first on every subscription
+    gateway_ready = 'gateway_ready'
+    gateway_disconnected = 'gateway_disconnected'
+    voice_connected = 'voice_connected'
+    voice_disconnected = 'voice_disconnected'
+    playback_started = 'playback_started'
+    playback_finished = 'playback_finished'
+    playback_failed = 'playback_failed'
+    queue_changed = 'queue_changed'
+
+
+class BotEventDTO(CamelModel):
+    type: BotEventType
+    status: DiscordBotStatusDTO  # state after the event
+    queue_depth: int = 0  # play requests still synthesizing or waiting to start
+    guild_id: str | None = None
+    detail: str | None = None  # e.g. the error of a failed playback
+    created_at: datetime
+
+
+class ControlAction(str, Enum):
+    play = 'play'
+    skip = 'skip'  # stop the audio playing now
+    stop = 'stop'  # also cancel audio still being synthesized
+    volume = 'volume'
+
+
+class ControlCommand(CamelModel):
+    id: str = Field(..., min_length=1, max_length=64)  # chosen by the client, echoed in every reply
+    action: ControlAction
+    play: PlayCommand | None = None  # required for play
+    volume: float | None = Field(default=None, ge=0.0, le=MAX_VOLUME)  # required for volume
+
+
+class ControlReplyStatus(str, Enum):
+    accepted = 'accepted'  # valid, now running
+    completed = 'completed'  # done, for play: playback started
+    failed = 'failed'
+
+
+class ControlReplyDTO(CamelModel):
+    type: Literal['reply'] = 'reply'  # bot events on the same socket carry their event type instead
+    id: str | None = None  # None if the message could not be parsed
+    status: ControlReplyStatus
+    status_code: int | None = None  # HTTP status code the REST API would answer with
+    detail: str | None = None
@@ -0,0 +1,99 @@
+"""
+Audio Cache - Size-bounded cache of synthesized speech.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class AudioCache:
+    """
+    LRU cache of generated audio bounded by total size in bytes.
+
+    Repeated phrases are served without spending ElevenLabs characters, and it
+    is all /play can serve while the character quota is nearly exhausted.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(voice_id: str, model_id: str, text: str) -> str:
+        """
+        Build the cache key for a synthesis request.
+
+        Args:
+            voice_id: ElevenLabs voice ID
+            model_id: TTS model ID, different models produce different audio
+            text: Text to speak
+
+        Returns:
+            Hex digest identifying the request
+        """
+        key_source = "\x00".join([voice_id, model_id, text])
+        return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Get cached audio.
+
+        Args:
+            key: Key built with make_key
+
+        Returns:
+            Audio bytes or None if not cached
+        """
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+            return audio
+
+    def set(self, key: str, audio: bytes) -> None:
+        """
+        Store audio, evicting the least recently used entries beyond max_bytes.
+
+        Args:
+            key: Key built with make_key
+            audio: Audio bytes
+        """
+        if len(audio) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = audio
+            self._size += len(audio)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+_audio_cache: AudioCache | None = None
+
+
+def get_audio_cache() -> AudioCache:
+    """
+    Get the audio cache instance, bounded by AUDIO_CACHE_MAX_BYTES.
+
+    Returns:
+        AudioCache instance
+    """
+    global _audio_cache
+    if _audio_cache is None:
+        _audio_cache = AudioCache(max_bytes=int(os.getenv("AUDIO_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)))
+    return _audio_cache
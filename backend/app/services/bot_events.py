@@ -0,0 +1,70 @@
+"""
+Bot Events - Fan-out of Discord bot and playback state changes to subscribers.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Callable
+
+from app.models import BotEventDTO
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber before the oldest are dropped
+DEFAULT_SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class BotEventBroadcaster:
+    """
+    Delivers every published event to all current subscribers.
+
+    Each subscriber has its own bounded queue, so a slow client loses its
+    oldest events instead of holding up publishers or other clients. Every
+    event carries the full status, so a client that missed events is still
+    current after the next one. Used from the event loop only.
+    """
+
+    def __init__(self, queue_size: int = DEFAULT_SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: set[asyncio.Queue[BotEventDTO]] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: BotEventDTO) -> None:
+        """
+        Queue an event for every subscriber.
+
+        Args:
+            event: Event to deliver
+        """
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def subscribe(self, heartbeat_seconds: float | None = None, snapshot: Callable[[], BotEventDTO] | None = None) -> AsyncIterator[BotEventDTO | None]:
+        """
+        Yield events published after subscribing, until the consumer stops iterating.
+
+        Args:
+            heartbeat_seconds: Yield None after this long without events, e.g. to keep a connection alive
+            snapshot: Builds the first event from the current state. It is taken right as
+                the subscription starts, so no change falls between snapshot and events.
+
+        Yields:
+            BotEventDTO, or None as heartbeat
+        """
+        queue: asyncio.Queue[BotEventDTO] = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        try:
+            if snapshot is not None:
+                yield snapshot()
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            self._subscribers.discard(queue)
@@ -0,0 +1,504 @@
+"""
+Bot IPC - Command bus between API workers and the process that owns the Discord client.
+"""
+
+import asyncio
+import base64
+import concurrent.futures
+import itertools
+import json
+import logging
+import os
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+from app.models import (
+    BotConfigResponseDTO,
+    BotEventDTO,
+    DiscordBotStatusDTO,
+    JobDTO,
+    JobKind,
+    PlayCommand,
+    ShardStatusDTO,
+    VoiceChannelDTO
+)
+from app.services.deadline import Deadline, DeadlineExceededError, OperationCancelledError
+from app.services.discord_bot_service import DiscordBotManager, validate_bot_config
+from app.services.job_service import get_job_manager
+from app.services.quota_service import QuotaExceededError
+from app.services.shared_state import SharedStateService, SharedStateSession
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IPC_PATH = "/tmp/voicebot-discord.sock"
+# Avatars travel base64-encoded within one message, leave room for a 2MB image
+MAX_MESSAGE_BYTES = 8 * 1024 * 1024
+# "not ready" makes the routers answer 503, as for a bot that is still starting
+BOT_PROCESS_UNAVAILABLE = "Discord bot not ready: bot process unavailable"
+# Longest a worker thread waits for the bot process to answer a shared state call
+THREADSAFE_CALL_TIMEOUT_SECONDS = 10.0
+
+
+def encode_error(error: Exception) -> dict[str, Any]:
+    """
+    Serialize an error raised by the bot manager for the other process.
+
+    Args:
+        error: Raised error
+
+    Returns:
+        JSON-able description keeping the type and message
+    """
+    if isinstance(error, DeadlineExceededError):
+        return {"type": "deadline", "stage": error.stage}
+    if isinstance(error, OperationCancelledError):
+        return {"type": "cancelled", "stage": error.stage, "reason": error.reason}
+    if isinstance(error, QuotaExceededError):
+        return {"type": "quota", "message": str(error)}
+    if isinstance(error, ValueError):
+        return {"type": "value", "message": str(error)}
+    return {"type": "error", "message": str(error)}
+
+
+def decode_error(data: dict[str, Any]) -> Exception:
+    """
+    Rebuild an error encoded with encode_error, so API error mapping works as with an in-process bot.
+
+    Args:
+        data: Encoded error
+
+    Returns:
+        Exception of the original type where known
+    """
+    error_type = data.get("type")
+    if error_type == "deadline":
+        return DeadlineExceededError(data["stage"])
+    if error_type == "cancelled":
+        return OperationCancelledError(data["stage"], data["reason"])
+    if error_type == "quota":
+        return QuotaExceededError(data["message"])
+    if error_type == "value":
+        return ValueError(data["message"])
+    return Exception(data.get("message", "Unknown bot process error"))
+
+
+def _to_json(result: Any) -> Any:
+    if isinstance(result, BaseModel):
+        return result.model_dump(mode="json")
+    if isinstance(result, list):
+        return [_to_json(item) for item in result]
+    return result
+
+
+def _write(writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+    # One message per line; a complete line is written at once, so concurrent senders never interleave
+    writer.write(json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n")
+
+
+class BotIPCServer:
+    """
+    Serves DiscordBotManager operations and the state shared by API workers over a Unix socket.
+
+    Messages are JSON lines. A request {"id", "method", "params"} is answered
+    with {"id", "result"} or {"id", "error"}, possibly preceded by
+    {"id", "progress"} messages, and {"id", "cancel": true} abandons it.
+    Subscriptions (subscribe, job_subscribe) send {"id", "event"} messages,
+    followed by a result once the subscribed stream ends.
+    Requests on one connection run concurrently, so a slow play does not
+    hold up a skip sent after it.
+    """
+
+    def __init__(self, manager: DiscordBotManager, path: str = DEFAULT_IPC_PATH):
+        self.manager = manager
+        self.path = path
+        self.state = SharedStateService()
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        """Start accepting API worker connections."""
+        if os.path.exists(self.path):
+            # Left behind by a previous bot process that did not shut down cleanly
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._serve, path=self.path, limit=MAX_MESSAGE_BYTES)
+        logger.info(f"Bot IPC server listening on {self.path}")
+
+    async def close(self) -> None:
+        """Stop accepting connections and remove the socket file."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        requests: dict[int, asyncio.Task] = {}
+        session = SharedStateSession()
+        try:
+            while line := await reader.readline():
+                message = json.loads(line)
+                request_id = message["id"]
+                if message.get("cancel"):
+                    task = requests.pop(request_id, None)
+                    if task is not None:
+                        task.cancel()
+                    continue
+                task = asyncio.create_task(self._run(request_id, message["method"], message.get("params") or {}, session, writer))
+                requests[request_id] = task
+                task.add_done_callback(lambda done, request_id=request_id: requests.pop(request_id, None))
+        except (ConnectionError, ValueError, KeyError) as e:
+            logger.warning(f"Bot IPC connection closed: {str(e)}")
+        finally:
+            # The API worker is gone, nobody waits for its requests any more
+            for task in requests.values():
+                task.cancel()
+            await asyncio.gather(*requests.values(), return_exceptions=True)
+            await self.state.close_session(session)
+            writer.close()
+
+    async def _run(self, request_id: int, method: str, params: dict[str, Any], session: SharedStateSession, writer: asyncio.StreamWriter) -> None:
+        try:
+            stream = self._stream(method, params)
+            if stream is not None:
+                async for event in stream:
+                    _write(writer, {"id": request_id, "event": _to_json(event)})
+                    await writer.drain()
+                _write(writer, {"id": request_id, "result": None})
+            else:
+                result = await self._dispatch(method, params, session, lambda progress: _write(writer, {"id": request_id, "progress": progress}))
+                _write(writer, {"id": request_id, "result": _to_json(result)})
+        except asyncio.CancelledError:
+            raise
+        except ConnectionError:
+            return
+        except Exception as e:
+            _write(writer, {"id": request_id, "error": encode_error(e)})
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    def _stream(self, method: str, params: dict[str, Any]) -> AsyncIterator[Any] | None:
+        if method == "subscribe":
+            return self.manager.stream_events()
+        return self.state.stream(method, params)
+
+    def _dispatch(self, method: str, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> Awaitable[Any]:
+        manager = self.manager
+        if method == "get_status":
+            return manager.get_status()
+        elif method == "get_shards":
+            return manager.get_shards()
+        elif method == "list_channels":
+            return manager.list_channels(params.get("guild_id"), params.get("page", 1), params.get("limit"))
+        elif method == "connect":
+            return manager.connect(params["channel_id"])
+        elif method == "disconnect":
+            return manager.disconnect()
+        elif method == "play_audio":
+            return manager.play_audio(PlayCommand.model_validate(params["command"]), Deadline.after(params["timeout"]))
+        elif method == "skip":
+            return manager.skip()
+        elif method == "stop":
+            return manager.stop()
+        elif method == "set_volume":
+            return manager.set_volume(params["volume"])
+        elif method == "update_config":
+            avatar_bytes = base64.b64decode(params["avatar"]) if params.get("avatar") else None
+            return manager.update_config(params["nickname"], avatar_bytes, on_progress=on_progress)
+        state_call = self.state.dispatch(method, params, session, on_progress)
+        if state_call is None:
+            raise ValueError(f"Unknown bot IPC method: {method}")
+        return state_call
+
+
+class RemoteDiscordBotManager:
+    """
+    Stand-in for DiscordBotManager in API workers while the bot runs in its own process.
+
+    Offers the manager methods the API uses and forwards them to the bot
+    worker's BotIPCServer. Errors come back with their original type and
+    message, so the routers answer exactly as with an in-process bot.
+    Cancelling a call, e.g. because the HTTP client disconnected, cancels it
+    in the bot process too.
+
+    It also carries the calls of the shared state stand-ins (see
+    shared_state), which worker threads make through call_threadsafe.
+    """
+
+    def __init__(self, path: str = DEFAULT_IPC_PATH):
+        self.path = path
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._connect_lock = asyncio.Lock()
+        self._pending: dict[int, tuple[asyncio.Future, Callable[[float], None] | None]] = {}
+        self._ids = itertools.count(1)
+        # Response readers and sent calls, referenced so they are not garbage collected while running
+        self._tasks: set[asyncio.Task] = set()
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Set the event loop that carries calls made from worker threads.
+
+        Args:
+            loop: Event loop of this API worker
+        """
+        self._loop = loop
+
+    async def shutdown(self) -> None:
+        """Close the connection to the bot process; the bot keeps running."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        try:
+            return await asyncio.open_unix_connection(self.path, limit=MAX_MESSAGE_BYTES)
+        except OSError as e:
+            raise Exception(f"{BOT_PROCESS_UNAVAILABLE}: {str(e)}") from e
+
+    async def _connection(self) -> asyncio.StreamWriter:
+        async with self._connect_lock:
+            if self._writer is None or self._writer.is_closing():
+                reader, writer = await self._open()
+                self._writer = writer
+                task = asyncio.create_task(self._read_responses(reader, writer))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            return self._writer
+
+    async def _read_responses(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                message = json.loads(line)
+                pending = self._pending.get(message["id"])
+                if pending is None:
+                    continue
+                future, on_progress = pending
+                if "progress" in message:
+                    if on_progress is not None:
+                        on_progress(message["progress"])
+                elif future.done():
+                    continue
+                elif "error" in message:
+                    future.set_exception(decode_error(message["error"]))
+                else:
+                    future.set_result(message.get("result"))
+        except (ConnectionError, ValueError, KeyError) as e:
+            logger.warning(f"Bot IPC connection lost: {str(e)}")
+        finally:
+            writer.close()
+            if self._writer is writer:
+                self._writer = None
+            # A restarted bot process has no record of these requests
+            for future, _ in list(self._pending.values()):
+                if not future.done():
+                    future.set_exception(Exception(f"{BOT_PROCESS_UNAVAILABLE}: connection lost"))
+
+    async def call(self, method: str, params: dict[str, Any] | None = None, on_progress: Callable[[float], None] | None = None) -> Any:
+        """
+        Call a bot process method and wait for its result.
+
+        Args:
+            method: IPC method name
+            params: Method parameters
+            on_progress: Called with each progress message
+
+        Returns:
+            JSON result of the method
+        """
+        writer = await self._connection()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = (future, on_progress)
+        try:
+            _write(writer, {"id": request_id, "method": method, "params": params or {}})
+            await writer.drain()
+            return await future
+        except asyncio.CancelledError:
+            if not writer.is_closing():
+                _write(writer, {"id": request_id, "cancel": True})
+            raise
+        except ConnectionError as e:
+            raise Exception(f"{BOT_PROCESS_UNAVAILABLE}: {str(e)}") from e
+        finally:
+            self._pending.pop(request_id, None)
+
+    def send(self, method: str, params: dict[str, Any] | None = None) -> None:
+        """
+        Call a bot process method without waiting for it.
+
+        Calls sent from the event loop reach the bot process in the order they were sent.
+
+        Args:
+            method: IPC method name
+            params: Method parameters
+        """
+        task = asyncio.create_task(self._send(method, params))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, method: str, params: dict[str, Any] | None) -> None:
+        try:
+            await self.call(method, params)
+        except Exception as e:
+            logger.warning(f"Bot IPC {method} failed: {str(e)}")
+
+    def submit_threadsafe(self, method: str, params: dict[str, Any] | None = None, on_progress: Callable[[float], None] | None = None) -> concurrent.futures.Future:
+        """
+        Start a bot process call from a worker thread, carried by the loop set with bind_loop.
+
+        Args:
+            method: IPC method name
+            params: Method parameters
+            on_progress: Called on the event loop with each progress message
+
+        Returns:
+            Future of the JSON result; cancelling it cancels the call
+
+        Raises:
+            RuntimeError: If called on the event loop itself, where waiting for the result would block it
+        """
+        if self._loop is None:
+            raise RuntimeError("Bot IPC is not bound to an event loop")
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            raise RuntimeError("Bot process state must be used from a worker thread, not the event loop")
+        return asyncio.run_coroutine_threadsafe(self.call(method, params, on_progress), self._loop)
+
+    def call_threadsafe(self, method: str, params: dict[str, Any] | None = None) -> Any:
+        """
+        Call a bot process method from a worker thread and wait for its result.
+
+        Args:
+            method: IPC method name
+            params: Method parameters
+
+        Returns:
+            JSON result of the method
+        """
+        future = self.submit_threadsafe(method, params)
+        try:
+            return future.result(THREADSAFE_CALL_TIMEOUT_SECONDS)
+        except concurrent.futures.TimeoutError as e:
+            future.cancel()
+            raise Exception(f"{BOT_PROCESS_UNAVAILABLE}: no answer to {method}") from e
+
+    async def get_status(self) -> DiscordBotStatusDTO:
+        try:
+            return DiscordBotStatusDTO.model_validate(await self.call("get_status"))
+        except Exception as e:
+            if BOT_PROCESS_UNAVAILABLE not in str(e):
+                raise
+            # Same answer as an in-process bot that has not started
+            logger.debug(str(e))
+            return DiscordBotStatusDTO(connected=False, channel_id=None)
+
+    async def get_shards(self) -> list[ShardStatusDTO]:
+        return [ShardStatusDTO.model_validate(shard) for shard in await self.call("get_shards")]
+
+    async def list_channels(self, guild_id: str | None = None, page: int = 1, limit: int | None = None) -> list[VoiceChannelDTO]:
+        channels = await self.call("list_channels", {"guild_id": guild_id, "page": page, "limit": limit})
+        return [VoiceChannelDTO.model_validate(channel) for channel in channels]
+
+    async def connect(self, channel_id: str) -> DiscordBotStatusDTO:
+        return DiscordBotStatusDTO.model_validate(await self.call("connect", {"channel_id": channel_id}))
+
+    async def disconnect(self) -> DiscordBotStatusDTO:
+        return DiscordBotStatusDTO.model_validate(await self.call("disconnect"))
+
+    async def play_audio(self, command: PlayCommand, deadline: Deadline | None = None) -> None:
+        # The bot process starts its own deadline with what is left of ours
+        timeout = deadline.remaining() if deadline is not None else command.timeout
+        await self.call("play_audio", {"command": command.model_dump(mode="json"), "timeout": timeout})
+
+    async def skip(self) -> bool:
+        return await self.call("skip")
+
+    async def stop(self) -> bool:
+        return await self.call("stop")
+
+    async def set_volume(self, volume: float) -> float:
+        return await self.call("set_volume", {"volume": volume})
+
+    async def update_config(self, nickname: str, avatar_bytes: Optional[bytes] = None, on_progress: Callable[[float], None] | None = None) -> BotConfigResponseDTO:
+        params = {
+            "nickname": nickname,
+            "avatar": base64.b64encode(avatar_bytes).decode("ascii") if avatar_bytes else None
+        }
+        return BotConfigResponseDTO.model_validate(await self.call("update_config", params, on_progress))
+
+    async def submit_update_config_job(self, nickname: str, avatar_bytes: Optional[bytes] = None) -> JobDTO:
+        """
+        Queue a configuration update as a background job in this API worker.
+
+        Unlike in-process, an unready bot fails the job instead of the submission.
+        """
+        validate_bot_config(nickname, avatar_bytes)
+        jobs = get_job_manager()
+
+        async def work(job_id: str) -> BotConfigResponseDTO:
+            return await self.update_config(nickname, avatar_bytes, on_progress=lambda progress: jobs.set_progress(job_id, progress))
+
+        return await jobs.submit(JobKind.update_bot_config, work)
+
+    async def stream_events(self, heartbeat_seconds: float | None = None) -> AsyncIterator[BotEventDTO | None]:
+        """
+        Subscribe to the bot process's events on a dedicated connection.
+
+        Args:
+            heartbeat_seconds: Yield None after this long without events
+        """
+        async for event in self.stream("subscribe", heartbeat_seconds=heartbeat_seconds):
+            yield BotEventDTO.model_validate(event) if event is not None else None
+
+    async def stream(self, method: str, params: dict[str, Any] | None = None, heartbeat_seconds: float | None = None) -> AsyncIterator[Any]:
+        """
+        Subscribe to a bot process stream on a dedicated connection.
+
+        Args:
+            method: IPC subscription method name
+            params: Method parameters
+            heartbeat_seconds: Yield None after this long without events
+
+        Yields:
+            JSON events until the stream ends
+        """
+        reader, writer = await self._open()
+        try:
+            _write(writer, {"id": 1, "method": method, "params": params or {}})
+            await writer.drain()
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), heartbeat_seconds)
+                except TimeoutError:
+                    yield None
+                    continue
+                if not line:
+                    raise Exception(f"{BOT_PROCESS_UNAVAILABLE}: connection lost")
+                message = json.loads(line)
+                if "error" in message:
+                    raise decode_error(message["error"])
+                if "result" in message:
+                    return
+                yield message["event"]
+        finally:
+            writer.close()
+
+
+def get_ipc_path() -> str:
+    """
+    Get the bot IPC socket path, configured by DISCORD_BOT_IPC_PATH.
+
+    Returns:
+        Unix socket path
+    """
+    return os.getenv("DISCORD_BOT_IPC_PATH", DEFAULT_IPC_PATH)
@@ -0,0 +1,152 @@
+"""
+Deadline - End-to-end time budget for a request.
+"""
+
+import asyncio
+import inspect
+import time
+from collections.abc import Awaitable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a request runs out of its time budget."""
+
+    def __init__(self, stage: str):
+        super().__init__(f"Deadline exceeded during {stage}")
+        self.stage = stage
+
+
+class OperationCancelledError(Exception):
+    """Raised when the caller no longer wants the result, e.g. it was superseded or disconnected."""
+
+    def __init__(self, stage: str, reason: str):
+        super().__init__(f"Cancelled during {stage}: {reason}")
+        self.stage = stage
+        self.reason = reason
+
+
+class Deadline:
+    """
+    Point in time by which a request must finish, and a way to abandon it earlier.
+
+    Created once at the edge (router) and passed down so that every stage -
+    queueing, the upstream call, streaming reads, playback start - spends from
+    the same budget instead of each applying its own timeout. Cancelling it is
+    visible to work running on worker threads, which asyncio cancellation is not.
+    A stage that must finish sooner gets a child deadline from within().
+    """
+
+    def __init__(self, expires_at: float, parent: "Deadline | None" = None):
+        self.expires_at = expires_at if parent is None else min(expires_at, parent.expires_at)
+        self.parent = parent
+        self._cancel_reason: str | None = None
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        """
+        Create a deadline a number of seconds from now.
+
+        Args:
+            seconds: Time budget
+
+        Returns:
+            Deadline instance
+        """
+        return cls(time.monotonic() + seconds)
+
+    def within(self, seconds: float) -> "Deadline":
+        """
+        Create a child deadline for a stage that must finish within a number of seconds.
+
+        The child expires at the earlier of both deadlines and is cancelled with
+        this one, while expiring or cancelling the child leaves this one running.
+
+        Args:
+            seconds: Time budget of the stage
+
+        Returns:
+            Deadline instance
+        """
+        return Deadline(time.monotonic() + seconds, parent=self)
+
+    def remaining(self) -> float:
+        """Seconds left in the budget, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    @property
+    def cancel_reason(self) -> str | None:
+        if self._cancel_reason is None and self.parent is not None:
+            return self.parent.cancel_reason
+        return self._cancel_reason
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_reason is not None
+
+    def cancel(self, reason: str = "cancelled by caller") -> None:
+        """
+        Abandon the request. Stages notice at their next check.
+
+        Args:
+            reason: Why the work is no longer needed
+        """
+        if self._cancel_reason is None:
+            self._cancel_reason = reason
+
+    def check(self, stage: str) -> None:
+        """
+        Raise if the request was cancelled or the budget is exhausted.
+
+        Args:
+            stage: Name of the stage about to start, used in the error message
+
+        Raises:
+            OperationCancelledError: If the request was cancelled
+            DeadlineExceededError: If the deadline has passed
+        """
+        cancel_reason = self.cancel_reason
+        if cancel_reason is not None:
+            raise OperationCancelledError(stage, cancel_reason)
+        if self.expired:
+            raise DeadlineExceededError(stage)
+
+    async def run(self, awaitable: Awaitable[T], stage: str) -> T:
+        """
+        Await something within the remaining budget, cancelling it when the budget runs out.
+
+        Args:
+            awaitable: Coroutine or future to await
+            stage: Name of the stage, used in the error message
+
+        Returns:
+            Result of the awaitable
+
+        Raises:
+            OperationCancelledError: If the request was cancelled before it started
+            DeadlineExceededError: If the deadline passes first
+        """
+        try:
+            self.check(stage)
+        except Exception:
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+            raise
+
+        try:
+            return await asyncio.wait_for(awaitable, timeout=self.remaining())
+        except DeadlineExceededError:
+            # Raised by an inner stage that checked the same deadline
+            raise
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError(stage) from None
+        except asyncio.CancelledError:
+            # Tell worker threads still running for this request to stop
+            self.cancel()
+            raise
@@ -3,18 +3,90 @@ Discord Bot Service - Business logic for Discord bot operations.
 """
 
 import asyncio
+import hashlib
 import logging
-from typing import Optional
+import math
+import os
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Callable
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Optional
 import discord
 from discord.ext import commands
 
-from app.models import DiscordBotStatusDTO, VoiceChannelDTO, BotConfigResponseDTO, PlayCommand, TextToSpeechCommand
+from app.models import DiscordBotStatusDTO, VoiceChannelDTO, BotConfigResponseDTO, PlayCommand, MAX_VOLUME, TextToSpeechCommand, JobDTO, JobKind, BotEventDTO, BotEventType, ShardStatusDTO
 from app.services.voice_service import synthesize_speech
+from app.services.deadline import Deadline, DeadlineExceededError, OperationCancelledError
+from app.services.metrics import get_metrics_registry
+from app.services.quota_service import QuotaExceededError
+from app.services.voice_channel_index import VoiceChannelIndex
+from app.services.job_service import get_job_manager
+from app.services.bot_events import BotEventBroadcaster
+from app.services.discord_client_profile import create_client, get_client_profile
+from app.services.voice_supervisor import VoiceSessionSupervisor, supervisor_options
 import io
 
+if TYPE_CHECKING:
+    from app.services.bot_ipc import RemoteDiscordBotManager
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Nickname edits in flight at once. Each guild has its own rate-limit bucket, which discord.py tracks.
+NICKNAME_UPDATE_CONCURRENCY = int(os.getenv("DISCORD_NICKNAME_UPDATE_CONCURRENCY", "5"))
+# Keep voice connections in other guilds open when connecting elsewhere, so switching back is instant
+WARM_VOICE_CONNECTIONS = os.getenv("DISCORD_WARM_VOICE_CONNECTIONS", "false").strip().lower() in ("1", "true", "yes")
+
+
+class TrackedAudioSource(discord.PCMVolumeTransformer):
+    """
+    Volume-adjustable audio source that knows how far it has been played.
+    
+    Tells a track that ended from one cut off by a dropped connection, and
+    where to resume the latter.
+    """
+    
+    # discord.py reads 20ms of audio per frame
+    FRAME_SECONDS = 0.02
+    
+    def __init__(self, original: discord.AudioSource, volume: float = 1.0, offset: float = 0.0):
+        super().__init__(original, volume=volume)
+        self.offset = offset
+        self.frames = 0
+        self.finished = False
+        # Set when the bot stops the audio on purpose (skip, stop, newer audio)
+        self.stopped = False
+    
+    def read(self) -> bytes:
+        data = super().read()
+        if data:
+            self.frames += 1
+        else:
+            self.finished = True
+        return data
+    
+    @property
+    def position(self) -> float:
+        """Seconds into the audio file played so far."""
+        return self.offset + self.frames * self.FRAME_SECONDS
+
+
+def validate_bot_config(nickname: str, avatar_bytes: Optional[bytes]) -> None:
+    """
+    Validate a bot configuration update before any Discord request is made.
+    
+    Raises:
+        Exception: If the nickname or avatar is invalid
+    """
+    # Validate nickname length (Discord limit is 32 characters for nicknames)
+    if not nickname or len(nickname) < 1 or len(nickname) > 32:
+        raise Exception("Bot nickname must be between 1 and 32 characters")
+    
+    # Validate avatar size if provided
+    if avatar_bytes and len(avatar_bytes) > 2 * 1024 * 1024:  # 2MB limit
+        raise Exception("Avatar file size must not exceed 2MB")
+
 
 class DiscordBotManager:
     """
@@ -24,6 +96,23 @@ class DiscordBotManager:
     def __init__(self):
         self._client: Optional[discord.Client] = None
         self._is_initializing = False
+        # In-flight TTS synthesis per voice session (guild ID), at most one each
+        self._synthesis: dict[int, tuple[asyncio.Task, Deadline]] = {}
+        self._channel_index = VoiceChannelIndex()
+        # SHA-256 of the last avatar uploaded by this process
+        self._avatar_hash: str | None = None
+        self._events = BotEventBroadcaster()
+        # Playback volume applied to every audio source, 1.0 plays audio as synthesized
+        self._volume = 1.0
+        # Guild whose voice channel plays audio, set by connect
+        self._active_guild_id: int | None = None
+        # Health monitors of connected voice sessions, by guild ID
+        self._supervisors: dict[int, VoiceSessionSupervisor] = {}
+        # Audio file and position to resume once a dropped voice session is reconnected, by guild ID,
+        # with the future of a play request waiting for that audio to start
+        self._interrupted: dict[int, tuple[str, float, asyncio.Future | None]] = {}
+        # Serializes connects per guild, e.g. concurrent /play requests connecting on demand
+        self._connect_locks: dict[int, asyncio.Lock] = {}
     
     @property
     def client(self) -> Optional[discord.Client]:
@@ -53,21 +142,44 @@ class DiscordBotManager:
         try:
             self._is_initializing = True
             
-            # Create Discord client with necessary intents
-            intents = discord.Intents.default()
-            intents.voice_states = True
-            intents.guilds = True
-            
-            client = discord.Client(intents=intents)
+            # Create Discord client with only the intents and caches the bot needs
+            profile = get_client_profile()
+            client = create_client(profile)
+            logger.info(f"Creating Discord client with {profile.value} profile, sharded={isinstance(client, discord.AutoShardedClient)}")
             
             @client.event
             async def on_ready():
                 logger.info(f"Discord bot logged in as {client.user}")
+                # Events missed while disconnected are not replayed after a new session
+                self._channel_index.rebuild(client.guilds)
+                self._publish(BotEventType.gateway_ready)
+            
+            @client.event
+            async def on_resumed():
+                self._publish(BotEventType.gateway_ready)
+            
+            @client.event
+            async def on_disconnect():
+                self._publish(BotEventType.gateway_disconnected, status=DiscordBotStatusDTO(connected=False, channel_id=None))
+            
+            @client.event
+            async def on_voice_state_update(member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
+                # Covers connects and disconnects through the API as well as moves and kicks in Discord
+                if member.id != client.user.id or before.channel == after.channel:
+                    return
+                supervisor = self._supervisors.get(member.guild.id)
+                if supervisor is not None and after.channel is not None:
+                    supervisor.channel_id = after.channel.id
+                if after.channel is None:
+                    self._publish(BotEventType.voice_disconnected, guild_id=member.guild.id, status=DiscordBotStatusDTO(connected=True, channel_id=None))
+                else:
+                    self._publish(BotEventType.voice_connected, guild_id=member.guild.id, status=DiscordBotStatusDTO(connected=True, channel_id=str(after.channel.id)))
             
             @client.event
             async def on_error(event, *args, **kwargs):
                 logger.error(f"Discord bot error in {event}: {args}, {kwargs}")
             
+            self._register_channel_index_events(client)
             self._client = client
             
             # Start the bot in a background task
@@ -92,8 +204,97 @@ class DiscordBotManager:
         except Exception as e:
             logger.error(f"Error shutting down Discord bot: {str(e)}")
         finally:
+            self._cancel_all_synthesis("bot shut down")
+            self._stop_all_supervising()
+            self._channel_index.clear()
             self._client = None
     
+    def _register_channel_index_events(self, client: discord.Client) -> None:
+        """
+        Keep the voice channel index current from gateway events.
+        
+        Each event re-indexes only the guild it concerns.
+        """
+        index = self._channel_index
+        
+        @client.event
+        async def on_guild_join(guild: discord.Guild):
+            index.index_guild(guild)
+        
+        @client.event
+        async def on_guild_available(guild: discord.Guild):
+            index.index_guild(guild)
+        
+        @client.event
+        async def on_guild_update(before: discord.Guild, after: discord.Guild):
+            index.index_guild(after)
+        
+        @client.event
+        async def on_guild_remove(guild: discord.Guild):
+            index.remove_guild(guild)
+        
+        @client.event
+        async def on_guild_unavailable(guild: discord.Guild):
+            index.remove_guild(guild)
+        
+        @client.event
+        async def on_guild_channel_create(channel: discord.abc.GuildChannel):
+            if isinstance(channel, discord.VoiceChannel):
+                index.index_guild(channel.guild)
+        
+        @client.event
+        async def on_guild_channel_update(before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+            # Category changes can re-sync the permissions of voice channels inside it
+            if isinstance(after, (discord.VoiceChannel, discord.CategoryChannel)):
+                index.index_guild(after.guild)
+        
+        @client.event
+        async def on_guild_channel_delete(channel: discord.abc.GuildChannel):
+            if isinstance(channel, discord.VoiceChannel):
+                index.index_guild(channel.guild)
+        
+        @client.event
+        async def on_guild_role_create(role: discord.Role):
+            index.index_guild(role.guild)
+        
+        @client.event
+        async def on_guild_role_update(before: discord.Role, after: discord.Role):
+            index.index_guild(after.guild)
+        
+        @client.event
+        async def on_guild_role_delete(role: discord.Role):
+            index.index_guild(role.guild)
+        
+        @client.event
+        async def on_member_update(before: discord.Member, after: discord.Member):
+            # Only the bot's own roles decide which channels it can join
+            if after.id == client.user.id and before.roles != after.roles:
+                index.index_guild(after.guild)
+    
+    def _cancel_synthesis(self, session_id: int, reason: str) -> None:
+        """
+        Cancel the in-flight synthesis or pending playback start of a voice session, including its upstream request.
+        
+        Args:
+            session_id: Guild ID of the voice session
+            reason: Why the audio is no longer needed
+        """
+        in_flight = self._synthesis.pop(session_id, None)
+        if in_flight is None:
+            return
+        task, deadline = in_flight
+        # The deadline stops the worker thread and a playback start still pending,
+        # cancelling the task releases the waiting request
+        deadline.cancel(reason)
+        task.cancel()
+        get_metrics_registry().increment("tts_synthesis_cancelled_total", reason=reason)
+        logger.info(f"Cancelled in-flight synthesis for session {session_id}: {reason}")
+        self._publish(BotEventType.queue_changed, guild_id=session_id)
+    
+    def _cancel_all_synthesis(self, reason: str) -> None:
+        for session_id in list(self._synthesis):
+            self._cancel_synthesis(session_id, reason)
+    
     async def get_status(self) -> DiscordBotStatusDTO:
         """
         Get the current status of the Discord bot.
@@ -105,35 +306,143 @@ class DiscordBotManager:
             Exception: If there's an error checking bot status
         """
         try:
-            if not self._client:
-                logger.info("Discord client not initialized")
-                return DiscordBotStatusDTO(connected=False, channel_id=None)
-            
-            # Check if bot is connected to Discord
-            if not self._client.is_ready():
-                logger.info("Discord client not ready")
-                return DiscordBotStatusDTO(connected=False, channel_id=None)
-            
-            # Check if bot is connected to any voice channel
-            voice_channel_id = None
-            if self._client.voice_clients:
-                # Get the first voice client (assuming single server usage)
-                voice_client = self._client.voice_clients[0]
-                if voice_client.is_connected():
-                    voice_channel_id = str(voice_client.channel.id)
-            
-            return DiscordBotStatusDTO(
-                connected=True,
-                channel_id=voice_channel_id
-            )
+            return self._current_status()
             
         except Exception as e:
             logger.error(f"Error getting Discord bot status: {str(e)}")
             raise Exception(f"Failed to get Discord bot status: {str(e)}") from e
 
-    async def list_channels(self) -> list[VoiceChannelDTO]:
+    def _current_status(self) -> DiscordBotStatusDTO:
+        if not self._client:
+            logger.debug("Discord client not initialized")
+            return DiscordBotStatusDTO(connected=False, channel_id=None)
+        
+        # Check if bot is connected to Discord
+        if not self._client.is_ready():
+            logger.debug("Discord client not ready")
+            return DiscordBotStatusDTO(connected=False, channel_id=None)
+        
+        # Check if bot is connected to any voice channel
+        voice_channel_id = None
+        voice_client = self._active_voice_client()
+        if voice_client is not None and voice_client.is_connected():
+            voice_channel_id = str(voice_client.channel.id)
+        
+        return DiscordBotStatusDTO(
+            connected=True,
+            channel_id=voice_channel_id
+        )
+
+    def _check_shard(self, guild: discord.Guild) -> None:
+        """
+        Fail fast if the gateway shard of a guild is down, instead of waiting for the voice handshake to time out.
+        
+        Raises:
+            Exception: If the guild's shard is not connected
+        """
+        if not isinstance(self._client, discord.AutoShardedClient):
+            return
+        shard = self._client.get_shard(guild.shard_id)
+        if shard is None or shard.is_closed():
+            raise Exception(f"Discord bot not ready: shard {guild.shard_id} is not connected")
+
+    async def get_shards(self) -> list[ShardStatusDTO]:
+        """
+        Get the status and gateway latency of every shard this process runs.
+        
+        An unsharded client is reported as shard 0 of 1.
+        
+        Returns:
+            List of ShardStatusDTO objects ordered by shard ID
+            
+        Raises:
+            Exception: If bot is not initialized
+        """
+        if not self._client:
+            raise Exception("Discord bot not initialized")
+        
+        guild_counts = Counter(guild.shard_id for guild in self._client.guilds)
+        if not isinstance(self._client, discord.AutoShardedClient):
+            return [ShardStatusDTO(
+                id=0,
+                shard_count=1,
+                connected=self._client.is_ready() and not self._client.is_closed(),
+                latency_ms=self._latency_ms(self._client.latency),
+                guild_count=len(self._client.guilds)
+            )]
+        
+        return [
+            ShardStatusDTO(
+                id=shard_id,
+                shard_count=shard.shard_count or self._client.shard_count or 0,
+                connected=not shard.is_closed(),
+                latency_ms=self._latency_ms(shard.latency),
+                guild_count=guild_counts.get(shard_id, 0)
+            )
+            for shard_id, shard in sorted(self._client.shards.items())
+        ]
+
+    @staticmethod
+    def _latency_ms(latency: float) -> float | None:
+        # discord.py reports nan or inf until the first heartbeat is acknowledged
+        if not math.isfinite(latency):
+            return None
+        return round(latency * 1000, 1)
+
+    def _publish(self, event_type: BotEventType, guild_id: int | None = None, detail: str | None = None, status: DiscordBotStatusDTO | None = None) -> None:
+        """
+        Push a state change to event subscribers.
+        
+        Args:
+            event_type: What happened
+            guild_id: Guild the event concerns
+            detail: Extra information, e.g. an error message
+            status: Status after the event, if it differs from what the client reports yet
+        """
+        if not self._events.subscriber_count:
+            return
+        try:
+            status = status or self._current_status()
+        except Exception as e:
+            logger.warning(f"Could not get bot status for {event_type.value} event: {str(e)}")
+            status = DiscordBotStatusDTO(connected=False, channel_id=None)
+        self._events.publish(BotEventDTO(
+            type=event_type,
+            status=status,
+            queue_depth=len(self._synthesis),
+            guild_id=str(guild_id) if guild_id is not None else None,
+            detail=detail,
+            created_at=datetime.now(timezone.utc)
+        ))
+
+    def stream_events(self, heartbeat_seconds: float | None = None) -> AsyncIterator[BotEventDTO | None]:
+        """
+        Subscribe to bot and playback state changes, starting with a snapshot of the current state.
+        
+        Args:
+            heartbeat_seconds: Yield None after this long without events
+            
+        Returns:
+            Async iterator of BotEventDTO, or None as heartbeat
+        """
+        def snapshot() -> BotEventDTO:
+            return BotEventDTO(
+                type=BotEventType.snapshot,
+                status=self._current_status(),
+                queue_depth=len(self._synthesis),
+                created_at=datetime.now(timezone.utc)
+            )
+        
+        return self._events.subscribe(heartbeat_seconds, snapshot=snapshot)
+
+    async def list_channels(self, guild_id: str | None = None, page: int = 1, limit: int | None = None) -> list[VoiceChannelDTO]:
         """
-        List all available voice channels across all guilds.
+        List available voice channels across all guilds, served from the event-maintained index.
+        
+        Args:
+            guild_id: Only list channels of this guild
+            page: 1-based page number, used with limit
+            limit: Page size, None for all channels
         
         Returns:
             List of VoiceChannelDTO objects containing channel information
@@ -148,18 +457,11 @@ class DiscordBotManager:
             if not self._client.is_ready():
                 raise Exception("Discord bot not ready")
             
-            channels = []
+            # Normally built by on_ready, gateway events keep it current afterwards
+            if not self._channel_index.is_built:
+                self._channel_index.rebuild(self._client.guilds)
             
-            # Iterate through all guilds the bot is connected to
-            for guild in self._client.guilds:
-                # Get all voice channels in the guild
-                for channel in guild.voice_channels:
-                    # Check if bot has permission to connect to the channel
-                    if channel.permissions_for(guild.me).connect:
-                        channels.append(VoiceChannelDTO(
-                            id=str(channel.id),
-                            name=f"{guild.name} - {channel.name}"
-                        ))
+            channels = self._channel_index.channels(guild_id=guild_id, page=page, limit=limit)
             
             logger.info(f"Found {len(channels)} available voice channels")
             return channels
@@ -172,6 +474,11 @@ class DiscordBotManager:
         """
         Connect the bot to a specified voice channel.
         
+        Switching channels within a guild moves the existing voice connection,
+        which takes a few hundred milliseconds instead of a full voice handshake.
+        Connections in other guilds are closed unless DISCORD_WARM_VOICE_CONNECTIONS is set.
+        Connecting to the channel already connected to is a no-op, so warm connections are reused.
+        
         Args:
             channel_id: ID of the voice channel to connect to
             
@@ -182,40 +489,17 @@ class DiscordBotManager:
             Exception: If bot is not initialized, channel not found, or connection fails
         """
         try:
-            if not self._client:
-                raise Exception("Discord bot not initialized")
-            
-            if not self._client.is_ready():
-                raise Exception("Discord bot not ready")
-            
-            # Find the voice channel by ID
-            channel = self._client.get_channel(int(channel_id))
-            
-            if not channel:
-                raise Exception(f"Voice channel with ID {channel_id} not found")
-            
-            if not isinstance(channel, discord.VoiceChannel):
-                raise Exception(f"Channel {channel_id} is not a voice channel")
+            channel = self._voice_channel(channel_id)
             
             # Check if bot has permission to connect
             if not channel.permissions_for(channel.guild.me).connect:
                 raise Exception(f"Bot does not have permission to connect to channel {channel.name}")
             
-            # Disconnect from current voice channel if connected
-            if self._client.voice_clients:
-                for voice_client in self._client.voice_clients:
-                    if voice_client.is_connected():
-                        await voice_client.disconnect()
-                        logger.info(f"Disconnected from previous voice channel")
+            # The voice handshake runs over the guild's gateway shard
+            self._check_shard(channel.guild)
             
-            # Connect to the new voice channel
-            voice_client = await channel.connect()
-            
-            if voice_client.is_connected():
-                logger.info(f"Successfully connected to voice channel: {channel.name}")
-                return DiscordBotStatusDTO(connected=True, channel_id=channel_id)
-            else:
-                raise Exception("Failed to establish voice connection")
+            async with self._connect_locks.setdefault(channel.guild.id, asyncio.Lock()):
+                return await self._connect_channel(channel)
                 
         except ValueError:
             raise Exception(f"Invalid channel ID: {channel_id}")
@@ -223,6 +507,66 @@ class DiscordBotManager:
             logger.error(f"Error connecting to voice channel {channel_id}: {str(e)}")
             raise Exception(f"Failed to connect to voice channel: {str(e)}") from e
 
+    def _voice_channel(self, channel_id: str) -> discord.VoiceChannel:
+        """
+        Look up a voice channel by ID.
+        
+        Raises:
+            ValueError: If channel_id is not a number
+            Exception: If the bot is not ready or the channel is not a known voice channel
+        """
+        if not self._client:
+            raise Exception("Discord bot not initialized")
+        
+        if not self._client.is_ready():
+            raise Exception("Discord bot not ready")
+        
+        # Find the voice channel by ID
+        channel = self._client.get_channel(int(channel_id))
+        
+        if not channel:
+            raise Exception(f"Voice channel with ID {channel_id} not found")
+        
+        if not isinstance(channel, discord.VoiceChannel):
+            raise Exception(f"Channel {channel_id} is not a voice channel")
+        return channel
+
+    async def _connect_channel(self, channel: discord.VoiceChannel) -> DiscordBotStatusDTO:
+        started = time.monotonic()
+        metrics = get_metrics_registry()
+        guild_voice_client = None
+        for voice_client in self._client.voice_clients:
+            if voice_client.guild.id == channel.guild.id:
+                guild_voice_client = voice_client
+            elif voice_client.is_connected() and not WARM_VOICE_CONNECTIONS:
+                # Only one channel plays at a time, connections in other guilds are not kept
+                self._stop_supervising(voice_client.guild.id)
+                await voice_client.disconnect()
+                logger.info(f"Disconnected from previous voice channel")
+        
+        if guild_voice_client is not None and guild_voice_client.is_connected():
+            # Within a guild the voice connection is reused, skipping UDP discovery and encryption setup
+            if guild_voice_client.channel.id != channel.id:
+                await guild_voice_client.move_to(channel)
+                metrics.increment("voice_channel_switches_total", method="move")
+            voice_client = guild_voice_client
+        else:
+            if guild_voice_client is not None:
+                # A dropped connection discord.py has not cleaned up yet would block connecting
+                await guild_voice_client.disconnect(force=True)
+            
+            # Connect to the new voice channel
+            voice_client = await channel.connect()
+            metrics.increment("voice_channel_switches_total", method="connect")
+        
+        if voice_client.is_connected():
+            self._active_guild_id = channel.guild.id
+            self._supervise(channel.guild.id, channel.id)
+            logger.info(f"Successfully connected to voice channel: {channel.name} in {(time.monotonic() - started) * 1000:.0f}ms")
+            return DiscordBotStatusDTO(connected=True, channel_id=str(channel.id))
+        else:
+            raise Exception("Failed to establish voice connection")
+
     async def disconnect(self) -> DiscordBotStatusDTO:
         """
         Disconnect the bot from the current voice channel.
@@ -240,6 +584,11 @@ class DiscordBotManager:
             if not self._client.is_ready():
                 raise Exception("Discord bot not ready")
             
+            # Audio still being generated has nowhere to play
+            self._cancel_all_synthesis("voice disconnected")
+            # Leaving on request, the connections must not be restored
+            self._stop_all_supervising()
+            
             # Disconnect from all voice channels
             disconnected_any = False
             if self._client.voice_clients:
@@ -251,6 +600,7 @@ class DiscordBotManager:
             
             if not disconnected_any:
                 logger.info("Bot was not connected to any voice channel")
+            self._active_guild_id = None
             
             # Bot is still connected to Discord, just not to voice channel
             return DiscordBotStatusDTO(connected=True, channel_id=None)
@@ -259,13 +609,18 @@ class DiscordBotManager:
             logger.error(f"Error disconnecting from voice channel: {str(e)}")
             raise Exception(f"Failed to disconnect from voice channel: {str(e)}") from e
 
-    async def update_config(self, nickname: str, avatar_bytes: Optional[bytes] = None) -> BotConfigResponseDTO:
+    async def update_config(self, nickname: str, avatar_bytes: Optional[bytes] = None, on_progress: Callable[[float], None] | None = None) -> BotConfigResponseDTO:
         """
         Update bot configuration (server nickname and avatar).
         
+        Nicknames are edited concurrently, at most NICKNAME_UPDATE_CONCURRENCY at a
+        time, and only in guilds where the nickname differs. The avatar is only
+        uploaded if it differs from the last upload.
+        
         Args:
             nickname: New bot nickname for all servers (1-32 characters)
             avatar_bytes: Optional avatar image bytes (jpg/png, max 2MB)
+            on_progress: Called with the completed fraction of nickname updates
             
         Returns:
             BotConfigResponseDTO with updated configuration
@@ -274,50 +629,62 @@ class DiscordBotManager:
             Exception: If bot is not initialized or update fails
         """
         try:
-            if not self._client:
-                raise Exception("Discord bot not initialized")
-            
-            if not self._client.is_ready():
-                raise Exception("Discord bot not ready")
+            self._validate_config(nickname, avatar_bytes)
             
-            # Validate nickname length (Discord limit is 32 characters for nicknames)
-            if not nickname or len(nickname) < 1 or len(nickname) > 32:
-                raise Exception("Bot nickname must be between 1 and 32 characters")
-            
-            # Validate avatar size if provided
-            if avatar_bytes and len(avatar_bytes) > 2 * 1024 * 1024:  # 2MB limit
-                raise Exception("Avatar file size must not exceed 2MB")
-            
-            # Update avatar if provided
+            # Update avatar if provided and changed, Discord allows only a few avatar changes per hour
+            avatar_updated = False
             if avatar_bytes:
-                await self._client.user.edit(avatar=avatar_bytes)
+                avatar_hash = hashlib.sha256(avatar_bytes).hexdigest()
+                if avatar_hash != self._avatar_hash:
+                    await self._client.user.edit(avatar=avatar_bytes)
+                    self._avatar_hash = avatar_hash
+                    avatar_updated = True
+                else:
+                    logger.info("Avatar unchanged since last upload, skipping")
             
-            # Update nickname on all servers
-            updated_guilds = []
-            for guild in self._client.guilds:
+            # Update nickname on all servers where it differs
+            pending = [guild for guild in self._client.guilds if guild.me.nick != nickname]
+            skipped = len(self._client.guilds) - len(pending)
+            semaphore = asyncio.Semaphore(NICKNAME_UPDATE_CONCURRENCY)
+            completed = 0
+            
+            async def update_nickname(guild: discord.Guild) -> bool:
+                nonlocal completed
                 try:
                     # Check if bot has permission to change nickname
-                    if guild.me.guild_permissions.change_nickname:
-                        await guild.me.edit(nick=nickname)
-                        updated_guilds.append(guild.name)
-                        logger.info(f"Updated nickname to '{nickname}' on server: {guild.name}")
-                    else:
+                    if not guild.me.guild_permissions.change_nickname:
                         logger.warning(f"No permission to change nickname on server: {guild.name}")
-                except discord.HTTPException as e:
+                        return False
+                    async with semaphore:
+                        await guild.me.edit(nick=nickname)
+                    logger.info(f"Updated nickname to '{nickname}' on server: {guild.name}")
+                    return True
+                except (discord.HTTPException, discord.RateLimited) as e:
                     logger.warning(f"Failed to update nickname on server {guild.name}: {str(e)}")
-                    continue
+                    return False
+                finally:
+                    completed += 1
+                    if on_progress is not None:
+                        on_progress(completed / len(pending))
+            
+            results = await asyncio.gather(*(update_nickname(guild) for guild in pending))
+            updated = sum(results)
             
             # Get the updated avatar URL
             avatar_url = str(self._client.user.avatar.url) if self._client.user.avatar else ""
             
-            if updated_guilds:
-                logger.info(f"Successfully updated bot nickname to '{nickname}' on {len(updated_guilds)} servers, avatar_updated={avatar_bytes is not None}")
+            if updated or skipped:
+                logger.info(f"Bot nickname is '{nickname}' on {updated + skipped} servers ({updated} updated), avatar_updated={avatar_updated}")
             else:
                 logger.warning("No servers were updated (permission issues)")
             
             return BotConfigResponseDTO(
                 nickname=nickname,
-                avatar_url=avatar_url
+                avatar_url=avatar_url,
+                updated_guilds=updated,
+                skipped_guilds=skipped,
+                failed_guilds=len(pending) - updated,
+                avatar_updated=avatar_updated
             )
             
         except discord.HTTPException as e:
@@ -331,30 +698,63 @@ class DiscordBotManager:
             logger.error(f"Error updating bot configuration: {str(e)}")
             raise Exception(f"Failed to update bot configuration: {str(e)}") from e
 
-    async def play_audio(self, command: PlayCommand) -> None:
+    async def submit_update_config_job(self, nickname: str, avatar_bytes: Optional[bytes] = None) -> JobDTO:
+        """
+        Queue a configuration update as a background job, for bots in many guilds.
+        
+        Args:
+            nickname: New bot nickname for all servers (1-32 characters)
+            avatar_bytes: Optional avatar image bytes (jpg/png, max 2MB)
+            
+        Returns:
+            JobDTO in pending status; its progress follows the nickname updates and its result is a BotConfigResponseDTO
+            
+        Raises:
+            ValueError: If the job queue is full
+            Exception: If bot is not initialized or the configuration is invalid
+        """
+        self._validate_config(nickname, avatar_bytes)
+        jobs = get_job_manager()
+        
+        async def work(job_id: str) -> BotConfigResponseDTO:
+            return await self.update_config(nickname, avatar_bytes, on_progress=lambda progress: jobs.set_progress(job_id, progress))
+        
+        return await jobs.submit(JobKind.update_bot_config, work)
+
+    def _validate_config(self, nickname: str, avatar_bytes: Optional[bytes]) -> None:
+        if not self._client:
+            raise Exception("Discord bot not initialized")
+        
+        if not self._client.is_ready():
+            raise Exception("Discord bot not ready")
+        
+        validate_bot_config(nickname, avatar_bytes)
+
+    async def play_audio(self, command: PlayCommand, deadline: Deadline | None = None) -> None:
         """
-        Play audio in the currently connected voice channel.
+        Play audio in the currently connected voice channel, or in command.channel_id,
+        connecting to it first unless the connection is still open.
         
         Args:
             command: PlayCommand with voice_id and text
+            deadline: Deadline for playback to start. Defaults to command.timeout from now.
             
         Raises:
+            DeadlineExceededError: If playback could not start before the deadline
+            OperationCancelledError: If a newer request for the same voice session superseded this one
+            QuotaExceededError: If the audio is not cached and the character quota is nearly exhausted
             Exception: If bot is not connected, TTS generation fails, or playback fails
         """
+        deadline = deadline or Deadline.after(command.timeout)
         try:
-            if not self._client:
-                raise Exception("Discord bot not initialized")
-            
-            if not self._client.is_ready():
-                raise Exception("Discord bot not ready")
-            
-            # Check if bot is connected to a voice channel
-            if not self._client.voice_clients:
-                raise Exception("Bot is not connected to a voice channel")
-            
-            voice_client = self._client.voice_clients[0]
-            if not voice_client.is_connected():
-                raise Exception("Bot is not connected to a voice channel")
+            if command.channel_id is not None:
+                # Connect on demand, the voice handshake overlaps with speech synthesis
+                session_id = self._voice_channel(command.channel_id).guild.id
+                connecting = asyncio.create_task(self.connect(command.channel_id))
+            else:
+                session_id = self._playback_session_id()
+                connecting = None
+            self._touch(session_id)
             
             # Generate TTS audio
             logger.info(f"Generating TTS for voice_id={command.voice_id}, text_length={len(command.text)}")
@@ -362,64 +762,437 @@ class DiscordBotManager:
             tts_command = TextToSpeechCommand(
                 voice_id=command.voice_id,
                 text=command.text,
-                timeout=30
+                timeout=command.timeout,
+                quality=command.quality
             )
             
-            audio_data = await synthesize_speech(tts_command)
-            
-            # Save audio to temporary file and create audio source
-            import tempfile
-            import os
-            
-            # Create temporary file for audio
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
-                temp_file.write(audio_data)
-                temp_file_path = temp_file.name
-            
+            # A newer request for the same session supersedes this one until its playback has started
+            self._cancel_synthesis(session_id, "superseded")
+            synthesis = asyncio.create_task(synthesize_speech(tts_command, deadline))
+            self._synthesis[session_id] = (synthesis, deadline)
+            self._publish(BotEventType.queue_changed, guild_id=session_id)
             try:
-                # Create audio source from file
-                audio_source = discord.FFmpegPCMAudio(temp_file_path)
-            except Exception as audio_error:
-                # Clean up temp file if audio source creation fails
-                os.unlink(temp_file_path)
-                raise Exception(f"Failed to create audio source: {str(audio_error)}") from audio_error
+                if connecting is not None:
+                    try:
+                        await deadline.run(connecting, "voice connect")
+                    except BaseException:
+                        # The audio would have nowhere to play
+                        synthesis.cancel()
+                        raise
+                audio_data = await self._await_synthesis(synthesis, deadline)
+                await self._start_playback(session_id, audio_data, deadline)
+            finally:
+                if self._synthesis.get(session_id, (None,))[0] is synthesis:
+                    del self._synthesis[session_id]
+                    self._publish(BotEventType.queue_changed, guild_id=session_id)
             
-            # Stop current audio if playing
-            if voice_client.is_playing():
-                voice_client.stop()
+        except DeadlineExceededError as e:
+            logger.error(f"Playing audio timed out: {str(e)}")
+            self._publish(BotEventType.playback_failed, detail=str(e))
+            raise
+        except OperationCancelledError as e:
+            logger.info(f"Playing audio cancelled: {str(e)}")
+            raise
+        except QuotaExceededError as e:
+            logger.warning(f"Playing audio refused: {str(e)}")
+            self._publish(BotEventType.playback_failed, detail=str(e))
+            raise
+        except Exception as e:
+            logger.error(f"Error playing audio: {str(e)}")
+            self._publish(BotEventType.playback_failed, detail=str(e))
+            raise Exception(f"Failed to play audio: {str(e)}") from e
+
+    def _connected_voice_client(self) -> discord.VoiceClient:
+        """
+        Get the voice client audio is played on.
+        
+        Raises:
+            Exception: If the bot is not ready or not connected to a voice channel
+        """
+        if not self._client:
+            raise Exception("Discord bot not initialized")
+        
+        if not self._client.is_ready():
+            raise Exception("Discord bot not ready")
+        
+        # Check if bot is connected to a voice channel
+        voice_client = self._active_voice_client()
+        if voice_client is None or not voice_client.is_connected():
+            raise Exception("Bot is not connected to a voice channel")
+        return voice_client
+
+    def _playback_session_id(self) -> int:
+        """
+        Get the guild audio is played in. A supervised session that is reconnecting still accepts audio.
+        
+        Raises:
+            Exception: If the bot is not ready or not connected to a voice channel
+        """
+        supervisor = self._supervisors.get(self._active_guild_id)
+        if self._client and self._client.is_ready() and supervisor is not None and supervisor.reconnecting:
+            return self._active_guild_id
+        return self._connected_voice_client().guild.id
+
+    def _active_voice_client(self) -> discord.VoiceClient | None:
+        """
+        Get the voice client of the channel last connected to; other guilds may hold warm connections.
+        """
+        if not self._client or not self._client.voice_clients:
+            return None
+        for voice_client in self._client.voice_clients:
+            if voice_client.guild.id == self._active_guild_id:
+                return voice_client
+        return self._client.voice_clients[0]
+
+    async def skip(self) -> bool:
+        """
+        Stop the audio playing now. Audio still being synthesized plays when ready.
+        
+        Returns:
+            bool: Whether anything was playing
             
-            # Define cleanup function for after playback
-            def cleanup_temp_file(error):
-                try:
-                    os.unlink(temp_file_path)
-                    logger.debug(f"Cleaned up temporary audio file: {temp_file_path}")
-                except Exception as cleanup_error:
-                    logger.warning(f"Failed to clean up temporary file {temp_file_path}: {str(cleanup_error)}")
-                if error:
-                    logger.error(f"Audio playback error: {str(error)}")
+        Raises:
+            Exception: If the bot is not ready or not connected to a voice channel
+        """
+        voice_client = self._connected_voice_client()
+        if not (voice_client.is_playing() or voice_client.is_paused()):
+            return False
+        # The after callback publishes playback_finished and removes the audio file
+        self._stop_audio(voice_client)
+        logger.info(f"Skipped audio in voice channel: {voice_client.channel.name}")
+        return True
+
+    async def stop(self) -> bool:
+        """
+        Stop the audio playing now and cancel audio still being synthesized.
+        
+        Returns:
+            bool: Whether anything was playing or synthesizing
             
-            # Play the audio with cleanup callback
-            voice_client.play(audio_source, after=cleanup_temp_file)
+        Raises:
+            Exception: If the bot is not ready or not connected to a voice channel
+        """
+        voice_client = self._connected_voice_client()
+        pending = voice_client.guild.id in self._synthesis
+        self._cancel_synthesis(voice_client.guild.id, "stopped")
+        return await self.skip() or pending
+
+    async def set_volume(self, volume: float) -> float:
+        """
+        Set the playback volume, including for the audio playing now.
+        
+        Args:
+            volume: 0.0 (muted) to MAX_VOLUME, 1.0 plays audio as synthesized
             
-            logger.info(f"Started playing audio in voice channel: {voice_client.channel.name}")
+        Returns:
+            float: The new volume
             
+        Raises:
+            ValueError: If the volume is out of range
+        """
+        if not 0.0 <= volume <= MAX_VOLUME:
+            raise ValueError(f"Volume must be between 0 and {MAX_VOLUME}")
+        self._volume = volume
+        
+        if self._client:
+            for voice_client in self._client.voice_clients:
+                if isinstance(voice_client.source, discord.PCMVolumeTransformer):
+                    voice_client.source.volume = volume
+        logger.info(f"Playback volume set to {volume}")
+        return volume
+
+    async def _await_synthesis(self, synthesis: asyncio.Task, deadline: Deadline) -> bytes:
+        """
+        Wait for a synthesis task, telling apart a superseded task from an abandoned request.
+        
+        Raises:
+            OperationCancelledError: If the synthesis was cancelled by a newer request
+            asyncio.CancelledError: If the waiting request itself was cancelled
+        """
+        try:
+            return await synthesis
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if current is not None and current.cancelling():
+                # The request itself was abandoned (e.g. client disconnected), stop the work too
+                deadline.cancel("requester disconnected")
+                synthesis.cancel()
+                raise
+            raise OperationCancelledError("speech synthesis", deadline.cancel_reason or "cancelled") from None
+
+    async def _start_playback(self, guild_id: int, audio_data: bytes, deadline: Deadline) -> None:
+        """
+        Write audio to a temporary file and start playing it, unless the deadline is gone.
+        
+        If the voice session dropped meanwhile and its supervisor is reconnecting,
+        waits for the reconnect to play the audio, within the same deadline.
+        
+        Raises:
+            DeadlineExceededError: If the deadline passed before playback started
+            OperationCancelledError: If the request was cancelled before playback started
+            Exception: If the bot is not connected, the session could not be restored,
+                or the audio source cannot be created
+        """
+        # Save audio to temporary file and create audio source
+        import tempfile
+        
+        # Create temporary file for audio
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
+            temp_file.write(audio_data)
+            temp_file_path = temp_file.name
+        
+        # A reconnect may have replaced the voice client while the audio was synthesized
+        voice_client = self._guild_voice_client(guild_id)
+        if voice_client is None or not voice_client.is_connected():
+            supervisor = self._supervisors.get(guild_id)
+            if supervisor is None or not supervisor.reconnecting:
+                os.unlink(temp_file_path)
+                raise Exception("Bot is not connected to a voice channel")
+            started = asyncio.get_running_loop().create_future()
+            self._interrupt(guild_id, temp_file_path, 0.0, started)
+            logger.info(f"Voice session {guild_id} is reconnecting, audio plays once it is restored")
+            try:
+                await deadline.run(started, "playback start")
+            except BaseException:
+                # Nobody waits for the audio anymore, it must not start late
+                interrupted = self._interrupted.get(guild_id)
+                if interrupted is not None and interrupted[2] is started:
+                    del self._interrupted[guild_id]
+                    self._remove_audio_file(temp_file_path)
+                raise
+            return
+        
+        try:
+            # Create audio source from file (spawns FFmpeg, so keep it off the event loop)
+            deadline.check("playback start")
+            audio_source = await asyncio.to_thread(self._create_audio_source, temp_file_path, 0.0)
+        except (DeadlineExceededError, OperationCancelledError):
+            os.unlink(temp_file_path)
+            raise
+        except Exception as audio_error:
+            # Clean up temp file if audio source creation fails
+            os.unlink(temp_file_path)
+            raise Exception(f"Failed to create audio source: {str(audio_error)}") from audio_error
+        
+        # Do not start playback the caller has already given up on
+        try:
+            deadline.check("playback start")
+        except Exception:
+            audio_source.cleanup()
+            os.unlink(temp_file_path)
+            raise
+        
+        self._play_file(voice_client, temp_file_path, audio_source)
+
+    def _create_audio_source(self, path: str, offset: float) -> "TrackedAudioSource":
+        # Seeking in the input lets a resumed track continue where it was cut off
+        options = {"before_options": f"-ss {offset:.2f}"} if offset else {}
+        return TrackedAudioSource(discord.FFmpegPCMAudio(path, **options), volume=self._volume, offset=offset)
+
+    def _play_file(self, voice_client: discord.VoiceClient, path: str, audio_source: "TrackedAudioSource") -> None:
+        loop = asyncio.get_running_loop()
+        guild_id = voice_client.guild.id
+        
+        def after_playback(error):
+            # Called from the player thread
+            loop.call_soon_threadsafe(self._playback_ended, guild_id, path, audio_source, error)
+        
+        # Stop current audio if playing
+        if voice_client.is_playing():
+            self._stop_audio(voice_client)
+        
+        # Play the audio with cleanup callback
+        voice_client.play(audio_source, after=after_playback)
+        self._publish(BotEventType.playback_started, guild_id=guild_id)
+        
+        logger.info(f"Started playing audio in voice channel: {voice_client.channel.name}")
+
+    def _playback_ended(self, guild_id: int, path: str, audio_source: "TrackedAudioSource", error: Exception | None) -> None:
+        if error is None and not audio_source.finished and not audio_source.stopped and guild_id in self._supervisors:
+            # The connection dropped mid-playback, the supervisor resumes from here after reconnecting
+            self._interrupt(guild_id, path, audio_source.position)
+            logger.info(f"Playback in voice session {guild_id} interrupted at {audio_source.position:.1f}s")
+            return
+        
+        self._remove_audio_file(path)
+        # The idle timeout counts from the end of playback
+        self._touch(guild_id)
+        if error:
+            logger.error(f"Audio playback error: {str(error)}")
+            self._publish(BotEventType.playback_failed, guild_id, str(error))
+        else:
+            self._publish(BotEventType.playback_finished, guild_id)
+
+    def _stop_audio(self, voice_client: discord.VoiceClient) -> None:
+        if isinstance(voice_client.source, TrackedAudioSource):
+            voice_client.source.stopped = True
+        voice_client.stop()
+
+    def _interrupt(self, guild_id: int, path: str, offset: float, started: asyncio.Future | None = None) -> None:
+        # Newer audio supersedes audio that was waiting for the reconnect
+        self._drop_interrupted(guild_id, OperationCancelledError("playback start", "superseded"))
+        self._interrupted[guild_id] = (path, offset, started)
+
+    def _drop_interrupted(self, guild_id: int, error: Exception) -> None:
+        interrupted = self._interrupted.pop(guild_id, None)
+        if interrupted is None:
+            return
+        path, _, started = interrupted
+        self._remove_audio_file(path)
+        if started is not None and not started.done():
+            started.set_exception(error)
+
+    def _remove_audio_file(self, path: str) -> None:
+        try:
+            os.unlink(path)
+            logger.debug(f"Cleaned up temporary audio file: {path}")
+        except Exception as cleanup_error:
+            logger.warning(f"Failed to clean up temporary file {path}: {str(cleanup_error)}")
+
+    def _guild_voice_client(self, guild_id: int) -> discord.VoiceClient | None:
+        if not self._client:
+            return None
+        for voice_client in self._client.voice_clients:
+            if voice_client.guild.id == guild_id:
+                return voice_client
+        return None
+
+    def _supervise(self, guild_id: int, channel_id: int) -> None:
+        """
+        Watch a voice session, reconnecting to channel_id and resuming playback if it drops,
+        and leaving the channel once it is idle.
+        """
+        supervisor = self._supervisors.get(guild_id)
+        if supervisor is None:
+            supervisor = VoiceSessionSupervisor(
+                guild_id,
+                channel_id,
+                get_client=lambda: self._client,
+                on_reconnected=self._resume_playback,
+                on_idle=lambda reason: self._release_idle_session(guild_id, reason),
+                on_gave_up=lambda: self._supervision_ended(guild_id),
+                **supervisor_options()
+            )
+            self._supervisors[guild_id] = supervisor
+        supervisor.channel_id = channel_id
+        # Connecting or moving is use, the idle timeout starts over
+        supervisor.touch()
+        supervisor.start()
+
+    def _touch(self, guild_id: int) -> None:
+        supervisor = self._supervisors.get(guild_id)
+        if supervisor is not None:
+            supervisor.touch()
+
+    async def _release_idle_session(self, guild_id: int, reason: str) -> None:
+        """
+        Leave a voice channel that is not in use, freeing its UDP socket, encoder and keepalive thread.
+        
+        A later /play with a channel ID connects again on demand.
+        """
+        self._stop_supervising(guild_id)
+        self._cancel_synthesis(guild_id, "voice session idle")
+        if self._active_guild_id == guild_id:
+            self._active_guild_id = None
+        voice_client = self._guild_voice_client(guild_id)
+        if voice_client is not None and voice_client.is_connected():
+            await voice_client.disconnect()
+        get_metrics_registry().increment("voice_idle_disconnects_total", reason=reason)
+        logger.info(f"Left idle voice channel in guild {guild_id}: {reason}")
+
+    def _supervision_ended(self, guild_id: int) -> None:
+        """
+        Forget a voice session its supervisor could not restore, failing audio that waited for it.
+        """
+        self._stop_supervising(guild_id)
+        if self._active_guild_id == guild_id:
+            self._active_guild_id = None
+        self._publish(BotEventType.voice_disconnected, guild_id=guild_id, status=DiscordBotStatusDTO(connected=True, channel_id=None))
+
+    def _stop_supervising(self, guild_id: int) -> None:
+        supervisor = self._supervisors.pop(guild_id, None)
+        if supervisor is not None:
+            supervisor.stop()
+        self._drop_interrupted(guild_id, Exception("Bot is not connected to a voice channel"))
+
+    def _stop_all_supervising(self) -> None:
+        for guild_id in list(self._supervisors):
+            self._stop_supervising(guild_id)
+
+    async def _resume_playback(self, voice_client: discord.VoiceClient) -> None:
+        """
+        Continue the audio a dropped voice session was playing or about to play.
+        """
+        guild_id = voice_client.guild.id
+        interrupted = self._interrupted.pop(guild_id, None)
+        if interrupted is None:
+            return
+        path, offset, started = interrupted
+        if started is not None and started.done():
+            # The play request gave up waiting
+            self._remove_audio_file(path)
+            return
+        if voice_client.is_playing():
+            # Newer audio already started on the new connection
+            self._remove_audio_file(path)
+            if started is not None:
+                started.set_exception(OperationCancelledError("playback start", "superseded"))
+            return
+        
+        try:
+            audio_source = await asyncio.to_thread(self._create_audio_source, path, offset)
         except Exception as e:
-            logger.error(f"Error playing audio: {str(e)}")
-            raise Exception(f"Failed to play audio: {str(e)}") from e
+            logger.error(f"Failed to resume playback in voice session {guild_id}: {str(e)}")
+            self._remove_audio_file(path)
+            if started is not None and not started.done():
+                started.set_exception(e)
+            else:
+                self._publish(BotEventType.playback_failed, guild_id, str(e))
+            return
+        if started is not None and started.done():
+            # The deadline passed while the audio source was created
+            audio_source.cleanup()
+            self._remove_audio_file(path)
+            return
+        self._play_file(voice_client, path, audio_source)
+        if started is not None:
+            started.set_result(None)
+        get_metrics_registry().increment("voice_playback_resumed_total")
+        logger.info(f"Resumed playback in voice session {guild_id} at {offset:.1f}s")
 
 
 # Global instance of the Discord bot manager
 discord_bot_manager = DiscordBotManager()
 
 
-def get_discord_bot_manager() -> DiscordBotManager:
+_remote_manager: "RemoteDiscordBotManager | None" = None
+
+
+def bot_runs_in_worker() -> bool:
+    """
+    Check whether the Discord bot runs in its own process (DISCORD_BOT_MODE=worker).
+    
+    The API process then does not start a Discord client and forwards bot
+    operations to the worker over DISCORD_BOT_IPC_PATH, so uvicorn can run several API workers.
+    """
+    return os.getenv("DISCORD_BOT_MODE", "embedded").strip().lower() == "worker"
+
+
+def get_discord_bot_manager() -> "DiscordBotManager | RemoteDiscordBotManager":
     """
     Get the Discord bot manager instance.
     
     Returns:
-        DiscordBotManager instance
+        DiscordBotManager instance, or a RemoteDiscordBotManager forwarding to the bot worker process
     """
-    return discord_bot_manager
+    global _remote_manager
+    if not bot_runs_in_worker():
+        return discord_bot_manager
+    if _remote_manager is None:
+        # Imported here because the IPC module builds on this one
+        from app.services.bot_ipc import RemoteDiscordBotManager, get_ipc_path
+        _remote_manager = RemoteDiscordBotManager(get_ipc_path())
+    return _remote_manager
 
 
 async def get_status() -> DiscordBotStatusDTO:
@@ -436,15 +1209,17 @@ async def get_status() -> DiscordBotStatusDTO:
     return await manager.get_status()
 
 
-async def play_audio(command: PlayCommand) -> None:
+async def play_audio(command: PlayCommand, deadline: Deadline | None = None) -> None:
     """
     Play audio in the currently connected voice channel.
     
     Args:
         command: PlayCommand with voice_id and text
+        deadline: Deadline for playback to start. Defaults to command.timeout from now.
         
     Raises:
+        DeadlineExceededError: If playback could not start before the deadline
         Exception: If bot is not connected, TTS generation fails, or playback fails
     """
     manager = get_discord_bot_manager()
-    await manager.play_audio(command) 
\ No newline at end of file
+    await manager.play_audio(command, deadline) 
\ No newline at end of file
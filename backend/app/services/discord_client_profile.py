@@ -0,0 +1,160 @@
+"""
+Discord Client Profile - Intents, cache and shard settings the Discord client is created with.
+"""
+
+import os
+from enum import Enum
+from typing import Any
+
+import discord
+
+
+class ClientProfile(str, Enum):
+    # Only what the bot uses: guilds, voice states and members in voice channels
+    lean = 'lean'
+    # discord.py defaults, e.g. while developing features that read messages
+    full = 'full'
+
+
+def client_options(profile: ClientProfile = ClientProfile.lean) -> dict[str, Any]:
+    """
+    Build the discord.Client keyword arguments for a profile.
+
+    The bot never reads messages or member lists. The lean profile does not
+    subscribe to message, reaction, typing and other guild events, so Discord
+    does not send them. It keeps no message cache and does not request member
+    lists at startup. Of the members, it only caches those in voice channels,
+    which is needed to tell whether a channel is empty. Memory then grows with
+    the number of channels rather than with guild activity.
+
+    Args:
+        profile: Client profile
+
+    Returns:
+        Keyword arguments for discord.Client
+    """
+    if profile == ClientProfile.full:
+        intents = discord.Intents.default()
+        intents.voice_states = True
+        intents.guilds = True
+        return {"intents": intents}
+
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.voice_states = True
+
+    member_cache_flags = discord.MemberCacheFlags.none()
+    member_cache_flags.voice = True
+
+    return {
+        "intents": intents,
+        "max_messages": None,
+        "chunk_guilds_at_startup": False,
+        "member_cache_flags": member_cache_flags
+    }
+
+
+def get_client_profile() -> ClientProfile:
+    """
+    Get the client profile configured by DISCORD_CLIENT_PROFILE, lean by default.
+
+    Returns:
+        ClientProfile
+
+    Raises:
+        ValueError: If DISCORD_CLIENT_PROFILE is not a known profile
+    """
+    return ClientProfile(os.getenv("DISCORD_CLIENT_PROFILE", ClientProfile.lean.value))
+
+
+def parse_shard_ids(value: str) -> list[int]:
+    """
+    Parse a shard ID list such as "0-3,8".
+
+    Args:
+        value: Comma-separated shard IDs and inclusive ranges
+
+    Returns:
+        Sorted shard IDs
+
+    Raises:
+        ValueError: If the list is malformed
+    """
+    shard_ids: set[int] = set()
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = (int(bound) for bound in part.split("-", 1))
+            if first > last:
+                raise ValueError(f"Invalid shard range: {part}")
+            shard_ids.update(range(first, last + 1))
+        else:
+            shard_ids.add(int(part))
+    if not shard_ids:
+        raise ValueError("Shard ID list is empty")
+    return sorted(shard_ids)
+
+
+def shard_options() -> dict[str, Any] | None:
+    """
+    Build AutoShardedClient keyword arguments from DISCORD_SHARD_COUNT and DISCORD_SHARD_IDS.
+
+    DISCORD_SHARD_COUNT is unset for a single unsharded gateway connection,
+    "auto" for the shard count Discord recommends, or a number. DISCORD_SHARD_IDS
+    restricts this process to some of the shards (e.g. "0-3"), so that several
+    processes can split one large deployment; it needs a numeric shard count.
+
+    Returns:
+        Keyword arguments, None if sharding is off
+
+    Raises:
+        ValueError: If the shard settings are invalid
+    """
+    shard_count = os.getenv("DISCORD_SHARD_COUNT", "").strip().lower()
+    shard_ids = os.getenv("DISCORD_SHARD_IDS", "").strip()
+    if not shard_count:
+        if shard_ids:
+            raise ValueError("DISCORD_SHARD_IDS requires DISCORD_SHARD_COUNT")
+        return None
+
+    if shard_count == "auto":
+        if shard_ids:
+            raise ValueError("DISCORD_SHARD_IDS requires a numeric DISCORD_SHARD_COUNT")
+        return {}
+
+    count = int(shard_count)
+    if count < 1:
+        raise ValueError("DISCORD_SHARD_COUNT must be at least 1")
+    options: dict[str, Any] = {"shard_count": count}
+    if shard_ids:
+        ids = parse_shard_ids(shard_ids)
+        if ids[0] < 0 or ids[-1] >= count:
+            raise ValueError(f"DISCORD_SHARD_IDS must be between 0 and {count - 1}")
+        options["shard_ids"] = ids
+    return options
+
+
+def create_client(profile: ClientProfile = ClientProfile.lean) -> discord.Client:
+    """
+    Create the Discord client for a profile, sharded if configured.
+
+    An AutoShardedClient opens one gateway connection per shard and sends each
+    guild's voice state updates over its shard. Large deployments then spread
+    event processing across connections and identify shards as fast as the
+    session start limit allows, instead of being capped by one connection.
+
+    Args:
+        profile: Client profile
+
+    Returns:
+        discord.Client or discord.AutoShardedClient
+
+    Raises:
+        ValueError: If the shard settings are invalid
+    """
+    sharding = shard_options()
+    if sharding is None:
+        return discord.Client(**client_options(profile))
+    return discord.AutoShardedClient(**client_options(profile), **sharding)
@@ -2,34 +2,91 @@
 ElevenLabs API Client for voice management operations.
 """
 
+import functools
+import math
 import os
+import time
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
+import httpx
 from elevenlabs import ElevenLabs
 from app.models import VoiceDetailDTO, VoiceSampleDTO
+from app.services.rate_limiter import PriorityRateLimiter, Priority, get_elevenlabs_rate_limiter
+from app.services.resilience import ResilientCaller, get_elevenlabs_resilience, status_code_of, retry_after_of
+from app.services.deadline import Deadline, DeadlineExceededError, OperationCancelledError
+from app.services.metrics import get_metrics_registry
 
 # ElevenLabs API configuration
 DEFAULT_TTS_MODEL = "eleven_multilingual_v2"
 NEW_TTS_MODEL = "eleven_v3"
 # Voice design models (different from TTS models)
 VOICE_DESIGN_MODEL = "eleven_multilingual_ttv_v2"
+# Pause applied to the shared limiter after a 429 without a Retry-After header
+DEFAULT_RATE_LIMIT_PAUSE_SECONDS = 1.0
+# Retries are handled by the resilience layer, not inside the SDK
+SDK_REQUEST_OPTIONS = {"max_retries": 0}
+# Response header with the characters billed for a TTS request
+CHARACTER_COUNT_HEADER = "x-character-count"
+
+
+def _upstream_call(priority: Priority, idempotent: bool = True, hedge: bool = False):
+    """
+    Run a client method under the shared ElevenLabs rate limiter and resilience layer.
+    
+    Each attempt holds a rate limiter slot until the method returns, including
+    streaming reads. A 429 from the API pauses the limiter for the Retry-After period.
+    Transient failures are retried with backoff and feed the circuit breaker.
+    A deadline passed as keyword argument bounds queueing and retries too.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            deadline = kwargs.get("deadline")
+            
+            def attempt():
+                with self.rate_limiter.acquire(priority, deadline=deadline):
+                    try:
+                        return method(self, *args, **kwargs)
+                    except Exception as e:
+                        self._pause_on_rate_limit(e)
+                        raise
+            return self.resilience.call(method.__name__, attempt, idempotent=idempotent, hedge=hedge, deadline=deadline)
+        return wrapper
+    return decorator
 
 
 class ElevenLabsAPIClient:
     """Client for interacting with ElevenLabs API."""
     
-    def __init__(self, api_key: str | None = None):
+    def __init__(self, api_key: str | None = None, rate_limiter: PriorityRateLimiter | None = None, resilience: ResilientCaller | None = None, base_url: str | None = None):
         """Initialize the ElevenLabs API client.
         
         Args:
             api_key: ElevenLabs API key. If not provided, will be read from ELEVENLABS_API_KEY env var.
+            rate_limiter: Limiter for outgoing requests. Defaults to the limiter shared by all clients.
+            resilience: Retry and circuit breaker policy. Defaults to the one shared by all clients.
+            base_url: API base URL, e.g. a local fake server. Defaults to ELEVENLABS_BASE_URL or production.
         """
         self.api_key = api_key or os.getenv("ELEVENLABS_API_KEY")
         if not self.api_key:
             raise ValueError("ElevenLabs API key is required. Set ELEVENLABS_API_KEY environment variable.")
         
-        self.client = ElevenLabs(api_key=self.api_key)
+        self.client = ElevenLabs(api_key=self.api_key, base_url=base_url or os.getenv("ELEVENLABS_BASE_URL") or None)
+        self.rate_limiter = rate_limiter or get_elevenlabs_rate_limiter()
+        self.resilience = resilience or get_elevenlabs_resilience()
     
+    def _pause_on_rate_limit(self, error: Exception) -> None:
+        """
+        Pause the rate limiter if the error (or its cause) is an HTTP 429 from ElevenLabs.
+        
+        Args:
+            error: Exception raised by an API call
+        """
+        if status_code_of(error) == 429:
+            retry_after = retry_after_of(error)
+            self.rate_limiter.pause(DEFAULT_RATE_LIMIT_PAUSE_SECONDS if retry_after is None else retry_after)
+    
+    @_upstream_call(Priority.background, hedge=True)
     def list_voices(self) -> List[VoiceDetailDTO]:
         """
         Retrieve all voices from ElevenLabs API.
@@ -46,7 +103,8 @@ class ElevenLabsAPIClient:
             response = self.client.voices.search(
                 include_total_count=True,
                 page_size=100,  # Get maximum voices per request
-                voice_type="personal"
+                voice_type="personal",
+                request_options=SDK_REQUEST_OPTIONS
             )
             
             voices = []
@@ -149,6 +207,7 @@ class ElevenLabsAPIClient:
             # Log the error but don't fail the entire voice mapping
             return None
     
+    @_upstream_call(Priority.interactive, idempotent=False)
     def design_voice(self, voice_description: str, loudness: float = 0.5, creativity: float = 5.0, sample_text: str = None) -> Dict[str, Any]:
         """
         Design a voice using ElevenLabs API.
@@ -180,7 +239,7 @@ class ElevenLabsAPIClient:
                 request_data["text"] = sample_text
             
             # Call ElevenLabs design API
-            response = self.client.text_to_voice.design(**request_data)
+            response = self.client.text_to_voice.design(**request_data, request_options=SDK_REQUEST_OPTIONS)
             
             return {
                 "previews": response.previews,
@@ -201,6 +260,7 @@ class ElevenLabsAPIClient:
             else:
                 raise Exception(f"Failed to design voice: {str(e)}") from e
     
+    @_upstream_call(Priority.interactive, idempotent=False)
     def create_voice_from_preview(self, voice_name: str, voice_description: str, generated_voice_id: str) -> Dict[str, Any]:
         """
         Create a voice from a generated preview.
@@ -220,7 +280,8 @@ class ElevenLabsAPIClient:
             response = self.client.text_to_voice.create(
                 voice_name=voice_name,
                 voice_description=voice_description,
-                generated_voice_id=generated_voice_id
+                generated_voice_id=generated_voice_id,
+                request_options=SDK_REQUEST_OPTIONS
             )
             
             return {
@@ -244,38 +305,72 @@ class ElevenLabsAPIClient:
             else:
                 raise Exception(f"Failed to create voice: {str(e)}") from e
     
-    def generate_speech(self, voice_id: str, text: str, timeout: int = 30) -> bytes:
+    @_upstream_call(Priority.realtime, idempotent=False)
+    def generate_speech(self, voice_id: str, text: str, timeout: float = 30, deadline: Deadline | None = None, on_character_count: Callable[[int], None] | None = None, model_id: str = DEFAULT_TTS_MODEL, first_audio_deadline: Deadline | None = None, on_first_audio: Callable[[], None] | None = None) -> bytes:
         """
         Generate speech audio from text using ElevenLabs API.
         
         Args:
             voice_id: ID of the voice to use
             text: Text to convert to speech
-            timeout: Request timeout in seconds
+            timeout: Time budget in seconds, used when no deadline is given
+            deadline: End-to-end deadline shared with the caller, bounds the request and the streaming read.
+                Cancelling it aborts the streaming read.
+            on_character_count: Called with the characters ElevenLabs billed for the request, if reported
+            model_id: TTS model to use
+            first_audio_deadline: Deadline for the first audio chunk, e.g. to fall back to another engine early
+            on_first_audio: Called when the first audio chunk arrives
             
         Returns:
             bytes: Generated audio data in MP3 format
             
         Raises:
+            DeadlineExceededError: If the deadline passes before all audio is received,
+                or first_audio_deadline before the first chunk
+            OperationCancelledError: If the deadline is cancelled before all audio is received
             Exception: If the API request fails
         """
+        deadline = deadline or Deadline.after(timeout)
+        metrics = get_metrics_registry()
+        metrics.increment("tts_requests_total", model=model_id)
+        started = time.monotonic()
+        # Until audio arrives, each read may only wait for the first audio deadline
+        read_deadline = first_audio_deadline or deadline
         try:
-            # Generate speech using ElevenLabs client
-            response = self.client.text_to_speech.convert(
+            # Generate speech using ElevenLabs client, the raw response exposes the billing headers
+            with self.client.text_to_speech.with_raw_response.convert(
                 voice_id=voice_id,
                 text=text,
-                model_id=DEFAULT_TTS_MODEL,
-                output_format="mp3_44100_128"
-            )
-            
-            # Convert generator to bytes
-            audio_data = b""
-            for chunk in response:
-                if isinstance(chunk, bytes):
-                    audio_data += chunk
+                model_id=model_id,
+                output_format="mp3_44100_128",
+                request_options={**SDK_REQUEST_OPTIONS, "timeout_in_seconds": max(1, math.ceil(read_deadline.remaining()))}
+            ) as response:
+                character_count = response.headers.get(CHARACTER_COUNT_HEADER)
+                if on_character_count is not None and character_count is not None and character_count.isdigit():
+                    on_character_count(int(character_count))
+                
+                # Convert stream to bytes, the HTTP timeout only bounds each read so check the deadline per chunk.
+                # Leaving the block closes the HTTP stream, so an abandoned download stops immediately.
+                audio_data = b""
+                for chunk in response.data:
+                    deadline.check("speech audio download")
+                    if isinstance(chunk, bytes):
+                        if not audio_data:
+                            if first_audio_deadline is not None:
+                                first_audio_deadline.check("first speech audio")
+                            if on_first_audio is not None:
+                                on_first_audio()
+                            # Time to first audio per model, divide by tts_first_audio_total for the mean
+                            metrics.increment("tts_first_audio_seconds_total", time.monotonic() - started, model=model_id)
+                            metrics.increment("tts_first_audio_total", model=model_id)
+                        audio_data += chunk
             
             return audio_data
             
+        except (DeadlineExceededError, OperationCancelledError):
+            raise
+        except httpx.TimeoutException as e:
+            raise DeadlineExceededError("speech synthesis request") from e
         except Exception as e:
             # Map ElevenLabs API errors to more specific exceptions
             error_message = str(e).lower()
@@ -292,6 +387,27 @@ class ElevenLabsAPIClient:
             else:
                 raise Exception(f"Failed to generate speech: {str(e)}") from e
 
+    @_upstream_call(Priority.background)
+    def get_subscription_usage(self) -> Dict[str, int]:
+        """
+        Get character usage of the current ElevenLabs billing period.
+        
+        Returns:
+            Dict with character_count and character_limit
+            
+        Raises:
+            Exception: If the API request fails
+        """
+        try:
+            subscription = self.client.user.subscription.get(request_options=SDK_REQUEST_OPTIONS)
+            return {
+                "character_count": subscription.character_count,
+                "character_limit": subscription.character_limit
+            }
+        except Exception as e:
+            raise Exception(f"Failed to retrieve ElevenLabs subscription: {str(e)}") from e
+    
+    @_upstream_call(Priority.interactive, idempotent=False)
     def delete_voice(self, voice_id: str) -> None:
         """
         Delete a voice using ElevenLabs API.
@@ -303,7 +419,7 @@ class ElevenLabsAPIClient:
             Exception: If the API request fails
         """
         try:
-            self.client.voices.delete(voice_id)
+            self.client.voices.delete(voice_id, request_options=SDK_REQUEST_OPTIONS)
             
         except Exception as e:
             # Map ElevenLabs API errors to more specific exceptions
@@ -0,0 +1,250 @@
+"""
+Job Service - Background execution of slow upstream operations.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, TypeVar
+
+from app.models import JobDTO, JobKind, JobStatus
+
+if TYPE_CHECKING:
+    from app.services.shared_state import RemoteJobRegistry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_PENDING = 100
+DEFAULT_TTL_SECONDS = 60 * 60
+
+T = TypeVar("T")
+
+TERMINAL_STATUSES = {JobStatus.succeeded, JobStatus.failed}
+
+
+class JobManager:
+    """
+    Runs jobs on a bounded worker pool and keeps their results in a TTL store.
+
+    At most max_workers jobs run at once, at most max_pending wait for a slot,
+    and finished jobs are forgotten ttl_seconds after they complete.
+
+    With a registry, every job is also registered there and each state change
+    is published to it, so any API worker can answer for jobs another one runs.
+    The registry is the bot process's JobManager, which stores those jobs
+    through register() and publish().
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, max_pending: int = DEFAULT_MAX_PENDING, ttl_seconds: float = DEFAULT_TTL_SECONDS, registry: "RemoteJobRegistry | None" = None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.ttl_seconds = ttl_seconds
+        self.registry = registry
+        self._jobs: dict[str, JobDTO] = {}
+        self._expires_at: dict[str, float] = {}
+        self._subscribers: dict[str, list[asyncio.Queue[JobDTO]]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._slots = asyncio.Semaphore(max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-worker")
+
+    async def submit(self, kind: JobKind, work: Callable[[str], Awaitable[object]]) -> JobDTO:
+        """
+        Queue a job and return once it can be looked up.
+
+        Args:
+            kind: Kind of job
+            work: Async callable receiving the job ID and returning the job result DTO
+
+        Returns:
+            JobDTO in pending status
+
+        Raises:
+            ValueError: If too many jobs are already waiting
+        """
+        now = datetime.now(timezone.utc)
+        job = JobDTO(id=str(uuid.uuid4()), kind=kind, status=JobStatus.pending, created_at=now, updated_at=now)
+        if self.registry is not None:
+            # Admitted against the jobs of every API worker
+            await self.registry.register(job)
+            self._jobs[job.id] = job
+        else:
+            self.register(job)
+
+        task = asyncio.create_task(self._run(job.id, work))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        logger.info(f"Queued {kind.value} job {job.id}")
+        return job
+
+    def register(self, job: JobDTO) -> None:
+        """
+        Admit a new job to the store, e.g. one another API worker is about to run.
+
+        Args:
+            job: Job in pending status
+
+        Raises:
+            ValueError: If too many jobs are already waiting
+        """
+        self._purge_expired()
+
+        pending = sum(1 for known in self._jobs.values() if known.status == JobStatus.pending)
+        if pending >= self.max_pending:
+            raise ValueError("Job queue is full - please try again later")
+        self._jobs[job.id] = job
+
+    def publish(self, job: JobDTO) -> None:
+        """
+        Store a new state of a job and pass it to its subscribers.
+
+        Args:
+            job: Job snapshot, e.g. one reported by the API worker running it
+        """
+        self._jobs[job.id] = job
+        if job.status in TERMINAL_STATUSES:
+            self._expires_at[job.id] = time.monotonic() + self.ttl_seconds
+        for queue in self._subscribers.get(job.id, []):
+            queue.put_nowait(job)
+
+    async def get(self, job_id: str) -> JobDTO | None:
+        """
+        Get a job by ID.
+
+        Args:
+            job_id: ID returned by submit
+
+        Returns:
+            JobDTO or None if unknown or expired
+        """
+        self._purge_expired()
+        job = self._jobs.get(job_id)
+        if job is None and self.registry is not None:
+            return await self.registry.get(job_id)
+        return job
+
+    def set_progress(self, job_id: str, progress: float) -> None:
+        """
+        Report progress of a running job.
+
+        Args:
+            job_id: ID of the job
+            progress: Completed fraction between 0 and 1
+        """
+        if job_id in self._jobs:
+            self._update(job_id, progress=max(0.0, min(1.0, progress)))
+
+    async def run_in_worker(self, func: Callable[..., T], *args) -> T:
+        """
+        Run a blocking function on the job worker pool.
+
+        Args:
+            func: Blocking function, e.g. a synchronous ElevenLabs call
+            *args: Positional arguments for func
+
+        Returns:
+            Result of func
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[JobDTO]:
+        """
+        Yield the job's current state and then every change until it finishes.
+
+        Args:
+            job_id: ID of the job
+
+        Yields:
+            JobDTO snapshots, the last one in a terminal status
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            if self.registry is not None:
+                async for job in self.registry.subscribe(job_id):
+                    yield job
+            return
+
+        queue: asyncio.Queue[JobDTO] = asyncio.Queue()
+        self._subscribers.setdefault(job_id, []).append(queue)
+        try:
+            yield job
+            while job.status not in TERMINAL_STATUSES:
+                job = await queue.get()
+                yield job
+        finally:
+            self._subscribers[job_id].remove(queue)
+            if not self._subscribers[job_id]:
+                del self._subscribers[job_id]
+
+    async def shutdown(self) -> None:
+        """
+        Cancel running jobs and stop the worker pool.
+        """
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, job_id: str, work: Callable[[str], Awaitable[object]]) -> None:
+        async with self._slots:
+            self._update(job_id, status=JobStatus.running)
+            try:
+                result = await work(job_id)
+                self._update(job_id, status=JobStatus.succeeded, result=result, progress=1.0)
+                logger.info(f"Job {job_id} succeeded")
+            except Exception as e:
+                self._update(job_id, status=JobStatus.failed, error=str(e))
+                logger.error(f"Job {job_id} failed: {str(e)}")
+
+    def _update(self, job_id: str, **changes) -> None:
+        job = self._jobs[job_id].model_copy(update={**changes, "updated_at": datetime.now(timezone.utc)})
+        self.publish(job)
+        if self.registry is not None:
+            self.registry.publish(job)
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        expired = [job_id for job_id, expires_at in self._expires_at.items() if expires_at <= now]
+        for job_id in expired:
+            self._jobs.pop(job_id, None)
+            self._expires_at.pop(job_id, None)
+
+
+_job_manager: JobManager | None = None
+
+
+def get_job_manager() -> JobManager:
+    """
+    Get the job manager instance, configured from environment variables.
+
+    JOB_MAX_WORKERS, JOB_MAX_PENDING and JOB_TTL_SECONDS override the defaults.
+    In the bot process, JOB_MAX_PENDING and JOB_TTL_SECONDS apply to the jobs of all API workers.
+
+    Returns:
+        JobManager instance
+    """
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager(
+            max_workers=int(os.getenv("JOB_MAX_WORKERS", DEFAULT_MAX_WORKERS)),
+            max_pending=int(os.getenv("JOB_MAX_PENDING", DEFAULT_MAX_PENDING)),
+            ttl_seconds=float(os.getenv("JOB_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+        )
+    return _job_manager
+
+
+async def shutdown_job_manager() -> None:
+    """
+    Shut down the job manager if it was started.
+    """
+    global _job_manager
+    if _job_manager is not None:
+        await _job_manager.shutdown()
+        _job_manager = None
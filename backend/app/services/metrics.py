@@ -0,0 +1,83 @@
+"""
+Metrics - In-process counters for upstream usage and runtime behaviour.
+"""
+
+import threading
+from collections import defaultdict
+
+from app.models import RuntimeMetricsDTO
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of labelled counters.
+
+    Counters are keyed Prometheus-style, e.g. openai_requests_total{model="gpt-4.1-mini"}.
+    """
+
+    def __init__(self):
+        self._counters: dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: dict[str, str]) -> str:
+        if not labels:
+            return name
+        label_text = ",".join(f'{label}="{value}"' for label, value in sorted(labels.items()))
+        return f"{name}{{{label_text}}}"
+
+    def increment(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """
+        Add a value to a counter.
+
+        Args:
+            name: Counter name
+            value: Amount to add
+            **labels: Label values identifying the series
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] += value
+
+    def get(self, name: str, **labels: str) -> float:
+        """
+        Get the current value of a counter.
+
+        Args:
+            name: Counter name
+            **labels: Label values identifying the series
+
+        Returns:
+            Counter value, 0 if never incremented
+        """
+        with self._lock:
+            return self._counters.get(self._key(name, labels), 0.0)
+
+    def snapshot(self) -> RuntimeMetricsDTO:
+        """
+        Get a copy of all counters.
+
+        Returns:
+            RuntimeMetricsDTO with counters sorted by key
+        """
+        with self._lock:
+            return RuntimeMetricsDTO(counters=dict(sorted(self._counters.items())))
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        with self._lock:
+            self._counters.clear()
+
+
+# Global instance of the metrics registry
+metrics_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    Get the metrics registry instance.
+
+    Returns:
+        MetricsRegistry instance
+    """
+    return metrics_registry
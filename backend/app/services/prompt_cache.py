@@ -0,0 +1,212 @@
+"""
+Prompt Cache - Bounded TTL cache for prompt operation results.
+"""
+
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+
+from db.db import Database
+from db.migrations import Migration
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+# Minimum time between sweeps of expired and surplus persisted entries
+PRUNE_INTERVAL_SECONDS = 10 * 60
+
+
+class PromptCache:
+    """
+    LRU cache of prompt results with a TTL and optional SQLite persistence.
+
+    Entries are keyed by operation, instruction hash, model and input text, so
+    editing an instruction file or switching models never serves stale results.
+    Persistence is best effort: SQLite errors are logged and treated as misses.
+    Persisted entries are pruned to the TTL and max_entries as well.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS, db_path: str | None = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept in memory
+            ttl_seconds: Time after which an entry expires
+            db_path: Optional SQLite database path for persisting entries across restarts
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._instruction_hashes: dict[str, str] = {}
+        self._db: Database | None = None
+        self._next_prune = 0.0
+
+        if db_path:
+            try:
+                self._db = Database(db_path)
+                self._db.connect()
+                Migration(self._db).create_tables()
+            except Exception as e:
+                logger.warning(f"Prompt cache persistence disabled: {str(e)}")
+                self.close()
+
+    def make_key(self, operation: str, instruction: str, model: str, text: str) -> str:
+        """
+        Build the cache key for a prompt operation.
+
+        Args:
+            operation: Name of the prompt operation
+            instruction: System instruction sent with the request
+            model: OpenAI model ID
+            text: User input text
+
+        Returns:
+            Hex digest identifying the request
+        """
+        instruction_hash = self._instruction_hashes.get(instruction)
+        if instruction_hash is None:
+            instruction_hash = hashlib.sha256(instruction.encode("utf-8")).hexdigest()
+            self._instruction_hashes[instruction] = instruction_hash
+
+        key_source = "\x00".join([operation, instruction_hash, model, text])
+        return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """
+        Get a cached result.
+
+        Args:
+            key: Key built with make_key
+
+        Returns:
+            Cached result or None if missing or expired
+        """
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is None and self._db:
+            try:
+                row = self._db.fetch_one("SELECT value, expires_at FROM prompt_cache WHERE key = ?", (key,))
+            except Exception as e:
+                logger.warning(f"Failed to read persisted prompt cache entry: {str(e)}")
+                row = None
+            if row:
+                entry = (row["expires_at"], row["value"])
+                self._store(key, entry)
+
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= now:
+            self._delete(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a result.
+
+        Args:
+            key: Key built with make_key
+            value: Result to cache
+        """
+        entry = (time.time() + self.ttl_seconds, value)
+        self._store(key, entry)
+
+        if self._db:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO prompt_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, entry[0])
+                )
+                self._db.commit()
+            except Exception as e:
+                logger.warning(f"Failed to persist prompt cache entry: {str(e)}")
+            self._prune()
+
+    def clear(self) -> None:
+        """Remove all entries, including persisted ones."""
+        self._entries.clear()
+        if self._db:
+            try:
+                self._db.execute("DELETE FROM prompt_cache")
+                self._db.commit()
+            except Exception as e:
+                logger.warning(f"Failed to clear persisted prompt cache: {str(e)}")
+
+    def close(self) -> None:
+        """Close the SQLite connection if persistence is enabled."""
+        if self._db:
+            self._db.disconnect()
+            self._db = None
+
+    def _store(self, key: str, entry: tuple[float, str]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self._db:
+            try:
+                self._db.execute("DELETE FROM prompt_cache WHERE key = ?", (key,))
+                self._db.commit()
+            except Exception as e:
+                logger.warning(f"Failed to delete persisted prompt cache entry: {str(e)}")
+
+    def _prune(self) -> None:
+        # Drop expired rows and keep only the max_entries most recently written ones
+        now = time.time()
+        if not self._db or now < self._next_prune:
+            return
+        self._next_prune = now + PRUNE_INTERVAL_SECONDS
+        try:
+            self._db.execute("DELETE FROM prompt_cache WHERE expires_at <= ?", (now,))
+            self._db.execute(
+                "DELETE FROM prompt_cache WHERE key NOT IN "
+                "(SELECT key FROM prompt_cache ORDER BY expires_at DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            self._db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to prune persisted prompt cache: {str(e)}")
+
+
+_prompt_cache: PromptCache | None = None
+
+
+def get_prompt_cache() -> PromptCache:
+    """
+    Get the prompt cache instance, configured from environment variables.
+
+    PROMPT_CACHE_MAX_ENTRIES and PROMPT_CACHE_TTL_SECONDS bound the cache,
+    PROMPT_CACHE_DB_PATH enables SQLite persistence when set.
+
+    Returns:
+        PromptCache instance
+    """
+    global _prompt_cache
+    if _prompt_cache is None:
+        _prompt_cache = PromptCache(
+            max_entries=int(os.getenv("PROMPT_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            ttl_seconds=float(os.getenv("PROMPT_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+            db_path=os.getenv("PROMPT_CACHE_DB_PATH") or None
+        )
+    return _prompt_cache
+
+
+def close_prompt_cache() -> None:
+    """
+    Close the prompt cache and release its SQLite connection.
+    """
+    global _prompt_cache
+    if _prompt_cache is not None:
+        _prompt_cache.close()
+        _prompt_cache = None
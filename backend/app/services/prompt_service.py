@@ -1,107 +1,322 @@
-from openai import OpenAI
+import logging
+from collections.abc import AsyncIterator
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from app.models import PromptImprovementCommand, GenerateSampleTextCommand, TranslateVoiceDescriptionCommand
 from app.config.prompt_instructions import IMPROVE_PROMPT_INSTRUCTION, GENERATE_SAMPLE_TEXT_INSTRUCTION, TRANSLATE_VOICE_DESCRIPTION_INSTRUCTION
 from app.services.error_logging import log_error
+from app.services.prompt_cache import get_prompt_cache
+from app.services.metrics import get_metrics_registry
+from app.services.resilience import get_openai_resilience
 from app.models import ApiType
 
+logger = logging.getLogger(__name__)
 
-async def improve_prompt(cmd: PromptImprovementCommand) -> str:
+OPENAI_MODEL = "gpt-4.1-mini"
+# Connection pool shared by all prompt operations
+OPENAI_MAX_CONNECTIONS = 20
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = 10
+
+_openai_client: AsyncOpenAI | None = None
+
+
+def get_openai_client() -> AsyncOpenAI:
     """
-    Improve a prompt using OpenAI API.
-    
-    Args:
-        cmd: Command containing the prompt to improve
-        
+    Get the shared AsyncOpenAI client, creating it on first use.
+
     Returns:
-        Improved prompt text
-        
+        AsyncOpenAI client with a pooled HTTP connection
+
+    Raises:
+        openai.OpenAIError: If the OpenAI API key is not configured
+    """
+    global _openai_client
+    if _openai_client is None:
+        # Retries are handled by the resilience layer, not inside the SDK
+        _openai_client = AsyncOpenAI(
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS
+                )
+            )
+        )
+    return _openai_client
+
+
+async def close_openai_client() -> None:
+    """
+    Close the shared AsyncOpenAI client and release its connections.
+    """
+    global _openai_client
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+
+
+def _build_messages(instruction: str, user_content: str) -> list[dict[str, str]]:
+    """
+    Build chat messages with the static instruction as the leading prefix.
+
+    OpenAI caches prompt prefixes automatically, so the instruction is sent
+    first and byte-identical on every call (loaded once at import) and all
+    per-request text goes into the trailing user message.
+    """
+    return [
+        {"role": "system", "content": instruction},
+        {"role": "user", "content": user_content}
+    ]
+
+
+def _record_usage(operation: str, usage: object | None) -> None:
+    """
+    Record token usage of a completion, including prompt tokens served from OpenAI's cache.
+    """
+    if usage is None:
+        return
+
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+    cached_tokens = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", 0) or 0
+
+    metrics = get_metrics_registry()
+    metrics.increment("openai_requests_total", operation=operation, model=OPENAI_MODEL)
+    metrics.increment("openai_prompt_tokens_total", prompt_tokens, operation=operation, model=OPENAI_MODEL)
+    metrics.increment("openai_cached_prompt_tokens_total", cached_tokens, operation=operation, model=OPENAI_MODEL)
+    metrics.increment("openai_completion_tokens_total", completion_tokens, operation=operation, model=OPENAI_MODEL)
+
+    logger.info(f"OpenAI usage for {operation}: prompt_tokens={prompt_tokens}, cached_tokens={cached_tokens}, completion_tokens={completion_tokens}")
+
+
+async def _complete(operation: str, instruction: str, user_content: str, max_tokens: int, temperature: float) -> str:
+    """
+    Run a chat completion and return the stripped response text.
+
     Raises:
         Exception: If OpenAI API call fails
     """
     try:
-        client = OpenAI()
-        
-        response = client.chat.completions.create(
-            model="gpt-4.1-mini",
-            messages=[
-                {"role": "system", "content": IMPROVE_PROMPT_INSTRUCTION},
-                {"role": "user", "content": f"Podstawowy opis do ulepszenia: {cmd.prompt}"}
-            ],
-            max_tokens=1000,
-            temperature=0.7
-        )
-        
+        client = get_openai_client()
+
+        response = await get_openai_resilience().call_async(operation, lambda: client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=_build_messages(instruction, user_content),
+            max_tokens=max_tokens,
+            temperature=temperature
+        ))
+        _record_usage(operation, response.usage)
+
         return response.choices[0].message.content.strip()
-        
+
+    except Exception as e:
+        error_message = f"OpenAI API call failed: {str(e)}"
+        log_error(ApiType.prompt_improvement, error_message)
+        raise Exception("External API failure") from e
+
+
+async def _stream(operation: str, instruction: str, user_content: str, max_tokens: int, temperature: float) -> AsyncIterator[str]:
+    """
+    Run a streaming chat completion and yield text deltas as they arrive.
+
+    Raises:
+        Exception: If OpenAI API call fails
+    """
+    try:
+        client = get_openai_client()
+
+        # Only opening the stream is retried, a failure after the first delta reaches the caller
+        stream = await get_openai_resilience().call_async(operation, lambda: client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=_build_messages(instruction, user_content),
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+            stream_options={"include_usage": True}
+        ))
+
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+            # The final chunk carries usage and no choices
+            if chunk.usage:
+                _record_usage(operation, chunk.usage)
+
     except Exception as e:
         error_message = f"OpenAI API call failed: {str(e)}"
         log_error(ApiType.prompt_improvement, error_message)
         raise Exception("External API failure") from e
 
 
+async def _cached_complete(operation: str, instruction: str, user_content: str, max_tokens: int, temperature: float, fresh: bool) -> str:
+    """
+    Run a chat completion through the prompt cache.
+
+    A fresh request skips the cache lookup but still stores its result.
+
+    Raises:
+        Exception: If OpenAI API call fails
+    """
+    cache = get_prompt_cache()
+    key = cache.make_key(operation, instruction, OPENAI_MODEL, user_content)
+    if not fresh:
+        cached = cache.get(key)
+        if cached is not None:
+            logger.debug(f"Prompt cache hit for operation={operation}")
+            return cached
+
+    result = await _complete(operation, instruction, user_content, max_tokens, temperature)
+    cache.set(key, result)
+    return result
+
+
+async def _cached_stream(operation: str, instruction: str, user_content: str, max_tokens: int, temperature: float, fresh: bool) -> AsyncIterator[str]:
+    """
+    Run a streaming chat completion through the prompt cache.
+
+    A cache hit is yielded as a single delta; a completed stream is stored.
+
+    Raises:
+        Exception: If OpenAI API call fails
+    """
+    cache = get_prompt_cache()
+    key = cache.make_key(operation, instruction, OPENAI_MODEL, user_content)
+    if not fresh:
+        cached = cache.get(key)
+        if cached is not None:
+            logger.debug(f"Prompt cache hit for operation={operation}")
+            yield cached
+            return
+
+    parts = []
+    async for delta in _stream(operation, instruction, user_content, max_tokens, temperature):
+        parts.append(delta)
+        yield delta
+    cache.set(key, "".join(parts).strip())
+
+
+async def improve_prompt(cmd: PromptImprovementCommand) -> str:
+    """
+    Improve a prompt using OpenAI API.
+
+    Args:
+        cmd: Command containing the prompt to improve
+
+    Returns:
+        Improved prompt text
+
+    Raises:
+        Exception: If OpenAI API call fails
+    """
+    return await _cached_complete(
+        "improve_prompt",
+        IMPROVE_PROMPT_INSTRUCTION,
+        f"Podstawowy opis do ulepszenia: {cmd.prompt}",
+        max_tokens=1000,
+        temperature=0.7,
+        fresh=cmd.fresh
+    )
+
+
+def stream_improve_prompt(cmd: PromptImprovementCommand) -> AsyncIterator[str]:
+    """
+    Improve a prompt using OpenAI API, yielding text as it is generated.
+
+    Args:
+        cmd: Command containing the prompt to improve
+
+    Returns:
+        Async iterator of improved prompt text deltas
+    """
+    return _cached_stream(
+        "improve_prompt",
+        IMPROVE_PROMPT_INSTRUCTION,
+        f"Podstawowy opis do ulepszenia: {cmd.prompt}",
+        max_tokens=1000,
+        temperature=0.7,
+        fresh=cmd.fresh
+    )
+
+
 async def generate_sample_text(cmd: GenerateSampleTextCommand) -> str:
     """
     Generate sample text based on voice description using OpenAI API.
-    
+
     Args:
         cmd: Command containing the voice description
-        
+
     Returns:
         Generated sample text
-        
+
     Raises:
         Exception: If OpenAI API call fails
     """
-    try:
-        client = OpenAI()
-        
-        response = client.chat.completions.create(
-            model="gpt-4.1-mini",
-            messages=[
-                {"role": "system", "content": GENERATE_SAMPLE_TEXT_INSTRUCTION},
-                {"role": "user", "content": f"Opis głosu: {cmd.voice_description}"}
-            ],
-            max_tokens=500,
-            temperature=0.8
-        )
-        
-        return response.choices[0].message.content.strip()
-        
-    except Exception as e:
-        error_message = f"OpenAI API call failed: {str(e)}"
-        log_error(ApiType.prompt_improvement, error_message)  # Using same ApiType for now
-        raise Exception("External API failure") from e
+    return await _complete(
+        "generate_sample_text",
+        GENERATE_SAMPLE_TEXT_INSTRUCTION,
+        f"Opis głosu: {cmd.voice_description}",
+        max_tokens=500,
+        temperature=0.8
+    )
+
+
+def stream_generate_sample_text(cmd: GenerateSampleTextCommand) -> AsyncIterator[str]:
+    """
+    Generate sample text using OpenAI API, yielding text as it is generated.
+
+    Args:
+        cmd: Command containing the voice description
+
+    Returns:
+        Async iterator of sample text deltas
+    """
+    return _stream(
+        "generate_sample_text",
+        GENERATE_SAMPLE_TEXT_INSTRUCTION,
+        f"Opis głosu: {cmd.voice_description}",
+        max_tokens=500,
+        temperature=0.8
+    )
 
 
 async def translate_voice_description(cmd: TranslateVoiceDescriptionCommand) -> str:
     """
     Translate voice description from Polish to English using OpenAI API.
-    
+
     Args:
         cmd: Command containing the voice description to translate
-        
+
     Returns:
         Translated voice description in English
-        
+
     Raises:
         Exception: If OpenAI API call fails
     """
-    try:
-        client = OpenAI()
-        
-        response = client.chat.completions.create(
-            model="gpt-4.1-mini",
-            messages=[
-                {"role": "system", "content": TRANSLATE_VOICE_DESCRIPTION_INSTRUCTION},
-                {"role": "user", "content": cmd.voice_description}
-            ],
-            max_tokens=500,
-            temperature=0.3
-        )
-        
-        return response.choices[0].message.content.strip()
-        
-    except Exception as e:
-        error_message = f"OpenAI API call failed: {str(e)}"
-        log_error(ApiType.prompt_improvement, error_message)  # Using same ApiType for now
-        raise Exception("External API failure") from e 
\ No newline at end of file
+    return await _cached_complete(
+        "translate_voice_description",
+        TRANSLATE_VOICE_DESCRIPTION_INSTRUCTION,
+        cmd.voice_description,
+        max_tokens=500,
+        temperature=0.3,
+        fresh=cmd.fresh
+    )
+
+
+def stream_translate_voice_description(cmd: TranslateVoiceDescriptionCommand) -> AsyncIterator[str]:
+    """
+    Translate voice description using OpenAI API, yielding text as it is generated.
+
+    Args:
+        cmd: Command containing the voice description to translate
+
+    Returns:
+        Async iterator of translated description deltas
+    """
+    return _cached_stream(
+        "translate_voice_description",
+        TRANSLATE_VOICE_DESCRIPTION_INSTRUCTION,
+        cmd.voice_description,
+        max_tokens=500,
+        temperature=0.3,
+        fresh=cmd.fresh
+    )
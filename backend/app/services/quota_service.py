@@ -0,0 +1,312 @@
+"""
+Quota Service - Character accounting and admission control for ElevenLabs usage.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from app.models import QuotaPeriod, QuotaUsageDTO, QuotaStatusDTO
+from app.services.metrics import get_metrics_registry
+
+if TYPE_CHECKING:
+    from app.services.shared_state import RemoteQuotaLedger
+
+logger = logging.getLogger(__name__)
+
+OVERALL_SCOPE = "overall"
+# Share of a budget that may be spent before new upstream requests are refused
+DEFAULT_SOFT_LIMIT_RATIO = 0.95
+# How long ElevenLabs subscription usage is trusted before it is fetched again
+DEFAULT_SUBSCRIPTION_SYNC_SECONDS = 5 * 60
+
+
+class QuotaExceededError(Exception):
+    """Raised when a request would push character usage past a budget."""
+
+
+class QuotaReservation:
+    """
+    Characters set aside for one upstream request until its actual cost is known.
+    """
+
+    def __init__(self, voice_id: str | None, characters: int, periods: dict[QuotaPeriod, str]):
+        self.voice_id = voice_id
+        self.characters = characters
+        self.periods = periods
+        self.actual: int | None = None
+
+    def record_actual(self, characters: int) -> None:
+        """
+        Record the characters the upstream actually billed, e.g. from a response header.
+
+        Each attempt of a retried request is billed separately, so counts add up.
+
+        Args:
+            characters: Characters billed for one attempt
+        """
+        self.actual = (self.actual or 0) + characters
+
+
+class QuotaLedger:
+    """
+    Tracks character spend per day and month, overall and per voice.
+
+    Before each upstream call the estimated cost is reserved, which fails if a
+    budget would be exceeded; afterwards the reservation is committed with the
+    actual cost or released if the call failed. Budgets stop admitting requests
+    at soft_limit_ratio, leaving headroom so requests already in flight and
+    estimation errors never run into ElevenLabs' own 401/429 quota errors.
+    A limit of 0 means unlimited.
+
+    Usage is kept in memory. The overall picture survives restarts through
+    sync_subscription, which anchors the ledger to the usage ElevenLabs reports.
+    """
+
+    def __init__(
+        self,
+        daily_limit: int = 0,
+        monthly_limit: int = 0,
+        voice_daily_limit: int = 0,
+        voice_monthly_limit: int = 0,
+        soft_limit_ratio: float = DEFAULT_SOFT_LIMIT_RATIO,
+        subscription_sync_seconds: float = DEFAULT_SUBSCRIPTION_SYNC_SECONDS
+    ):
+        self.limits = {
+            (QuotaPeriod.daily, False): daily_limit,
+            (QuotaPeriod.monthly, False): monthly_limit,
+            (QuotaPeriod.daily, True): voice_daily_limit,
+            (QuotaPeriod.monthly, True): voice_monthly_limit
+        }
+        self.soft_limit_ratio = soft_limit_ratio
+        self.subscription_sync_seconds = subscription_sync_seconds
+        self._used: dict[tuple[str, str], int] = {}
+        self._reserved: dict[tuple[str, str], int] = {}
+        self._subscription_used: int | None = None
+        self._subscription_limit: int | None = None
+        self._subscription_synced_at: float | None = None
+        self._subscription_refreshing = False
+        self._lock = threading.Lock()
+
+    def reserve(self, voice_id: str | None, characters: int) -> QuotaReservation:
+        """
+        Reserve the estimated cost of a request.
+
+        Args:
+            voice_id: Voice the characters are spent on, None for voice design
+            characters: Estimated characters
+
+        Returns:
+            QuotaReservation to commit or release once the request finished
+
+        Raises:
+            QuotaExceededError: If a budget would be exceeded
+        """
+        periods = self._current_periods()
+        with self._lock:
+            self._purge_old_periods(periods)
+            for period, period_key in periods.items():
+                for scope in self._scopes(voice_id):
+                    limit = self.limits[(period, scope != OVERALL_SCOPE)]
+                    if limit and self._spent(period_key, scope) + characters > limit * self.soft_limit_ratio:
+                        self._reject(scope, period.value)
+
+            if self._subscription_limit:
+                reserved = self._reserved.get((periods[QuotaPeriod.monthly], OVERALL_SCOPE), 0)
+                if self._subscription_used + reserved + characters > self._subscription_limit * self.soft_limit_ratio:
+                    self._reject(OVERALL_SCOPE, "subscription")
+
+            for period_key in periods.values():
+                for scope in self._scopes(voice_id):
+                    key = (period_key, scope)
+                    self._reserved[key] = self._reserved.get(key, 0) + characters
+
+        return QuotaReservation(voice_id, characters, periods)
+
+    def commit(self, reservation: QuotaReservation) -> None:
+        """
+        Turn a reservation into spend, using the actual cost if it was recorded.
+
+        Args:
+            reservation: Reservation returned by reserve
+        """
+        spent = reservation.characters if reservation.actual is None else reservation.actual
+        with self._lock:
+            self._unreserve(reservation)
+            for period_key in reservation.periods.values():
+                for scope in self._scopes(reservation.voice_id):
+                    key = (period_key, scope)
+                    self._used[key] = self._used.get(key, 0) + spent
+            if self._subscription_used is not None:
+                self._subscription_used += spent
+
+        metrics = get_metrics_registry()
+        metrics.increment("quota_characters_total", spent)
+        if reservation.actual is not None:
+            metrics.increment("quota_estimate_error_characters_total", abs(reservation.actual - reservation.characters))
+
+    def release(self, reservation: QuotaReservation) -> None:
+        """
+        Drop a reservation whose request failed before it was billed.
+
+        Args:
+            reservation: Reservation returned by reserve
+        """
+        with self._lock:
+            self._unreserve(reservation)
+
+    def sync_subscription(self, character_count: int, character_limit: int) -> None:
+        """
+        Anchor overall usage to the figures reported by ElevenLabs.
+
+        Args:
+            character_count: Characters used in the current billing period
+            character_limit: Characters available in the current billing period
+        """
+        with self._lock:
+            self._subscription_used = character_count
+            self._subscription_limit = character_limit
+            self._subscription_synced_at = time.monotonic()
+            self._subscription_refreshing = False
+        logger.info(f"Synced ElevenLabs character usage: {character_count}/{character_limit}")
+
+    def begin_subscription_refresh(self) -> bool:
+        """
+        Claim the next subscription refresh if the synced figures are stale.
+
+        Returns:
+            True if the caller should fetch subscription usage and call sync_subscription
+        """
+        with self._lock:
+            stale = self._subscription_synced_at is None or time.monotonic() - self._subscription_synced_at >= self.subscription_sync_seconds
+            if not stale or self._subscription_refreshing:
+                return False
+            self._subscription_refreshing = True
+            return True
+
+    def end_subscription_refresh(self) -> None:
+        """Give up a claimed refresh that failed, so the next request retries it."""
+        with self._lock:
+            self._subscription_refreshing = False
+
+    def is_degraded(self) -> bool:
+        """
+        Check whether the overall budget is nearly exhausted.
+
+        Returns:
+            True if new synthesis is refused and only cached audio can be served
+        """
+        periods = self._current_periods()
+        with self._lock:
+            for period, period_key in periods.items():
+                limit = self.limits[(period, False)]
+                if limit and self._spent(period_key, OVERALL_SCOPE) >= limit * self.soft_limit_ratio:
+                    return True
+            if self._subscription_limit:
+                return self._subscription_used >= self._subscription_limit * self.soft_limit_ratio
+        return False
+
+    def status(self) -> QuotaStatusDTO:
+        """
+        Get current usage against every configured budget.
+
+        Returns:
+            QuotaStatusDTO with one entry per scope and period that has a limit
+        """
+        periods = self._current_periods()
+        degraded = self.is_degraded()
+        usages = []
+        with self._lock:
+            self._purge_old_periods(periods)
+            scopes = {scope for (_, scope) in self._used} | {scope for (_, scope) in self._reserved} | {OVERALL_SCOPE}
+            for scope in sorted(scopes):
+                for period, period_key in periods.items():
+                    limit = self.limits[(period, scope != OVERALL_SCOPE)]
+                    if not limit:
+                        continue
+                    usages.append(QuotaUsageDTO(
+                        scope=scope,
+                        period=period,
+                        used=self._used.get((period_key, scope), 0),
+                        reserved=self._reserved.get((period_key, scope), 0),
+                        limit=limit
+                    ))
+            return QuotaStatusDTO(
+                degraded=degraded,
+                usages=usages,
+                subscription_used=self._subscription_used,
+                subscription_limit=self._subscription_limit
+            )
+
+    @staticmethod
+    def _scopes(voice_id: str | None) -> list[str]:
+        return [OVERALL_SCOPE] if voice_id is None else [OVERALL_SCOPE, voice_id]
+
+    @staticmethod
+    def _current_periods() -> dict[QuotaPeriod, str]:
+        now = datetime.now(timezone.utc)
+        return {QuotaPeriod.daily: now.strftime("%Y-%m-%d"), QuotaPeriod.monthly: now.strftime("%Y-%m")}
+
+    def _spent(self, period_key: str, scope: str) -> int:
+        key = (period_key, scope)
+        return self._used.get(key, 0) + self._reserved.get(key, 0)
+
+    def _unreserve(self, reservation: QuotaReservation) -> None:
+        for period_key in reservation.periods.values():
+            for scope in self._scopes(reservation.voice_id):
+                key = (period_key, scope)
+                remaining = self._reserved.get(key, 0) - reservation.characters
+                if remaining > 0:
+                    self._reserved[key] = remaining
+                else:
+                    self._reserved.pop(key, None)
+
+    def _purge_old_periods(self, periods: dict[QuotaPeriod, str]) -> None:
+        current = set(periods.values())
+        for key in [key for key in self._used if key[0] not in current]:
+            del self._used[key]
+
+    def _reject(self, scope: str, period: str) -> None:
+        get_metrics_registry().increment("quota_rejections_total", scope="overall" if scope == OVERALL_SCOPE else "voice", period=period)
+        target = "overall" if scope == OVERALL_SCOPE else f"voice {scope}"
+        raise QuotaExceededError(f"Character quota nearly exhausted ({target}, {period}) - only cached audio is available")
+
+
+_quota_ledger: "QuotaLedger | RemoteQuotaLedger | None" = None
+
+
+def get_quota_ledger() -> "QuotaLedger | RemoteQuotaLedger":
+    """
+    Get the quota ledger instance, configured from environment variables.
+
+    QUOTA_DAILY_CHARACTERS and QUOTA_MONTHLY_CHARACTERS cap overall usage,
+    QUOTA_VOICE_DAILY_CHARACTERS and QUOTA_VOICE_MONTHLY_CHARACTERS cap each voice,
+    QUOTA_SOFT_LIMIT_RATIO sets the share of a budget usable before requests are refused.
+
+    Returns:
+        QuotaLedger instance, or a RemoteQuotaLedger in API workers that share the bot process's ledger
+    """
+    global _quota_ledger
+    if _quota_ledger is None:
+        _quota_ledger = QuotaLedger(
+            daily_limit=int(os.getenv("QUOTA_DAILY_CHARACTERS", "0")),
+            monthly_limit=int(os.getenv("QUOTA_MONTHLY_CHARACTERS", "0")),
+            voice_daily_limit=int(os.getenv("QUOTA_VOICE_DAILY_CHARACTERS", "0")),
+            voice_monthly_limit=int(os.getenv("QUOTA_VOICE_MONTHLY_CHARACTERS", "0")),
+            soft_limit_ratio=float(os.getenv("QUOTA_SOFT_LIMIT_RATIO", DEFAULT_SOFT_LIMIT_RATIO))
+        )
+    return _quota_ledger
+
+
+def set_quota_ledger(ledger: "QuotaLedger | RemoteQuotaLedger") -> None:
+    """
+    Replace the quota ledger, e.g. with the bot process's in API workers.
+
+    Args:
+        ledger: Ledger used for admission control from now on
+    """
+    global _quota_ledger
+    _quota_ledger = ledger
@@ -0,0 +1,241 @@
+"""
+Rate Limiter - Priority-aware token bucket for upstream API calls.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from collections.abc import AsyncIterator, Iterator
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+from app.services.deadline import Deadline
+from app.services.metrics import get_metrics_registry
+
+if TYPE_CHECKING:
+    from app.services.shared_state import RemoteRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# How often a queued request with a deadline re-checks whether it was cancelled
+CANCEL_POLL_SECONDS = 0.1
+# How often a request queued on the event loop re-checks whether it was admitted
+ASYNC_POLL_SECONDS = 0.01
+
+
+class Priority(IntEnum):
+    """Request priority classes, lower values are served first."""
+    realtime = 0      # live Discord playback
+    interactive = 1   # user-initiated voice design, creation and deletion
+    background = 2    # catalog refreshes and other work nobody is waiting on
+
+
+class PriorityRateLimiter:
+    """
+    Token bucket with a concurrency cap and priority ordering.
+
+    Callers block in acquire() until a concurrency slot and a token are free.
+    Waiters are served strictly by priority, then in arrival order, so a burst
+    of background work cannot delay realtime requests by more than one call.
+    The limiter is thread-safe because the ElevenLabs SDK is synchronous and
+    runs both on worker threads and on the event loop thread.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, requests_per_second: float, burst: int | None = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Name used in metrics labels
+            max_concurrency: Maximum number of requests in flight
+            requests_per_second: Sustained request rate
+            burst: Bucket size, defaults to max_concurrency
+        """
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.burst = burst or max_concurrency
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._waiters: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def acquire(self, priority: Priority, deadline: Deadline | None = None) -> Iterator[None]:
+        """
+        Hold a request slot for the duration of the block.
+
+        Args:
+            priority: Priority class of the request
+            deadline: Give up waiting for a slot when this deadline passes or is cancelled
+
+        Raises:
+            DeadlineExceededError: If the deadline passes while queued
+            OperationCancelledError: If the request is cancelled while queued
+        """
+        ticket = (int(priority), next(self._sequence))
+        started = time.monotonic()
+
+        with self._condition:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    delay = self._admission_delay(ticket)
+                    if delay == 0:
+                        break
+                    if deadline is not None:
+                        deadline.check("rate limiter queue")
+                        budget = min(deadline.remaining(), CANCEL_POLL_SECONDS)
+                        delay = budget if delay is None else min(delay, budget)
+                    self._condition.wait(timeout=delay)
+            finally:
+                self._leave_queue(ticket)
+            self._tokens -= 1
+            self._in_flight += 1
+
+        self._record_admission(priority, started)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def acquire_async(self, priority: Priority, deadline: Deadline | None = None) -> AsyncIterator[None]:
+        """
+        Hold a request slot for the duration of the block, waiting on the event loop.
+
+        Same queue as acquire(), but a queued request polls instead of blocking a
+        thread, e.g. for slots held on behalf of other processes.
+
+        Args:
+            priority: Priority class of the request
+            deadline: Give up waiting for a slot when this deadline passes or is cancelled
+
+        Raises:
+            DeadlineExceededError: If the deadline passes while queued
+            OperationCancelledError: If the request is cancelled while queued
+        """
+        ticket = (int(priority), next(self._sequence))
+        started = time.monotonic()
+
+        with self._condition:
+            heapq.heappush(self._waiters, ticket)
+        try:
+            while True:
+                with self._condition:
+                    delay = self._admission_delay(ticket)
+                    if delay == 0:
+                        self._leave_queue(ticket)
+                        self._tokens -= 1
+                        self._in_flight += 1
+                        break
+                if deadline is not None:
+                    deadline.check("rate limiter queue")
+                await asyncio.sleep(ASYNC_POLL_SECONDS if delay is None else min(delay, ASYNC_POLL_SECONDS))
+        except BaseException:
+            with self._condition:
+                self._leave_queue(ticket)
+            raise
+
+        self._record_admission(priority, started)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stop admitting requests for a while, e.g. after the upstream returned 429.
+
+        Args:
+            seconds: How long to hold back new requests
+        """
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+        logger.warning(f"Rate limiter {self.name} paused for {seconds:.1f}s")
+
+    def _admission_delay(self, ticket: tuple[int, int]) -> float | None:
+        """
+        Return 0 if the ticket may proceed now, otherwise how long to wait (None = until notified).
+        """
+        now = time.monotonic()
+        self._refill(now)
+
+        if self._waiters[0] != ticket or self._in_flight >= self.max_concurrency:
+            return None
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.requests_per_second
+        return 0
+
+    def _leave_queue(self, ticket: tuple[int, int]) -> None:
+        # Called with the condition held
+        self._waiters.remove(ticket)
+        heapq.heapify(self._waiters)
+        # Let the next waiter re-check now that the head changed
+        self._condition.notify_all()
+
+    def _release(self) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def _record_admission(self, priority: Priority, started: float) -> None:
+        waited = time.monotonic() - started
+        metrics = get_metrics_registry()
+        metrics.increment("rate_limiter_requests_total", limiter=self.name, priority=priority.name)
+        metrics.increment("rate_limiter_wait_seconds_total", waited, limiter=self.name, priority=priority.name)
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._tokens = min(self.burst, self._tokens + elapsed * self.requests_per_second)
+        self._last_refill = now
+
+
+_elevenlabs_rate_limiter: "PriorityRateLimiter | RemoteRateLimiter | None" = None
+_elevenlabs_rate_limiter_lock = threading.Lock()
+
+
+def get_elevenlabs_rate_limiter() -> "PriorityRateLimiter | RemoteRateLimiter":
+    """
+    Get the limiter shared by all ElevenLabs API calls, configured from environment variables.
+
+    ELEVENLABS_MAX_CONCURRENCY, ELEVENLABS_REQUESTS_PER_SECOND and ELEVENLABS_BURST
+    should match the concurrency and rate limits of the ElevenLabs plan.
+
+    Returns:
+        PriorityRateLimiter instance, or a RemoteRateLimiter in API workers that share the bot process's limiter
+    """
+    global _elevenlabs_rate_limiter
+    with _elevenlabs_rate_limiter_lock:
+        if _elevenlabs_rate_limiter is None:
+            burst = os.getenv("ELEVENLABS_BURST")
+            _elevenlabs_rate_limiter = PriorityRateLimiter(
+                name="elevenlabs",
+                max_concurrency=int(os.getenv("ELEVENLABS_MAX_CONCURRENCY", "4")),
+                requests_per_second=float(os.getenv("ELEVENLABS_REQUESTS_PER_SECOND", "4")),
+                burst=int(burst) if burst else None
+            )
+        return _elevenlabs_rate_limiter
+
+
+def set_elevenlabs_rate_limiter(limiter: "PriorityRateLimiter | RemoteRateLimiter") -> None:
+    """
+    Replace the ElevenLabs limiter, e.g. with the bot process's in API workers.
+
+    Args:
+        limiter: Limiter used by all ElevenLabs API calls from now on
+    """
+    global _elevenlabs_rate_limiter
+    with _elevenlabs_rate_limiter_lock:
+        _elevenlabs_rate_limiter = limiter
@@ -0,0 +1,449 @@
+"""
+Resilience - Retries, hedged reads and circuit breaking for upstream API calls.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from enum import Enum
+from typing import TypeVar
+
+import httpx
+import openai
+
+from app.services.deadline import Deadline, DeadlineExceededError, OperationCancelledError
+from app.services.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Upstream responses worth retrying; everything else is the caller's fault
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+# Errors raised before the request reached the upstream, safe to retry even for writes
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, openai.APIConnectionError)
+TRANSIENT_ERRORS = (httpx.TransportError, TimeoutError, ConnectionError, openai.APIConnectionError)
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the upstream while its circuit breaker is open."""
+
+
+class CircuitState(str, Enum):
+    closed = "closed"
+    open = "open"
+    half_open = "half_open"
+
+
+def _error_chain(error: BaseException) -> list[BaseException]:
+    """Return the error and its causes, e.g. an SDK error wrapped by our own error mapping."""
+    chain = []
+    while error is not None and error not in chain:
+        chain.append(error)
+        error = error.__cause__ or error.__context__
+    return chain
+
+
+def status_code_of(error: BaseException) -> int | None:
+    """
+    Get the HTTP status code carried by an error or any of its causes.
+
+    Understands ElevenLabs ApiError, OpenAI APIStatusError and httpx.HTTPStatusError.
+    """
+    for candidate in _error_chain(error):
+        code = getattr(candidate, "status_code", None)
+        if code is None:
+            code = getattr(getattr(candidate, "response", None), "status_code", None)
+        if isinstance(code, int):
+            return code
+    return None
+
+
+def retry_after_of(error: BaseException) -> float | None:
+    """
+    Get the Retry-After delay in seconds from an error's response headers, if any.
+    """
+    for candidate in _error_chain(error):
+        headers = getattr(candidate, "headers", None)
+        if headers is None:
+            headers = getattr(getattr(candidate, "response", None), "headers", None)
+        if not headers:
+            continue
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        if value:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                return None
+    return None
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Check if an error suggests the upstream is overloaded or unreachable.
+    """
+    if status_code_of(error) in RETRYABLE_STATUS_CODES:
+        return True
+    return any(isinstance(candidate, TRANSIENT_ERRORS) for candidate in _error_chain(error))
+
+
+def is_retryable(error: BaseException, idempotent: bool) -> bool:
+    """
+    Check if a failed call may be sent again.
+
+    Non-idempotent calls are only retried when the upstream certainly did not
+    process them: a 429 rejection or a connection that was never established.
+    Nothing is retried once the caller's deadline has run out or it gave up.
+    """
+    if isinstance(error, (CircuitOpenError, DeadlineExceededError, OperationCancelledError)):
+        return False
+    if idempotent:
+        return is_transient(error)
+    if status_code_of(error) == 429:
+        return True
+    return any(isinstance(candidate, NOT_SENT_ERRORS) for candidate in _error_chain(error))
+
+
+class RetryPolicy:
+    """
+    Bounded exponential backoff with full jitter.
+
+    A Retry-After header from the upstream replaces the computed delay. If the
+    upstream asks for a longer wait than max_delay the call is not retried.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt: int, error: BaseException) -> float | None:
+        """
+        Get the delay before the next attempt.
+
+        Args:
+            attempt: Number of attempts made so far, starting at 1
+            error: Error raised by the last attempt
+
+        Returns:
+            Delay in seconds, or None if no further attempt should be made
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        retry_after = retry_after_of(error)
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_delay else None
+
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated upstream failures.
+
+    After failure_threshold consecutive transient failures the circuit opens and
+    calls are rejected for reset_timeout seconds. Then a single probe call is let
+    through (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CircuitState.closed
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state()
+
+    def before_call(self) -> None:
+        """
+        Check that a call may be made.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or a half-open probe is already running
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CircuitState.closed:
+                return
+            if state == CircuitState.half_open and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+
+        get_metrics_registry().increment("circuit_breaker_rejections_total", breaker=self.name)
+        raise CircuitOpenError(f"{self.name} API is temporarily unavailable - please try again later")
+
+    def record_success(self) -> None:
+        """Record a call that reached a healthy upstream."""
+        with self._lock:
+            if self._state != CircuitState.closed:
+                logger.info(f"Circuit breaker {self.name} closed")
+            self._state = CircuitState.closed
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """End a call that says nothing about the upstream, e.g. one the caller gave up on."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a transient upstream failure."""
+        with self._lock:
+            self._failures += 1
+            probe_failed = self._probe_in_flight
+            self._probe_in_flight = False
+            if probe_failed or self._failures >= self.failure_threshold:
+                if self._state != CircuitState.open:
+                    logger.warning(f"Circuit breaker {self.name} opened after {self._failures} failures")
+                    get_metrics_registry().increment("circuit_breaker_opened_total", breaker=self.name)
+                self._state = CircuitState.open
+                self._opened_at = time.monotonic()
+
+    def _current_state(self) -> CircuitState:
+        if self._state == CircuitState.open and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = CircuitState.half_open
+        return self._state
+
+
+class LatencyTracker:
+    """
+    Rolling window of call durations used to pick the hedging delay.
+    """
+
+    def __init__(self, window: int = 100, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        """
+        Get a latency percentile, or None until enough samples are collected.
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ResilientCaller:
+    """
+    Runs upstream calls with retries, a circuit breaker and optional hedging.
+
+    Synchronous calls (ElevenLabs SDK) go through call(); coroutines (OpenAI)
+    go through call_async(). Both share the same retry policy and breaker.
+    """
+
+    def __init__(self, name: str, policy: RetryPolicy | None = None, breaker: CircuitBreaker | None = None, hedge_percentile: float = 0.95):
+        self.name = name
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker(name)
+        self.hedge_percentile = hedge_percentile
+        self._latencies: dict[str, LatencyTracker] = {}
+        self._latencies_lock = threading.Lock()
+        self._hedge_executor: ThreadPoolExecutor | None = None
+
+    def call(self, operation: str, func: Callable[[], T], idempotent: bool = True, hedge: bool = False, deadline: Deadline | None = None) -> T:
+        """
+        Call a blocking function with retries.
+
+        Args:
+            operation: Operation name used for metrics and latency tracking
+            func: Function performing one upstream request
+            idempotent: Whether the request may safely be repeated
+            hedge: Send a second request if the first is slower than the tracked p95.
+                Only for idempotent reads, both requests count against upstream limits.
+            deadline: No attempt is started, and no backoff waited, past this deadline
+
+        Returns:
+            Result of func
+
+        Raises:
+            CircuitOpenError: If the upstream is considered down
+            DeadlineExceededError: If the deadline passed before the first attempt
+            Exception: The last error if all attempts failed
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            if deadline is not None:
+                deadline.check(operation)
+            self.breaker.before_call()
+            try:
+                result = self._hedged(operation, func) if hedge and idempotent else self._timed(operation, func)
+            except Exception as e:
+                delay = self._on_failure(operation, attempt, e, idempotent)
+                if delay is None or (deadline is not None and delay >= deadline.remaining()):
+                    raise
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    async def call_async(self, operation: str, func: Callable[[], Awaitable[T]], idempotent: bool = True) -> T:
+        """
+        Await a coroutine factory with retries.
+
+        Args:
+            operation: Operation name used for metrics
+            func: Callable returning a new coroutine for each attempt
+            idempotent: Whether the request may safely be repeated
+
+        Returns:
+            Result of the coroutine
+
+        Raises:
+            CircuitOpenError: If the upstream is considered down
+            Exception: The last error if all attempts failed
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            self.breaker.before_call()
+            try:
+                result = await func()
+            except Exception as e:
+                delay = self._on_failure(operation, attempt, e, idempotent)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    def _on_failure(self, operation: str, attempt: int, error: Exception, idempotent: bool) -> float | None:
+        """
+        Update the breaker after a failed attempt and return the retry delay, or None to give up.
+        """
+        if isinstance(error, CircuitOpenError):
+            return None
+        if isinstance(error, (DeadlineExceededError, OperationCancelledError)):
+            # The caller ran out of time or gave up, which says nothing about the upstream
+            self.breaker.release()
+            return None
+        if is_transient(error) and status_code_of(error) != 429:
+            self.breaker.record_failure()
+        else:
+            # The upstream answered, so it is up even if the request was rejected
+            self.breaker.record_success()
+
+        if not is_retryable(error, idempotent):
+            return None
+        delay = self.policy.backoff(attempt, error)
+        if delay is None:
+            return None
+
+        get_metrics_registry().increment("upstream_retries_total", upstream=self.name, operation=operation)
+        logger.warning(f"{self.name} {operation} failed (attempt {attempt}), retrying in {delay:.2f}s: {error}")
+        return delay
+
+    def _tracker(self, operation: str) -> LatencyTracker:
+        with self._latencies_lock:
+            return self._latencies.setdefault(operation, LatencyTracker())
+
+    def _timed(self, operation: str, func: Callable[[], T]) -> T:
+        started = time.monotonic()
+        result = func()
+        self._tracker(operation).record(time.monotonic() - started)
+        return result
+
+    def _hedged(self, operation: str, func: Callable[[], T]) -> T:
+        """
+        Run func, and if it outlives the tracked latency percentile, race a second copy.
+        """
+        threshold = self._tracker(operation).percentile(self.hedge_percentile)
+        if threshold is None:
+            return self._timed(operation, func)
+
+        with self._latencies_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix=f"{self.name}-hedge")
+            executor = self._hedge_executor
+
+        pending = {executor.submit(self._timed, operation, func)}
+        done, pending = wait(pending, timeout=threshold)
+        if not done:
+            get_metrics_registry().increment("upstream_hedged_requests_total", upstream=self.name, operation=operation)
+            pending.add(executor.submit(self._timed, operation, func))
+
+        error: Exception | None = None
+        while done or pending:
+            for future in done:
+                try:
+                    return future.result()
+                except Exception as e:
+                    error = e
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        raise error
+
+
+def _caller_from_env(name: str, prefix: str) -> ResilientCaller:
+    return ResilientCaller(
+        name=name,
+        policy=RetryPolicy(
+            max_attempts=int(os.getenv(f"{prefix}_MAX_ATTEMPTS", "3")),
+            base_delay=float(os.getenv(f"{prefix}_RETRY_BASE_DELAY", "0.5")),
+            max_delay=float(os.getenv(f"{prefix}_RETRY_MAX_DELAY", "8"))
+        ),
+        breaker=CircuitBreaker(
+            name=name,
+            failure_threshold=int(os.getenv(f"{prefix}_CIRCUIT_FAILURE_THRESHOLD", "5")),
+            reset_timeout=float(os.getenv(f"{prefix}_CIRCUIT_RESET_SECONDS", "30"))
+        )
+    )
+
+
+_elevenlabs_caller: ResilientCaller | None = None
+_openai_caller: ResilientCaller | None = None
+_callers_lock = threading.Lock()
+
+
+def get_elevenlabs_resilience() -> ResilientCaller:
+    """
+    Get the caller shared by all ElevenLabs API calls.
+
+    ELEVENLABS_MAX_ATTEMPTS, ELEVENLABS_RETRY_BASE_DELAY, ELEVENLABS_RETRY_MAX_DELAY,
+    ELEVENLABS_CIRCUIT_FAILURE_THRESHOLD and ELEVENLABS_CIRCUIT_RESET_SECONDS override the defaults.
+
+    Returns:
+        ResilientCaller instance
+    """
+    global _elevenlabs_caller
+    with _callers_lock:
+        if _elevenlabs_caller is None:
+            _elevenlabs_caller = _caller_from_env("ElevenLabs", "ELEVENLABS")
+        return _elevenlabs_caller
+
+
+def get_openai_resilience() -> ResilientCaller:
+    """
+    Get the caller shared by all OpenAI API calls, configured like the ElevenLabs one with the OPENAI_ prefix.
+
+    Returns:
+        ResilientCaller instance
+    """
+    global _openai_caller
+    with _callers_lock:
+        if _openai_caller is None:
+            _openai_caller = _caller_from_env("OpenAI", "OPENAI")
+        return _openai_caller
@@ -0,0 +1,388 @@
+"""
+Shared State - State that API workers share through the bot process.
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+from app.models import JobDTO, JobStatus, QuotaStatusDTO, VoiceChangesResponseDTO, VoiceDetailDTO
+from app.services.deadline import Deadline
+from app.services.job_service import TERMINAL_STATUSES, JobManager, get_job_manager
+from app.services.quota_service import QuotaReservation, get_quota_ledger, set_quota_ledger
+from app.services.rate_limiter import CANCEL_POLL_SECONDS, Priority, get_elevenlabs_rate_limiter, set_elevenlabs_rate_limiter
+from app.services.voice_catalog import get_voice_catalog, set_voice_catalog
+
+if TYPE_CHECKING:
+    from app.services.bot_ipc import RemoteDiscordBotManager
+
+logger = logging.getLogger(__name__)
+
+# Error of jobs whose API worker went away while they were unfinished
+WORKER_LOST_ERROR = "API worker stopped before the job finished"
+
+
+class SharedStateSession:
+    """
+    What one API worker connection holds in the bot process.
+
+    Reservations and unfinished jobs of a worker that disconnects are released
+    and failed, so a crashed worker leaves no budget or job behind.
+    """
+
+    def __init__(self):
+        self.reservations: dict[int, QuotaReservation] = {}
+        self.jobs: set[str] = set()
+
+
+class SharedStateService:
+    """
+    Serves the bot process's ElevenLabs limiter, quota ledger, jobs and voice catalog to API workers.
+
+    uvicorn workers are separate processes, so each would otherwise admit
+    ElevenLabs requests against its own limits and know only its own jobs and
+    catalog versions. The bot process owns the one copy of this state and the
+    workers reach it over the bot IPC connection.
+    """
+
+    def __init__(self):
+        self._reservation_ids = itertools.count(1)
+        self._handlers: dict[str, Callable[[dict[str, Any], SharedStateSession, Callable[[float], None]], Awaitable[Any]]] = {
+            "upstream_hold": self._upstream_hold,
+            "upstream_pause": self._upstream_pause,
+            "quota_reserve": self._quota_reserve,
+            "quota_commit": self._quota_commit,
+            "quota_release": self._quota_release,
+            "quota_is_degraded": self._quota_is_degraded,
+            "quota_status": self._quota_status,
+            "quota_sync_subscription": self._quota_sync_subscription,
+            "quota_begin_subscription_refresh": self._quota_begin_subscription_refresh,
+            "quota_end_subscription_refresh": self._quota_end_subscription_refresh,
+            "catalog_version": self._catalog_version,
+            "catalog_is_loaded": self._catalog_is_loaded,
+            "catalog_list": self._catalog_list,
+            "catalog_sync": self._catalog_sync,
+            "catalog_upsert": self._catalog_upsert,
+            "catalog_remove": self._catalog_remove,
+            "catalog_changes": self._catalog_changes,
+            "job_register": self._job_register,
+            "job_publish": self._job_publish,
+            "job_get": self._job_get
+        }
+
+    def dispatch(self, method: str, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> Awaitable[Any] | None:
+        """
+        Start a shared state request.
+
+        Args:
+            method: IPC method name
+            params: Method parameters
+            session: State held by the calling connection
+            on_progress: Sends a progress message for the request
+
+        Returns:
+            Awaitable result, or None if the method is not a shared state method
+        """
+        handler = self._handlers.get(method)
+        if handler is None:
+            return None
+        return handler(params, session, on_progress)
+
+    def stream(self, method: str, params: dict[str, Any]) -> AsyncIterator[Any] | None:
+        """
+        Start a shared state subscription.
+
+        Args:
+            method: IPC method name
+            params: Method parameters
+
+        Returns:
+            Async iterator of messages, or None if the method is not a shared state subscription
+        """
+        if method == "job_subscribe":
+            return get_job_manager().subscribe(params["job_id"])
+        return None
+
+    async def close_session(self, session: SharedStateSession) -> None:
+        """
+        Release what a disconnected API worker still held.
+
+        Args:
+            session: State held by the connection
+        """
+        ledger = get_quota_ledger()
+        for reservation in session.reservations.values():
+            ledger.release(reservation)
+        session.reservations.clear()
+
+        jobs = get_job_manager()
+        for job_id in session.jobs:
+            job = await jobs.get(job_id)
+            if job is not None and job.status not in TERMINAL_STATUSES:
+                jobs.publish(job.model_copy(update={"status": JobStatus.failed, "error": WORKER_LOST_ERROR, "updated_at": datetime.now(timezone.utc)}))
+        session.jobs.clear()
+
+    async def _upstream_hold(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> None:
+        # The slot is held until the API worker cancels the request or disconnects
+        deadline = Deadline.after(params["timeout"]) if params.get("timeout") is not None else None
+        async with get_elevenlabs_rate_limiter().acquire_async(Priority(params["priority"]), deadline):
+            on_progress(1.0)
+            await asyncio.Event().wait()
+
+    async def _upstream_pause(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> None:
+        get_elevenlabs_rate_limiter().pause(params["seconds"])
+
+    async def _quota_reserve(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> int:
+        reservation = get_quota_ledger().reserve(params["voice_id"], params["characters"])
+        reservation_id = next(self._reservation_ids)
+        session.reservations[reservation_id] = reservation
+        return reservation_id
+
+    async def _quota_commit(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> None:
+        reservation = session.reservations.pop(params["reservation_id"], None)
+        if reservation is None:
+            # Already released when the worker's previous connection closed
+            logger.warning(f"Spend of unknown quota reservation {params['reservation_id']} not recorded")
+            return
+        reservation.actual = params.get("actual")
+        get_quota_ledger().commit(reservation)
+
+    async def _quota_release(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> None:
+        reservation = session.reservations.pop(params["reservation_id"], None)
+        if reservation is not None:
+            get_quota_ledger().release(reservation)
+
+    async def _quota_is_degraded(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> bool:
+        return get_quota_ledger().is_degraded()
+
+    async def _quota_status(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> QuotaStatusDTO:
+        return get_quota_ledger().status()
+
+    async def _quota_sync_subscription(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> None:
+        get_quota_ledger().sync_subscription(params["character_count"], params["character_limit"])
+
+    async def _quota_begin_subscription_refresh(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> bool:
+        return get_quota_ledger().begin_subscription_refresh()
+
+    async def _quota_end_subscription_refresh(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> None:
+        get_quota_ledger().end_subscription_refresh()
+
+    async def _catalog_version(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> int:
+        return get_voice_catalog().version
+
+    async def _catalog_is_loaded(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> bool:
+        return get_voice_catalog().is_loaded
+
+    async def _catalog_list(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> list[VoiceDetailDTO]:
+        return get_voice_catalog().list_voices()
+
+    async def _catalog_sync(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> int:
+        return get_voice_catalog().sync([VoiceDetailDTO.model_validate(voice) for voice in params["voices"]])
+
+    async def _catalog_upsert(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> int:
+        return get_voice_catalog().upsert(VoiceDetailDTO.model_validate(params["voice"]))
+
+    async def _catalog_remove(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> int:
+        return get_voice_catalog().remove(params["voice_id"])
+
+    async def _catalog_changes(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> VoiceChangesResponseDTO:
+        return get_voice_catalog().changes_since(params["since"])
+
+    async def _job_register(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> None:
+        job = JobDTO.model_validate(params["job"])
+        get_job_manager().register(job)
+        session.jobs.add(job.id)
+
+    async def _job_publish(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> None:
+        job = JobDTO.model_validate(params["job"])
+        get_job_manager().publish(job)
+        if job.status in TERMINAL_STATUSES:
+            session.jobs.discard(job.id)
+
+    async def _job_get(self, params: dict[str, Any], session: SharedStateSession, on_progress: Callable[[float], None]) -> JobDTO | None:
+        return await get_job_manager().get(params["job_id"])
+
+
+class RemoteRateLimiter:
+    """
+    Stand-in for PriorityRateLimiter in API workers, holding slots of the bot process's limiter.
+
+    A held slot is a request to the bot process that stays open until the
+    block ends, so the bot frees it as well when the worker disconnects.
+    Must be used from worker threads, which is where the ElevenLabs SDK runs.
+    """
+
+    def __init__(self, manager: "RemoteDiscordBotManager"):
+        self.manager = manager
+
+    @contextmanager
+    def acquire(self, priority: Priority, deadline: Deadline | None = None) -> Iterator[None]:
+        """
+        Hold a slot of the bot process's limiter for the duration of the block.
+
+        Args:
+            priority: Priority class of the request
+            deadline: Give up waiting for a slot when this deadline passes or is cancelled
+
+        Raises:
+            DeadlineExceededError: If the deadline passes while queued
+            OperationCancelledError: If the request is cancelled while queued
+            Exception: If the bot process is unavailable
+        """
+        granted = threading.Event()
+        params = {"priority": int(priority), "timeout": deadline.remaining() if deadline is not None else None}
+        slot = self.manager.submit_threadsafe("upstream_hold", params, on_progress=lambda _: granted.set())
+        try:
+            while not granted.wait(CANCEL_POLL_SECONDS):
+                if slot.done():
+                    # Raises why the bot process gave up, e.g. its copy of the deadline passed
+                    slot.result()
+                if deadline is not None:
+                    deadline.check("rate limiter queue")
+            yield
+        finally:
+            slot.cancel()
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stop the bot process's limiter from admitting requests for a while.
+
+        Args:
+            seconds: How long to hold back new requests
+        """
+        self.manager.submit_threadsafe("upstream_pause", {"seconds": seconds})
+
+
+class RemoteQuotaReservation(QuotaReservation):
+    """
+    Reservation held in the bot process's quota ledger.
+    """
+
+    def __init__(self, reservation_id: int, voice_id: str | None, characters: int):
+        super().__init__(voice_id, characters, {})
+        self.reservation_id = reservation_id
+
+
+class RemoteQuotaLedger:
+    """
+    Stand-in for QuotaLedger in API workers, admitting requests against the bot process's ledger.
+
+    Must be used from worker threads, like the ElevenLabs calls it admits.
+    """
+
+    def __init__(self, manager: "RemoteDiscordBotManager"):
+        self.manager = manager
+
+    def reserve(self, voice_id: str | None, characters: int) -> RemoteQuotaReservation:
+        reservation_id = self.manager.call_threadsafe("quota_reserve", {"voice_id": voice_id, "characters": characters})
+        return RemoteQuotaReservation(reservation_id, voice_id, characters)
+
+    def commit(self, reservation: RemoteQuotaReservation) -> None:
+        self.manager.call_threadsafe("quota_commit", {"reservation_id": reservation.reservation_id, "actual": reservation.actual})
+
+    def release(self, reservation: RemoteQuotaReservation) -> None:
+        self.manager.call_threadsafe("quota_release", {"reservation_id": reservation.reservation_id})
+
+    def sync_subscription(self, character_count: int, character_limit: int) -> None:
+        self.manager.call_threadsafe("quota_sync_subscription", {"character_count": character_count, "character_limit": character_limit})
+
+    def begin_subscription_refresh(self) -> bool:
+        return self.manager.call_threadsafe("quota_begin_subscription_refresh")
+
+    def end_subscription_refresh(self) -> None:
+        self.manager.call_threadsafe("quota_end_subscription_refresh")
+
+    def is_degraded(self) -> bool:
+        return self.manager.call_threadsafe("quota_is_degraded")
+
+    def status(self) -> QuotaStatusDTO:
+        return QuotaStatusDTO.model_validate(self.manager.call_threadsafe("quota_status"))
+
+
+class RemoteVoiceCatalog:
+    """
+    Stand-in for VoiceCatalog in API workers, so catalog versions mean the same on every worker.
+
+    Must be used from worker threads, like the ElevenLabs listings that feed it.
+    """
+
+    def __init__(self, manager: "RemoteDiscordBotManager"):
+        self.manager = manager
+
+    @property
+    def version(self) -> int:
+        return self.manager.call_threadsafe("catalog_version")
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.manager.call_threadsafe("catalog_is_loaded")
+
+    def list_voices(self) -> list[VoiceDetailDTO]:
+        return [VoiceDetailDTO.model_validate(voice) for voice in self.manager.call_threadsafe("catalog_list")]
+
+    def sync(self, voices: list[VoiceDetailDTO]) -> int:
+        return self.manager.call_threadsafe("catalog_sync", {"voices": [voice.model_dump(mode="json") for voice in voices]})
+
+    def upsert(self, voice: VoiceDetailDTO) -> int:
+        return self.manager.call_threadsafe("catalog_upsert", {"voice": voice.model_dump(mode="json")})
+
+    def remove(self, voice_id: str) -> int:
+        return self.manager.call_threadsafe("catalog_remove", {"voice_id": voice_id})
+
+    def changes_since(self, since: int) -> VoiceChangesResponseDTO:
+        return VoiceChangesResponseDTO.model_validate(self.manager.call_threadsafe("catalog_changes", {"since": since}))
+
+
+class RemoteJobRegistry:
+    """
+    Registers an API worker's jobs with the bot process and looks up those of other workers.
+    """
+
+    def __init__(self, manager: "RemoteDiscordBotManager"):
+        self.manager = manager
+
+    async def register(self, job: JobDTO) -> None:
+        """
+        Admit a new job against the jobs of every API worker.
+
+        Raises:
+            ValueError: If too many jobs are already waiting
+        """
+        await self.manager.call("job_register", {"job": job.model_dump(mode="json")})
+
+    def publish(self, job: JobDTO) -> None:
+        """Report a new state of a job without waiting; reports arrive in order."""
+        self.manager.send("job_publish", {"job": job.model_dump(mode="json")})
+
+    async def get(self, job_id: str) -> JobDTO | None:
+        job = await self.manager.call("job_get", {"job_id": job_id})
+        return JobDTO.model_validate(job) if job is not None else None
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[JobDTO]:
+        async for job in self.manager.stream("job_subscribe", {"job_id": job_id}):
+            if job is not None:
+                yield JobDTO.model_validate(job)
+
+
+async def use_bot_process_state(manager: "RemoteDiscordBotManager", jobs: JobManager | None = None) -> None:
+    """
+    Make this API worker use the bot process's ElevenLabs limiter, quota ledger, jobs and voice catalog.
+
+    Called on the event loop the worker serves requests on; the stand-ins are
+    then used from worker threads, which reach the bot process through this loop.
+
+    Args:
+        manager: Connection to the bot process
+        jobs: Job manager to register jobs from, defaults to this worker's
+    """
+    manager.bind_loop(asyncio.get_running_loop())
+    set_elevenlabs_rate_limiter(RemoteRateLimiter(manager))
+    set_quota_ledger(RemoteQuotaLedger(manager))
+    set_voice_catalog(RemoteVoiceCatalog(manager))
+    (jobs or get_job_manager()).registry = RemoteJobRegistry(manager)
+    logger.info("Using the bot process's ElevenLabs limiter, quota ledger, jobs and voice catalog")
@@ -0,0 +1,234 @@
+"""
+Speech Backends - Interchangeable TTS engines and routing between them.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import subprocess
+import time
+from abc import ABC, abstractmethod
+
+from app.services.deadline import Deadline, DeadlineExceededError, OperationCancelledError
+from app.services.metrics import get_metrics_registry
+from app.services.quota_service import QuotaExceededError
+from app.services.resilience import CircuitOpenError, LatencyTracker, is_transient
+
+logger = logging.getLogger(__name__)
+
+# Time an upstream backend gets to deliver its first audio before the next backend takes over
+DEFAULT_LATENCY_BUDGET_SECONDS = 4.0
+# Consecutive first audio timeouts after which a backend is treated as too slow
+TIMEOUTS_BEFORE_SKIP = 3
+# While a backend is too slow, every n-th request still tries it to notice recovery
+DEFAULT_PROBE_INTERVAL = 10
+LOCAL_BACKEND_NAME = "local"
+
+
+class FirstAudio:
+    """
+    Time to the first audio of one synthesis, bounded by a budget.
+
+    Streaming backends call received() when the first audio arrives; from then
+    on only the request deadline applies, so long text is not cut off.
+    """
+
+    def __init__(self, deadline: Deadline):
+        self.deadline = deadline
+        self.latency: float | None = None
+        self._started = time.monotonic()
+
+    def received(self) -> None:
+        """Record that audio started arriving. Safe to call from worker threads."""
+        if self.latency is None:
+            self.latency = time.monotonic() - self._started
+
+
+class SpeechBackend(ABC):
+    """
+    A TTS engine that turns text into audio ffmpeg can play.
+    """
+
+    name: str
+    # Whether audio may be cached under (voice, model, text) and served instead of the real voice later
+    cacheable: bool = True
+
+    @abstractmethod
+    def is_available(self) -> bool:
+        """
+        Check whether the backend should be tried at all, e.g. it is installed and not known to be down.
+        """
+
+    @abstractmethod
+    async def synthesize(self, voice_id: str, text: str, model_id: str, deadline: Deadline, first_audio: FirstAudio | None = None) -> bytes:
+        """
+        Generate speech audio.
+
+        Args:
+            voice_id: Requested voice, backends without that voice use their own
+            text: Text to speak
+            model_id: Model chosen by the TTS model router
+            deadline: Deadline the backend must finish within
+            first_audio: Budget for the first audio to arrive, if the backend may be given up on early.
+                Backends that do not stream must finish within first_audio.deadline.
+
+        Returns:
+            bytes: Audio data
+
+        Raises:
+            DeadlineExceededError: If the deadline, or the first audio deadline, passes first
+            OperationCancelledError: If the deadline is cancelled
+            Exception: If synthesis fails
+        """
+
+
+class EspeakSpeechBackend(SpeechBackend):
+    """
+    Offline CPU engine using espeak-ng.
+
+    Sounds robotic and ignores the requested voice, but needs no network and
+    answers in tens of milliseconds, so the bot keeps talking while ElevenLabs
+    is down, slow or out of quota.
+    """
+
+    name = LOCAL_BACKEND_NAME
+    cacheable = False
+
+    def __init__(self, binary: str = "espeak-ng", voice: str = "en"):
+        self.binary = binary
+        self.voice = voice
+
+    def is_available(self) -> bool:
+        return shutil.which(self.binary) is not None
+
+    async def synthesize(self, voice_id: str, text: str, model_id: str, deadline: Deadline, first_audio: FirstAudio | None = None) -> bytes:
+        # All audio arrives at once, so the first audio budget bounds the whole run
+        deadline = first_audio.deadline if first_audio is not None else deadline
+        return await deadline.run(asyncio.to_thread(self._run, text, deadline.remaining()), "local speech synthesis")
+
+    def _run(self, text: str, timeout: float) -> bytes:
+        # Text goes through stdin so it is never parsed as command line options
+        result = subprocess.run(
+            [self.binary, "-v", self.voice, "--stdout"],
+            input=text.encode("utf-8"),
+            capture_output=True,
+            timeout=max(timeout, 0.1),
+            check=False
+        )
+        if result.returncode != 0 or not result.stdout:
+            raise Exception(f"Local speech synthesis failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+        return result.stdout
+
+
+def should_fall_back(error: Exception) -> bool:
+    """
+    Check if a failed backend leaves the request to the next backend.
+
+    Only outages, overload and exhausted quota do; invalid input or an unknown
+    voice would fail the same way on any backend and is reported to the caller.
+    """
+    return isinstance(error, (CircuitOpenError, QuotaExceededError)) or is_transient(error)
+
+
+class SpeechBackendRouter:
+    """
+    Tries backends in order of preference, moving on when one is unavailable, failing or slow.
+
+    Every backend but the last gets at most latency_budget seconds to deliver
+    its first audio, so a request during an upstream incident falls back in
+    about that long, while long text that streams in time may take longer to
+    finish. Backends whose recent p95 time to first audio exceeds the budget,
+    or whose last TIMEOUTS_BEFORE_SKIP attempts timed out, are skipped, except
+    for every probe_interval-th request which checks whether they recovered.
+    """
+
+    def __init__(self, backends: list[SpeechBackend], latency_budget: float = DEFAULT_LATENCY_BUDGET_SECONDS, probe_interval: int = DEFAULT_PROBE_INTERVAL):
+        self.backends = backends
+        self.latency_budget = latency_budget
+        self.probe_interval = probe_interval
+        self._latencies = {backend.name: LatencyTracker() for backend in backends}
+        self._skipped = {backend.name: 0 for backend in backends}
+        self._timeouts = {backend.name: 0 for backend in backends}
+
+    async def synthesize(self, voice_id: str, text: str, model_id: str, deadline: Deadline) -> tuple[bytes, SpeechBackend]:
+        """
+        Generate speech with the first backend that succeeds.
+
+        Args:
+            voice_id: Requested voice
+            text: Text to speak
+            model_id: Model chosen by the TTS model router
+            deadline: End-to-end deadline of the request
+
+        Returns:
+            Audio data and the backend that produced it
+
+        Raises:
+            DeadlineExceededError: If the request deadline passes
+            OperationCancelledError: If the request is cancelled
+            Exception: The first backend's error if no backend succeeded
+        """
+        metrics = get_metrics_registry()
+        # With nothing available the preferred backend still runs and reports why it cannot serve
+        candidates = [backend for backend in self.backends if backend.is_available()] or self.backends[:1]
+        first_error: Exception | None = None
+
+        for index, backend in enumerate(candidates):
+            last = index == len(candidates) - 1
+            if not last and self._too_slow(backend):
+                metrics.increment("tts_backend_skipped_total", backend=backend.name)
+                continue
+
+            first_audio = None if last else FirstAudio(deadline.within(self.latency_budget))
+            started = time.monotonic()
+            try:
+                audio = await backend.synthesize(voice_id, text, model_id, deadline, first_audio)
+            except OperationCancelledError:
+                raise
+            except DeadlineExceededError as e:
+                if last or deadline.expired:
+                    raise
+                # Not a latency sample, the real latency is unknown
+                self._timeouts[backend.name] += 1
+                first_error = first_error or e
+            except Exception as e:
+                if last or not should_fall_back(e):
+                    if first_error is None:
+                        raise
+                    # The preferred backend's error says best why speech is unavailable
+                    raise first_error from e
+                first_error = first_error or e
+            else:
+                latency = first_audio.latency if first_audio is not None else None
+                self._latencies[backend.name].record(latency if latency is not None else time.monotonic() - started)
+                self._timeouts[backend.name] = 0
+                metrics.increment("tts_backend_requests_total", backend=backend.name)
+                return audio, backend
+
+            logger.warning(f"Speech backend {backend.name} failed, falling back: {str(first_error)}")
+            metrics.increment("tts_backend_fallbacks_total", backend=backend.name)
+
+        # The last candidate always returns or raises above, so this means no backends are configured
+        raise Exception("No speech backend available")
+
+    def _too_slow(self, backend: SpeechBackend) -> bool:
+        p95 = self._latencies[backend.name].percentile(0.95)
+        timing_out = self._timeouts[backend.name] >= TIMEOUTS_BEFORE_SKIP
+        if not timing_out and (p95 is None or p95 < self.latency_budget):
+            return False
+        self._skipped[backend.name] += 1
+        return self._skipped[backend.name] % self.probe_interval != 0
+
+
+def create_local_backend() -> EspeakSpeechBackend:
+    """
+    Create the offline backend, configured by ESPEAK_BINARY and ESPEAK_VOICE.
+
+    Returns:
+        EspeakSpeechBackend instance
+    """
+    return EspeakSpeechBackend(
+        binary=os.getenv("ESPEAK_BINARY", "espeak-ng"),
+        voice=os.getenv("ESPEAK_VOICE", "en")
+    )
@@ -0,0 +1,112 @@
+"""
+TTS Model Router - Pick the ElevenLabs TTS model for each synthesis request.
+"""
+
+import os
+import unicodedata
+from collections import Counter
+
+from app.models import SpeechQuality
+from app.services.elevenlabs_client import DEFAULT_TTS_MODEL, NEW_TTS_MODEL
+
+# Low-latency model for short interactive lines (~75ms model latency, 32 languages)
+LOW_LATENCY_TTS_MODEL = "eleven_flash_v2_5"
+# Interactive lines up to this length go to the low-latency model
+DEFAULT_SHORT_TEXT_CHARACTERS = 200
+# Writing systems covered by both the low-latency and the default model.
+# Text in any other script goes to NEW_TTS_MODEL, which supports the most languages.
+SHARED_SCRIPTS = {
+    "LATIN", "CYRILLIC", "GREEK", "ARABIC", "DEVANAGARI", "TAMIL",
+    "CJK", "HIRAGANA", "KATAKANA", "HANGUL"
+}
+
+
+def detect_script(text: str) -> str | None:
+    """
+    Detect the dominant writing system of a text.
+
+    A cheap stand-in for language detection: the models differ in the languages
+    they support, and the script is enough to tell which of them can speak a text.
+
+    Args:
+        text: Text to inspect
+
+    Returns:
+        Unicode script name such as LATIN or HANGUL, None if the text has no letters
+    """
+    scripts = Counter(
+        unicodedata.name(char, "UNKNOWN").split(" ")[0]
+        for char in text
+        if char.isalpha()
+    )
+    if not scripts:
+        return None
+    return scripts.most_common(1)[0][0]
+
+
+class TTSModelRouter:
+    """
+    Routes synthesis requests to a model by latency tier.
+
+    Short lines go to the low-latency model so /play starts speaking in well under
+    a second, long-form text goes to the higher quality model. A quality hint on
+    the request overrides the length rule, and text in a script the first two
+    models do not support goes to the widest-coverage model.
+    """
+
+    def __init__(
+        self,
+        low_latency_model: str = LOW_LATENCY_TTS_MODEL,
+        quality_model: str = DEFAULT_TTS_MODEL,
+        wide_language_model: str = NEW_TTS_MODEL,
+        short_text_characters: int = DEFAULT_SHORT_TEXT_CHARACTERS
+    ):
+        self.low_latency_model = low_latency_model
+        self.quality_model = quality_model
+        self.wide_language_model = wide_language_model
+        self.short_text_characters = short_text_characters
+
+    def select(self, text: str, quality: SpeechQuality = SpeechQuality.auto) -> str:
+        """
+        Select the model for a request.
+
+        Args:
+            text: Text to speak
+            quality: Per-request hint, auto routes by text length
+
+        Returns:
+            ElevenLabs model ID
+        """
+        script = detect_script(text)
+        if script is not None and script not in SHARED_SCRIPTS:
+            return self.wide_language_model
+
+        if quality == SpeechQuality.high:
+            return self.quality_model
+        if quality == SpeechQuality.fast or len(text) <= self.short_text_characters:
+            return self.low_latency_model
+        return self.quality_model
+
+
+_tts_model_router: TTSModelRouter | None = None
+
+
+def get_tts_model_router() -> TTSModelRouter:
+    """
+    Get the TTS model router instance, configured from environment variables.
+
+    TTS_LOW_LATENCY_MODEL, TTS_QUALITY_MODEL and TTS_WIDE_LANGUAGE_MODEL override the
+    models, TTS_SHORT_TEXT_CHARACTERS sets the longest text routed for low latency.
+
+    Returns:
+        TTSModelRouter instance
+    """
+    global _tts_model_router
+    if _tts_model_router is None:
+        _tts_model_router = TTSModelRouter(
+            low_latency_model=os.getenv("TTS_LOW_LATENCY_MODEL", LOW_LATENCY_TTS_MODEL),
+            quality_model=os.getenv("TTS_QUALITY_MODEL", DEFAULT_TTS_MODEL),
+            wide_language_model=os.getenv("TTS_WIDE_LANGUAGE_MODEL", NEW_TTS_MODEL),
+            short_text_characters=int(os.getenv("TTS_SHORT_TEXT_CHARACTERS", DEFAULT_SHORT_TEXT_CHARACTERS))
+        )
+    return _tts_model_router
@@ -0,0 +1,182 @@
+"""
+Voice Catalog - In-memory cache of the voice library with change tracking.
+"""
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from app.models import VoiceDetailDTO, VoiceChangesResponseDTO
+
+if TYPE_CHECKING:
+    from app.services.shared_state import RemoteVoiceCatalog
+
+logger = logging.getLogger(__name__)
+
+
+class VoiceCatalog:
+    """
+    Cache of the ElevenLabs voice library.
+
+    Every mutation bumps a monotonically increasing catalog version and records
+    the version at which each voice last changed, so clients can ask for only
+    the voices added, updated or deleted since the version they already have.
+
+    Versions start at an epoch taken from the wall clock in microseconds, so
+    every version issued by an earlier process is below the epoch of this one
+    and gets a full sync instead of an incomplete diff. They stay below 2**53,
+    which JavaScript clients can hold. API workers that share the bot process's
+    catalog all issue versions from that one.
+    """
+
+    def __init__(self, epoch: int | None = None):
+        self._voices: dict[str, VoiceDetailDTO] = {}
+        self._changed_at: dict[str, int] = {}
+        self._epoch = time.time_ns() // 1_000 if epoch is None else epoch
+        self._version = self._epoch
+        self._is_loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """Get the current catalog version."""
+        return self._version
+
+    @property
+    def is_loaded(self) -> bool:
+        """Check whether the catalog has been populated from ElevenLabs."""
+        return self._is_loaded
+
+    def list_voices(self) -> list[VoiceDetailDTO]:
+        """
+        Get all cached voices.
+
+        Returns:
+            List of cached VoiceDetailDTO objects
+        """
+        with self._lock:
+            return list(self._voices.values())
+
+    def sync(self, voices: list[VoiceDetailDTO]) -> int:
+        """
+        Replace the cached library with a fresh listing from ElevenLabs.
+
+        Voices that differ from the cached copy are recorded as updated, voices
+        missing from the listing are recorded as deleted.
+
+        Args:
+            voices: Complete list of voices returned by ElevenLabs
+
+        Returns:
+            Catalog version after the sync
+        """
+        with self._lock:
+            incoming = {voice.id: voice for voice in voices}
+            changed_ids = [voice_id for voice_id, voice in incoming.items() if self._voices.get(voice_id) != voice]
+            deleted_ids = [voice_id for voice_id in self._voices if voice_id not in incoming]
+
+            if changed_ids or deleted_ids:
+                self._version += 1
+                for voice_id in changed_ids + deleted_ids:
+                    self._changed_at[voice_id] = self._version
+                logger.info(f"Voice catalog synced: changed={len(changed_ids)}, deleted={len(deleted_ids)}, version={self._version}")
+
+            self._voices = incoming
+            self._is_loaded = True
+            return self._version
+
+    def upsert(self, voice: VoiceDetailDTO) -> int:
+        """
+        Add or replace a single voice.
+
+        Args:
+            voice: Voice to store
+
+        Returns:
+            Catalog version after the change
+        """
+        with self._lock:
+            self._version += 1
+            self._voices[voice.id] = voice
+            self._changed_at[voice.id] = self._version
+            return self._version
+
+    def remove(self, voice_id: str) -> int:
+        """
+        Remove a single voice and record it as deleted.
+
+        Args:
+            voice_id: ID of the voice to remove
+
+        Returns:
+            Catalog version after the change
+        """
+        with self._lock:
+            self._version += 1
+            self._voices.pop(voice_id, None)
+            self._changed_at[voice_id] = self._version
+            return self._version
+
+    def changes_since(self, since: int) -> VoiceChangesResponseDTO:
+        """
+        Get the voices that changed after a given catalog version.
+
+        A version of 0, one issued by another process (e.g. before a backend
+        restart), or one newer than the current version cannot be diffed against
+        and returns the full catalog with full_sync set so the client replaces its list.
+
+        Args:
+            since: Catalog version the client already has
+
+        Returns:
+            VoiceChangesResponseDTO with upserted voices and deleted voice IDs
+        """
+        with self._lock:
+            if since <= self._epoch or since > self._version:
+                return VoiceChangesResponseDTO(
+                    version=self._version,
+                    full_sync=True,
+                    upserted=list(self._voices.values())
+                )
+
+            upserted = []
+            deleted = []
+            for voice_id, changed_at in self._changed_at.items():
+                if changed_at <= since:
+                    continue
+                if voice_id in self._voices:
+                    upserted.append(self._voices[voice_id])
+                else:
+                    deleted.append(voice_id)
+
+            return VoiceChangesResponseDTO(
+                version=self._version,
+                upserted=upserted,
+                deleted=deleted
+            )
+
+
+# Global instance of the voice catalog
+voice_catalog: "VoiceCatalog | RemoteVoiceCatalog" = VoiceCatalog()
+
+
+def get_voice_catalog() -> "VoiceCatalog | RemoteVoiceCatalog":
+    """
+    Get the voice catalog instance.
+
+    Returns:
+        VoiceCatalog instance, or a RemoteVoiceCatalog in API workers that share the bot process's catalog
+    """
+    return voice_catalog
+
+
+def set_voice_catalog(catalog: "VoiceCatalog | RemoteVoiceCatalog") -> None:
+    """
+    Replace the voice catalog, e.g. with the bot process's in API workers.
+
+    Args:
+        catalog: Catalog used from now on
+    """
+    global voice_catalog
+    voice_catalog = catalog
@@ -0,0 +1,98 @@
+"""
+Voice Channel Index - Connectable voice channels kept current from gateway events.
+"""
+
+import discord
+
+from app.models import VoiceChannelDTO
+
+
+class VoiceChannelIndex:
+    """
+    Voice channels the bot may connect to, grouped by guild.
+
+    Permission checks run when a gateway event changes a guild (join, channel
+    or role changes, the bot's own roles) and only for that guild, so listing
+    channels costs the same however many guilds the bot is in. All methods are
+    called from the event loop.
+    """
+
+    def __init__(self):
+        self._guilds: dict[str, list[VoiceChannelDTO]] = {}
+        self._flat: list[VoiceChannelDTO] | None = None
+        self.is_built = False
+
+    def rebuild(self, guilds: list[discord.Guild]) -> None:
+        """
+        Index all guilds from scratch, e.g. after (re)connecting to the gateway.
+
+        Args:
+            guilds: Guilds the bot is in
+        """
+        self._guilds = {}
+        for guild in guilds:
+            self._guilds[str(guild.id)] = self._connectable_channels(guild)
+        self._flat = None
+        self.is_built = True
+
+    def index_guild(self, guild: discord.Guild) -> None:
+        """
+        Re-index one guild after anything affecting its channels or the bot's permissions changed.
+
+        Args:
+            guild: Changed guild
+        """
+        self._guilds[str(guild.id)] = self._connectable_channels(guild)
+        self._flat = None
+
+    def remove_guild(self, guild: discord.Guild) -> None:
+        """
+        Drop a guild the bot left or that became unavailable.
+
+        Args:
+            guild: Removed guild
+        """
+        if self._guilds.pop(str(guild.id), None) is not None:
+            self._flat = None
+
+    def clear(self) -> None:
+        """Forget everything, the next listing rebuilds the index."""
+        self._guilds = {}
+        self._flat = None
+        self.is_built = False
+
+    def channels(self, guild_id: str | None = None, page: int = 1, limit: int | None = None) -> list[VoiceChannelDTO]:
+        """
+        List connectable voice channels.
+
+        Args:
+            guild_id: Only list channels of this guild
+            page: 1-based page number, used with limit
+            limit: Page size, None for all channels
+
+        Returns:
+            List of VoiceChannelDTO objects, ordered by guild and channel position
+        """
+        if guild_id is not None:
+            channels = self._guilds.get(guild_id, [])
+        else:
+            if self._flat is None:
+                self._flat = [channel for guild_channels in self._guilds.values() for channel in guild_channels]
+            channels = self._flat
+
+        if limit is None:
+            return list(channels)
+        start = (page - 1) * limit
+        return channels[start:start + limit]
+
+    @staticmethod
+    def _connectable_channels(guild: discord.Guild) -> list[VoiceChannelDTO]:
+        return [
+            VoiceChannelDTO(
+                id=str(channel.id),
+                name=f"{guild.name} - {channel.name}",
+                guild_id=str(guild.id)
+            )
+            for channel in guild.voice_channels
+            if channel.permissions_for(guild.me).connect
+        ]
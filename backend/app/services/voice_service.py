@@ -3,15 +3,37 @@ Voice Service - Business logic for voice management operations.
 """
 
 import asyncio
+import os
+from collections.abc import AsyncIterator
 from datetime import datetime
 from typing import List
 
-from app.models import VoiceDetailDTO, CreateVoiceCommand, VoiceDTO, VoiceSampleDTO, DesignVoiceCommand, DesignVoiceResponseDTO, VoicePreviewDTO, TextToSpeechCommand
+from app.models import VoiceDetailDTO, CreateVoiceCommand, VoiceDTO, VoiceSampleDTO, DesignVoiceCommand, DesignVoiceResponseDTO, VoicePreviewDTO, TextToSpeechCommand, VoiceChangesResponseDTO
+from app.models import DesignWizardCommand, DesignWizardStageDTO, WizardStage, PromptImprovementCommand, TranslateVoiceDescriptionCommand, GenerateSampleTextCommand
+from app.models import JobDTO, JobKind, DesignVariant
 from app.services.elevenlabs_client import ElevenLabsAPIClient
+from app.services.voice_catalog import get_voice_catalog
+from app.services import prompt_service
+from app.services.job_service import get_job_manager
+from app.services.deadline import Deadline, DeadlineExceededError, OperationCancelledError
+from app.services.quota_service import get_quota_ledger, QuotaExceededError, QuotaLedger, QuotaReservation
+from app.services.audio_cache import get_audio_cache
+from app.services.tts_model_router import get_tts_model_router
+from app.services.speech_backends import FirstAudio, SpeechBackend, SpeechBackendRouter, create_local_backend, LOCAL_BACKEND_NAME, DEFAULT_LATENCY_BUDGET_SECONDS
+from app.services.resilience import CircuitState, get_elevenlabs_resilience
+from app.services.metrics import get_metrics_registry
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of design variants sent to ElevenLabs at the same time
+DESIGN_VARIANT_CONCURRENCY = int(os.getenv("DESIGN_VARIANT_CONCURRENCY", "4"))
+# Characters reserved for a voice design whose sample text ElevenLabs generates
+AUTO_SAMPLE_TEXT_CHARACTERS = 300
+
+# Fire-and-forget tasks, referenced so they are not garbage collected while running
+_background_tasks: set[asyncio.Task] = set()
+
 
 def list_voices(client: ElevenLabsAPIClient) -> List[VoiceDetailDTO]:
     """
@@ -29,12 +51,40 @@ def list_voices(client: ElevenLabsAPIClient) -> List[VoiceDetailDTO]:
     """
     try:
         voices = client.list_voices()
+        get_voice_catalog().sync(voices)
         return voices
     except Exception as e:
         # Re-raise the exception to let the router handle it
         raise e
 
 
+def get_voice_changes(client: ElevenLabsAPIClient, since: int) -> VoiceChangesResponseDTO:
+    """
+    Retrieve voices added, updated or deleted since a catalog version.
+    
+    The catalog is only loaded from ElevenLabs when it has not been populated yet;
+    afterwards changes are served from the cache.
+    
+    Args:
+        client: ElevenLabs API client instance.
+        since: Catalog version the caller already has (0 for a full listing).
+        
+    Returns:
+        VoiceChangesResponseDTO with the current version and the changed voices.
+        
+    Raises:
+        ValueError: If since is negative.
+    """
+    if since < 0:
+        raise ValueError("Catalog version cannot be negative")
+    
+    catalog = get_voice_catalog()
+    if not catalog.is_loaded:
+        list_voices(client)
+    
+    return catalog.changes_since(since)
+
+
 def create_elevenlabs_client() -> ElevenLabsAPIClient:
     """
     Factory function to create an ElevenLabs API client.
@@ -60,6 +110,7 @@ def design_voice(command: DesignVoiceCommand) -> DesignVoiceResponseDTO:
         
     Raises:
         ValueError: If input validation fails or ElevenLabs API errors
+        QuotaExceededError: If a character budget is nearly exhausted
         Exception: If ElevenLabs API calls fail
     """
     client = create_elevenlabs_client()
@@ -67,26 +118,191 @@ def design_voice(command: DesignVoiceCommand) -> DesignVoiceResponseDTO:
     # Handle sample_text validation for ElevenLabs API
     sample_text = command.sample_text if command.sample_text and len(command.sample_text) >= 100 else None
     
+    # Reserve the characters the previews will be billed for
+    ledger = get_quota_ledger()
+    reservation = ledger.reserve(None, len(sample_text) if sample_text else AUTO_SAMPLE_TEXT_CHARACTERS)
+    
     # Call ElevenLabs design API
-    voice_design = _design_voice(client, command.prompt, command.loudness, command.creativity, sample_text)
+    try:
+        voice_design = _design_voice(client, command.prompt, command.loudness, command.creativity, sample_text)
+    except BaseException:
+        ledger.release(reservation)
+        raise
+    reservation.record_actual(len(voice_design.get("text") or ""))
+    ledger.commit(reservation)
     
     # Map previews to DTOs
+    text = voice_design.get("text", "")
     previews = []
     for preview in voice_design.get("previews", []):
         preview_dto = VoicePreviewDTO(
             generated_voice_id=getattr(preview, 'generated_voice_id', ''),
             audio_base64=getattr(preview, 'audio_base_64', ''),
             media_type=getattr(preview, 'media_type', 'audio/mp3'),
-            duration_secs=getattr(preview, 'duration_secs', 0.0)
+            duration_secs=getattr(preview, 'duration_secs', 0.0),
+            loudness=command.loudness,
+            creativity=command.creativity,
+            text=text
         )
         previews.append(preview_dto)
     
     return DesignVoiceResponseDTO(
         previews=previews,
-        text=voice_design.get("text", "")
+        text=text
+    )
+
+
+def _variant_commands(command: DesignVoiceCommand) -> list[DesignVoiceCommand]:
+    """
+    Split a design command into one single-setting command per variant.
+    """
+    variants = command.variants or [DesignVariant(loudness=command.loudness, creativity=command.creativity)]
+    return [
+        command.model_copy(update={"loudness": variant.loudness, "creativity": variant.creativity, "variants": None})
+        for variant in variants
+    ]
+
+
+async def stream_design_voice_variants(command: DesignVoiceCommand) -> AsyncIterator[DesignVoiceResponseDTO]:
+    """
+    Design every variant concurrently and yield each preview set as soon as it is ready.
+    
+    At most DESIGN_VARIANT_CONCURRENCY ElevenLabs design calls run at once, so
+    exploring a handful of settings takes about as long as exploring one.
+    
+    Args:
+        command: DesignVoiceCommand, optionally with a list of variants
+        
+    Yields:
+        DesignVoiceResponseDTO per variant, in completion order
+        
+    Raises:
+        ValueError: If input validation fails or ElevenLabs API errors
+        Exception: If ElevenLabs API calls fail
+    """
+    limit = asyncio.Semaphore(DESIGN_VARIANT_CONCURRENCY)
+    
+    async def design_variant(variant_command: DesignVoiceCommand) -> DesignVoiceResponseDTO:
+        async with limit:
+            return await asyncio.to_thread(design_voice, variant_command)
+    
+    tasks = [asyncio.create_task(design_variant(variant_command)) for variant_command in _variant_commands(command)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def design_voice_variants(command: DesignVoiceCommand) -> DesignVoiceResponseDTO:
+    """
+    Design every variant concurrently and merge the previews into one response.
+    
+    Args:
+        command: DesignVoiceCommand, optionally with a list of variants
+        
+    Returns:
+        DesignVoiceResponseDTO with the previews of all variants, each tagged with its settings
+        and text. Without sample_text every variant speaks its own generated text, so the
+        top-level text is only set when all variants share it.
+        
+    Raises:
+        ValueError: If input validation fails or ElevenLabs API errors
+        Exception: If ElevenLabs API calls fail
+    """
+    responses = [response async for response in stream_design_voice_variants(command)]
+    
+    # Keep previews grouped in the order the variants were requested
+    settings_order = [(variant.loudness, variant.creativity) for variant in _variant_commands(command)]
+    previews = sorted(
+        (
+            preview if preview.text is not None else preview.model_copy(update={"text": response.text})
+            for response in responses for preview in response.previews
+        ),
+        key=lambda preview: settings_order.index((preview.loudness, preview.creativity))
+    )
+    
+    texts = {response.text for response in responses}
+    return DesignVoiceResponseDTO(
+        previews=previews,
+        text=texts.pop() if len(texts) == 1 else ""
     )
 
 
+async def run_design_wizard(command: DesignWizardCommand) -> AsyncIterator[DesignWizardStageDTO]:
+    """
+    Run the whole voice design flow in one call, yielding each stage as it completes.
+    
+    The description branch (improve, then translate) and sample text generation
+    are independent and run concurrently; the ElevenLabs design call starts as
+    soon as both are done, so wall-clock time follows the critical path.
+    
+    Args:
+        command: DesignWizardCommand with the raw description and design settings
+        
+    Yields:
+        DesignWizardStageDTO for every completed stage, the design stage last
+        
+    Raises:
+        ValueError: If input validation fails or ElevenLabs API errors
+        Exception: If OpenAI or ElevenLabs API calls fail
+    """
+    events: asyncio.Queue[DesignWizardStageDTO | None] = asyncio.Queue()
+    
+    async def prompt_branch() -> str:
+        prompt = command.prompt
+        if command.improve_prompt:
+            prompt = await prompt_service.improve_prompt(PromptImprovementCommand(prompt=prompt))
+            events.put_nowait(DesignWizardStageDTO(stage=WizardStage.improve_prompt, text=prompt))
+        if command.translate:
+            prompt = await prompt_service.translate_voice_description(TranslateVoiceDescriptionCommand(voice_description=prompt[:1000]))
+            events.put_nowait(DesignWizardStageDTO(stage=WizardStage.translate, text=prompt))
+        return prompt
+    
+    async def sample_text_branch() -> str | None:
+        if command.sample_text:
+            return command.sample_text
+        sample_text = await prompt_service.generate_sample_text(GenerateSampleTextCommand(voice_description=command.prompt))
+        events.put_nowait(DesignWizardStageDTO(stage=WizardStage.sample_text, text=sample_text))
+        return sample_text
+    
+    async def pipeline() -> None:
+        try:
+            branches = [asyncio.create_task(prompt_branch()), asyncio.create_task(sample_text_branch())]
+            try:
+                prompt, sample_text = await asyncio.gather(*branches)
+            except BaseException:
+                # gather leaves the sibling running when one branch fails
+                for branch in branches:
+                    branch.cancel()
+                raise
+            
+            # Let ElevenLabs auto-generate text when the generated sample is out of range
+            if sample_text and not 100 <= len(sample_text) <= 1000:
+                sample_text = None
+            
+            design_command = DesignVoiceCommand(
+                prompt=prompt[:1000],
+                sample_text=sample_text,
+                loudness=command.loudness,
+                creativity=command.creativity
+            )
+            design = await asyncio.to_thread(design_voice, design_command)
+            events.put_nowait(DesignWizardStageDTO(stage=WizardStage.design, design=design))
+        finally:
+            events.put_nowait(None)
+    
+    task = asyncio.create_task(pipeline())
+    try:
+        while (event := await events.get()) is not None:
+            yield event
+        # Re-raise any stage failure
+        await task
+    finally:
+        task.cancel()
+
+
 def create_voice(command: CreateVoiceCommand) -> VoiceDTO:
     """
     Create a voice from a selected preview.
@@ -112,13 +328,61 @@ def create_voice(command: CreateVoiceCommand) -> VoiceDTO:
     )
     
     # Create and return VoiceDTO (without samples for now)
-    return VoiceDTO(
+    voice_dto = VoiceDTO(
         id=created_voice["voice_id"],
         name=created_voice["name"],
         prompt=command.voice_description,
         created_at=datetime.fromtimestamp(created_voice["created_at_unix"]) if created_voice.get("created_at_unix") and created_voice.get("created_at_unix") > 0 else datetime.utcnow(),
         samples=[]  # No samples needed for create response
     )
+    
+    get_voice_catalog().upsert(VoiceDetailDTO(**voice_dto.model_dump()))
+    
+    return voice_dto
+
+async def submit_design_voice_job(command: DesignVoiceCommand) -> JobDTO:
+    """
+    Queue a voice design on the background worker pool.
+    
+    Args:
+        command: DesignVoiceCommand with prompt, sample_text, loudness, and creativity
+        
+    Returns:
+        JobDTO in pending status; its result is a DesignVoiceResponseDTO
+        
+    Raises:
+        ValueError: If the job queue is full
+    """
+    manager = get_job_manager()
+    
+    async def work(job_id: str) -> DesignVoiceResponseDTO:
+        if command.variants:
+            return await design_voice_variants(command)
+        return await manager.run_in_worker(design_voice, command)
+    
+    return await manager.submit(JobKind.design_voice, work)
+
+
+async def submit_create_voice_job(command: CreateVoiceCommand) -> JobDTO:
+    """
+    Queue a voice creation on the background worker pool.
+    
+    Args:
+        command: CreateVoiceCommand with voice_name, voice_description, and generated_voice_id
+        
+    Returns:
+        JobDTO in pending status; its result is a VoiceDTO
+        
+    Raises:
+        ValueError: If the job queue is full
+    """
+    manager = get_job_manager()
+    
+    async def work(job_id: str) -> VoiceDTO:
+        return await manager.run_in_worker(create_voice, command)
+    
+    return await manager.submit(JobKind.create_voice, work)
+
 
 def _design_voice(client: ElevenLabsAPIClient, prompt: str, loudness: float, creativity: float, sample_text: str | None) -> dict:
     """
@@ -197,20 +461,132 @@ def _map_previews_to_samples(previews: List, text: str) -> List[VoiceSampleDTO]:
     return samples
 
 
-async def synthesize_speech(command: TextToSpeechCommand) -> bytes:
+def _refresh_subscription_usage(client: ElevenLabsAPIClient) -> None:
+    """
+    Re-anchor the quota ledger to ElevenLabs subscription usage in the background when it is stale.
+    """
+    ledger = get_quota_ledger()
+    if not ledger.begin_subscription_refresh():
+        return
+    
+    async def refresh() -> None:
+        try:
+            usage = await asyncio.to_thread(client.get_subscription_usage)
+            ledger.sync_subscription(usage["character_count"], usage["character_limit"])
+        except Exception as e:
+            logger.warning(f"Failed to refresh ElevenLabs subscription usage: {str(e)}")
+            ledger.end_subscription_refresh()
+    
+    task = asyncio.create_task(refresh())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+class ElevenLabsSpeechBackend(SpeechBackend):
+    """
+    Speech from ElevenLabs, admitted against the character quota.
+    """
+    
+    name = "elevenlabs"
+    
+    def is_available(self) -> bool:
+        return get_elevenlabs_resilience().breaker.state != CircuitState.open and not get_quota_ledger().is_degraded()
+    
+    async def synthesize(self, voice_id: str, text: str, model_id: str, deadline: Deadline, first_audio: FirstAudio | None = None) -> bytes:
+        client = create_elevenlabs_client()
+        _refresh_subscription_usage(client)
+        
+        # Admission control: refuses the request if a character budget is nearly exhausted
+        ledger = get_quota_ledger()
+        reservation = ledger.reserve(voice_id, len(text))
+        
+        logger.info(f"Generating speech for voice_id={voice_id}, model_id={model_id}, text_length={len(text)}")
+        
+        # The SDK call is bounded by the same deadline, so the worker thread ends soon after a timeout here
+        worker = asyncio.ensure_future(asyncio.to_thread(
+            client.generate_speech,
+            voice_id=voice_id,
+            text=text,
+            deadline=deadline,
+            on_character_count=reservation.record_actual,
+            model_id=model_id,
+            first_audio_deadline=first_audio.deadline if first_audio is not None else None,
+            on_first_audio=first_audio.received if first_audio is not None else None
+        ))
+        try:
+            # Shielded, so the reservation is settled by the worker thread rather than by the timeout
+            audio_data = await deadline.run(asyncio.shield(worker), "speech synthesis")
+        except BaseException:
+            if worker.done():
+                _settle_reservation(ledger, reservation, worker)
+            else:
+                worker.add_done_callback(lambda _: _settle_reservation(ledger, reservation, worker))
+            raise
+        ledger.commit(reservation)
+        return audio_data
+
+
+def _settle_reservation(ledger: QuotaLedger, reservation: QuotaReservation, worker: asyncio.Future) -> None:
     """
-    Generate speech audio from text using ElevenLabs API.
+    Settle the reservation of a synthesis that failed or was abandoned, once its worker thread has finished.
+    
+    ElevenLabs may still complete and bill a request the caller gave up on,
+    so the billed characters are only known when the thread is done.
+    """
+    if not worker.cancelled() and worker.exception() is None:
+        # Finished after the caller timed out, so it was billed in full
+        ledger.commit(reservation)
+    elif reservation.actual is not None:
+        # Once ElevenLabs reported a cost the characters are billed, even if the download was abandoned
+        ledger.commit(reservation)
+    else:
+        ledger.release(reservation)
+
+
+_speech_backend_router: SpeechBackendRouter | None = None
+
+
+def get_speech_backend_router() -> SpeechBackendRouter:
+    """
+    Get the router between speech backends.
+    
+    TTS_BACKENDS lists the backends in order of preference (default "elevenlabs,local";
+    "local" alone runs without any upstream, e.g. for benchmarks), and
+    TTS_FALLBACK_LATENCY_SECONDS is the time a backend gets to deliver its first audio before the next one takes over.
+    
+    Returns:
+        SpeechBackendRouter instance
+    """
+    global _speech_backend_router
+    if _speech_backend_router is None:
+        factories = {ElevenLabsSpeechBackend.name: ElevenLabsSpeechBackend, LOCAL_BACKEND_NAME: create_local_backend}
+        names = [name.strip() for name in os.getenv("TTS_BACKENDS", "elevenlabs,local").split(",") if name.strip()]
+        _speech_backend_router = SpeechBackendRouter(
+            backends=[factories[name]() for name in names],
+            latency_budget=float(os.getenv("TTS_FALLBACK_LATENCY_SECONDS", DEFAULT_LATENCY_BUDGET_SECONDS))
+        )
+    return _speech_backend_router
+
+
+async def synthesize_speech(command: TextToSpeechCommand, deadline: Deadline | None = None) -> bytes:
+    """
+    Generate speech audio from text using ElevenLabs API, or the local engine while ElevenLabs is unavailable.
     
     Args:
         command: TextToSpeechCommand with voice_id, text, and timeout
+        deadline: End-to-end deadline of the caller. Defaults to command.timeout from now.
         
     Returns:
-        bytes: Generated audio data in MP3 format
+        bytes: Generated audio data, MP3 from ElevenLabs or WAV from the local engine
         
     Raises:
         ValueError: If input validation fails or voice not found
+        DeadlineExceededError: If the deadline passes before audio is ready
+        OperationCancelledError: If the deadline is cancelled before audio is ready
+        QuotaExceededError: If the text is not cached, a character budget is nearly exhausted and there is no local engine
         Exception: If TTS generation fails
     """
+    deadline = deadline or Deadline.after(command.timeout)
     try:
         # Validate input
         if not command.voice_id or not command.voice_id.strip():
@@ -223,17 +599,22 @@ async def synthesize_speech(command: TextToSpeechCommand) -> bytes:
         if len(command.text) > 5000:
             raise ValueError("Text length cannot exceed 5000 characters")
         
-        # Create ElevenLabs client
-        client = create_elevenlabs_client()
+        # Short lines go to a low-latency model, long-form text to the higher quality one
+        model_id = get_tts_model_router().select(command.text, command.quality)
         
-        # Generate speech
-        logger.info(f"Generating speech for voice_id={command.voice_id}, text_length={len(command.text)}")
+        # Repeated phrases cost no characters, and are all that is served once the quota runs low
+        cache = get_audio_cache()
+        cache_key = cache.make_key(command.voice_id, model_id, command.text)
+        cached_audio = cache.get(cache_key)
+        if cached_audio is not None:
+            get_metrics_registry().increment("audio_cache_hits_total", model=model_id)
+            logger.info(f"Serving cached speech for voice_id={command.voice_id}")
+            return cached_audio
         
-        audio_data = client.generate_speech(
-            voice_id=command.voice_id,
-            text=command.text,
-            timeout=command.timeout
-        )
+        # ElevenLabs first, the local engine takes over while it is down, slow or out of quota
+        audio_data, backend = await get_speech_backend_router().synthesize(command.voice_id, command.text, model_id, deadline)
+        if backend.cacheable:
+            cache.set(cache_key, audio_data)
         
         # Check if audio_data is valid before logging length
         if isinstance(audio_data, bytes):
@@ -243,8 +624,8 @@ async def synthesize_speech(command: TextToSpeechCommand) -> bytes:
         
         return audio_data
         
-    except ValueError:
-        # Re-raise validation errors
+    except (ValueError, DeadlineExceededError, OperationCancelledError, QuotaExceededError):
+        # Re-raise validation errors, timeouts, cancellations and quota rejections
         raise
     except Exception as e:
         error_message = str(e)
@@ -300,7 +681,8 @@ async def delete_voice(voice_id: str) -> None:
         client = create_elevenlabs_client()
         
         # Delete the voice directly - let ElevenLabs API handle validation
-        client.delete_voice(voice_id)
+        await asyncio.to_thread(client.delete_voice, voice_id)
+        await asyncio.to_thread(get_voice_catalog().remove, voice_id)
         
         logger.info(f"Successfully deleted voice with ID: {voice_id}")
         
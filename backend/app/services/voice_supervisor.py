@@ -0,0 +1,244 @@
+"""
+Voice Supervisor - Keep voice sessions connected while in use, and release them when idle.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections.abc import Awaitable, Callable
+
+import discord
+
+from app.services.metrics import get_metrics_registry
+from app.services.resilience import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+# How often each voice session is checked
+DEFAULT_CHECK_INTERVAL_SECONDS = 5.0
+# Voice heartbeat latency above this counts as unhealthy
+DEFAULT_MAX_LATENCY_SECONDS = 2.0
+# Consecutive slow checks before a connection is replaced
+SLOW_CHECKS_BEFORE_RECONNECT = 3
+# Seconds without playback before a voice channel is left, 0 keeps connections open
+DEFAULT_IDLE_TIMEOUT_SECONDS = 300.0
+# Seconds a voice channel may have no humans in it before it is left, 0 stays in empty channels
+DEFAULT_EMPTY_CHANNEL_TIMEOUT_SECONDS = 30.0
+
+
+class VoiceSessionSupervisor:
+    """
+    Watches the voice connection of one guild and restores it when it drops.
+
+    discord.py resumes short voice websocket interruptions by itself; when it
+    gives up, the voice client is gone and the next /play used to fail with
+    "not connected". The supervisor notices that within check_interval seconds,
+    as well as a connection whose heartbeat latency stays above max_latency,
+    and reconnects to the last requested channel with exponential backoff.
+    on_reconnected then resumes the playback queue on the new connection.
+    If the session cannot be restored, on_gave_up is called and supervision ends.
+
+    Each open voice connection holds a UDP socket, an Opus encoder and a
+    keepalive thread. When nothing has played for idle_timeout seconds, or no
+    human has been in the channel for empty_timeout seconds, on_idle is called
+    with the reason ("inactive" or "empty") so the session can be released.
+    """
+
+    def __init__(
+        self,
+        guild_id: int,
+        channel_id: int,
+        get_client: Callable[[], discord.Client | None],
+        on_reconnected: Callable[[discord.VoiceClient], Awaitable[None]],
+        check_interval: float = DEFAULT_CHECK_INTERVAL_SECONDS,
+        max_latency: float = DEFAULT_MAX_LATENCY_SECONDS,
+        policy: RetryPolicy | None = None,
+        on_idle: Callable[[str], Awaitable[None]] | None = None,
+        on_gave_up: Callable[[], None] | None = None,
+        idle_timeout: float = 0.0,
+        empty_timeout: float = 0.0
+    ):
+        self.guild_id = guild_id
+        # Follows moves, whether requested through the API or made in Discord
+        self.channel_id = channel_id
+        self.get_client = get_client
+        self.on_reconnected = on_reconnected
+        self.check_interval = check_interval
+        self.max_latency = max_latency
+        self.policy = policy or RetryPolicy(max_attempts=20, base_delay=1.0, max_delay=30.0)
+        self.on_idle = on_idle
+        self.on_gave_up = on_gave_up
+        self.idle_timeout = idle_timeout
+        self.empty_timeout = empty_timeout
+        self.reconnecting = False
+        self.last_activity = time.monotonic()
+        self._empty_since: float | None = None
+        self._slow_checks = 0
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start supervising, unless already running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop supervising, e.g. because the bot left the channel on request."""
+        if self._task is not None:
+            # on_idle releasing the session stops supervision from within the task, which then returns
+            if self._task is not asyncio.current_task():
+                self._task.cancel()
+            self._task = None
+
+    def touch(self) -> None:
+        """Record activity, e.g. a play request, postponing the idle timeout."""
+        self.last_activity = time.monotonic()
+
+    def voice_client(self) -> discord.VoiceClient | None:
+        """Get the guild's current voice client, if any."""
+        client = self.get_client()
+        if client is None:
+            return None
+        for voice_client in client.voice_clients:
+            if voice_client.guild.id == self.guild_id:
+                return voice_client
+        return None
+
+    def check(self) -> bool:
+        """
+        Check the connection once.
+
+        Returns:
+            bool: Whether the connection needs to be replaced
+        """
+        client = self.get_client()
+        if client is None or not client.is_ready():
+            # Voice sessions resume with the gateway, nothing to do until then
+            return False
+
+        voice_client = self.voice_client()
+        if voice_client is None or not voice_client.is_connected():
+            return True
+
+        latency = voice_client.latency
+        if math.isfinite(latency) and latency > self.max_latency:
+            self._slow_checks += 1
+            logger.warning(f"Voice latency in guild {self.guild_id} is {latency * 1000:.0f}ms")
+        else:
+            self._slow_checks = 0
+        return self._slow_checks >= SLOW_CHECKS_BEFORE_RECONNECT
+
+    def idle_reason(self) -> str | None:
+        """
+        Check whether the session should be released.
+
+        Returns:
+            "inactive" or "empty", None if the session is in use
+        """
+        voice_client = self.voice_client()
+        if voice_client is None or not voice_client.is_connected():
+            return None
+
+        now = time.monotonic()
+        if voice_client.is_playing():
+            self.last_activity = now
+
+        if self.empty_timeout:
+            # Needs voice members cached, which every client profile does
+            if any(not member.bot for member in voice_client.channel.members):
+                self._empty_since = None
+            else:
+                if self._empty_since is None:
+                    self._empty_since = now
+                if now - self._empty_since >= self.empty_timeout:
+                    return "empty"
+
+        if self.idle_timeout and now - self.last_activity >= self.idle_timeout:
+            return "inactive"
+        return None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            if self.check():
+                if not await self.reconnect():
+                    if self.on_gave_up is not None:
+                        self.on_gave_up()
+                    return
+            elif self.on_idle is not None:
+                reason = self.idle_reason()
+                if reason is not None:
+                    await self.on_idle(reason)
+                    return
+
+    async def reconnect(self) -> bool:
+        """
+        Reconnect to the requested channel, retrying with backoff.
+
+        Returns:
+            bool: Whether the session was restored; False means supervision ended
+        """
+        metrics = get_metrics_registry()
+        started = time.monotonic()
+        self.reconnecting = True
+        self._slow_checks = 0
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                try:
+                    voice_client = await self._connect()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    metrics.increment("voice_reconnects_total", result="failure")
+                    delay = None if isinstance(e, PermissionError) else self.policy.backoff(attempt, e)
+                    if delay is None:
+                        logger.error(f"Giving up reconnecting voice in guild {self.guild_id} after {attempt} attempts: {str(e)}")
+                        return False
+                    logger.warning(f"Voice reconnect attempt {attempt} in guild {self.guild_id} failed, retrying in {delay:.1f}s: {str(e)}")
+                    await asyncio.sleep(delay)
+                    continue
+
+                elapsed = time.monotonic() - started
+                metrics.increment("voice_reconnects_total", result="success")
+                metrics.increment("voice_reconnect_seconds_total", elapsed)
+                logger.info(f"Voice session in guild {self.guild_id} restored after {attempt} attempts in {elapsed:.1f}s")
+                await self.on_reconnected(voice_client)
+                return True
+        finally:
+            self.reconnecting = False
+
+    async def _connect(self) -> discord.VoiceClient:
+        client = self.get_client()
+        if client is None:
+            raise Exception("Discord bot not initialized")
+
+        stale = self.voice_client()
+        if stale is not None:
+            # Frees the guild's voice slot, discord.py refuses to connect while it is taken
+            await stale.disconnect(force=True)
+
+        channel = client.get_channel(self.channel_id)
+        if not isinstance(channel, discord.VoiceChannel):
+            raise PermissionError(f"Voice channel {self.channel_id} no longer exists")
+        if not channel.permissions_for(channel.guild.me).connect:
+            raise PermissionError(f"Bot may no longer connect to channel {channel.name}")
+        return await channel.connect()
+
+
+def supervisor_options() -> dict:
+    """
+    Get supervisor settings from VOICE_HEALTH_CHECK_SECONDS, VOICE_MAX_LATENCY_SECONDS,
+    VOICE_IDLE_TIMEOUT_SECONDS and VOICE_EMPTY_CHANNEL_TIMEOUT_SECONDS.
+
+    Returns:
+        Keyword arguments for VoiceSessionSupervisor
+    """
+    return {
+        "check_interval": float(os.getenv("VOICE_HEALTH_CHECK_SECONDS", DEFAULT_CHECK_INTERVAL_SECONDS)),
+        "max_latency": float(os.getenv("VOICE_MAX_LATENCY_SECONDS", DEFAULT_MAX_LATENCY_SECONDS)),
+        "idle_timeout": float(os.getenv("VOICE_IDLE_TIMEOUT_SECONDS", DEFAULT_IDLE_TIMEOUT_SECONDS)),
+        "empty_timeout": float(os.getenv("VOICE_EMPTY_CHANNEL_TIMEOUT_SECONDS", DEFAULT_EMPTY_CHANNEL_TIMEOUT_SECONDS))
+    }
@@ -0,0 +1,145 @@
+"""
+Memory benchmark for the Discord client profiles.
+
+Feeds synthetic gateway payloads into a discord.py client state without connecting:
+    - GUILD_CREATE for every guild: text and voice channels, roles, emojis,
+      stickers, the bot's own member and the members sitting in voice channels
+    - MESSAGE_CREATE traffic, only for profiles whose intents subscribe to it
+
+and reports the Python heap the client holds afterwards, for 100, 1k and 5k guilds.
+
+Run from the backend directory:
+    python -m benchmarks.bench_discord_client_memory
+"""
+
+import gc
+import tracemalloc
+
+import discord
+
+from app.services.discord_client_profile import ClientProfile, client_options
+
+GUILD_COUNTS = [100, 1_000, 5_000]
+TEXT_CHANNELS_PER_GUILD = 20
+VOICE_CHANNELS_PER_GUILD = 5
+ROLES_PER_GUILD = 15
+EMOJIS_PER_GUILD = 30
+STICKERS_PER_GUILD = 5
+VOICE_MEMBERS_PER_GUILD = 3
+MESSAGES_PER_GUILD = 20
+BOT_USER_ID = 1
+
+
+def user_payload(user_id: int) -> dict:
+    return {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0", "global_name": None, "avatar": None}
+
+
+def member_payload(user_id: int) -> dict:
+    return {"user": user_payload(user_id), "roles": [], "joined_at": "2024-01-01T00:00:00+00:00", "deaf": False, "mute": False, "flags": 0}
+
+
+def guild_payload(index: int) -> dict:
+    """Build a GUILD_CREATE payload as Discord sends it without the members intent."""
+    guild_id = 10_000_000 + index * 1_000
+    text_channels = [
+        {"id": str(guild_id + 100 + c), "type": 0, "name": f"text-{c}", "position": c, "permission_overwrites": [], "topic": "General chatter and announcements"}
+        for c in range(TEXT_CHANNELS_PER_GUILD)
+    ]
+    voice_channels = [
+        {"id": str(guild_id + 200 + c), "type": 2, "name": f"voice-{c}", "position": c, "permission_overwrites": [], "bitrate": 64000, "user_limit": 0}
+        for c in range(VOICE_CHANNELS_PER_GUILD)
+    ]
+    roles = [
+        {"id": str(guild_id + r), "name": "@everyone" if r == 0 else f"role-{r}", "permissions": "1024", "position": r, "color": 0, "hoist": False, "managed": False, "mentionable": False}
+        for r in range(ROLES_PER_GUILD)
+    ]
+    emojis = [
+        {"id": str(guild_id + 300 + e), "name": f"emoji{e}", "roles": [], "require_colons": True, "managed": False, "animated": False, "available": True}
+        for e in range(EMOJIS_PER_GUILD)
+    ]
+    stickers = [
+        {"id": str(guild_id + 400 + s), "name": f"sticker{s}", "description": "A sticker", "tags": "smile", "type": 2, "format_type": 1, "available": True, "guild_id": str(guild_id)}
+        for s in range(STICKERS_PER_GUILD)
+    ]
+    voice_member_ids = [guild_id + 500 + m for m in range(VOICE_MEMBERS_PER_GUILD)]
+    voice_states = [
+        {"user_id": str(user_id), "channel_id": voice_channels[0]["id"], "session_id": "session", "deaf": False, "mute": False, "self_deaf": False, "self_mute": False, "self_video": False, "suppress": False}
+        for user_id in voice_member_ids
+    ]
+    return {
+        "id": str(guild_id),
+        "name": f"Guild {index}",
+        "owner_id": str(voice_member_ids[0]),
+        "member_count": 500,
+        "features": [],
+        "channels": text_channels + voice_channels,
+        "roles": roles,
+        "emojis": emojis,
+        "stickers": stickers,
+        "voice_states": voice_states,
+        "members": [member_payload(BOT_USER_ID)] + [member_payload(user_id) for user_id in voice_member_ids]
+    }
+
+
+def message_payload(guild: dict, index: int) -> dict:
+    channel = guild["channels"][index % TEXT_CHANNELS_PER_GUILD]
+    author_id = int(guild["id"]) + 600 + index
+    return {
+        "id": str(int(guild["id"]) * 1_000 + index),
+        "channel_id": channel["id"],
+        "guild_id": guild["id"],
+        "author": user_payload(author_id),
+        "member": {k: v for k, v in member_payload(author_id).items() if k != "user"},
+        "content": "Has anyone tried the new soundboard voices yet?",
+        "timestamp": "2024-01-01T00:00:00+00:00",
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [],
+        "attachments": [],
+        "embeds": [],
+        "pinned": False,
+        "type": 0
+    }
+
+
+def load_client(profile: ClientProfile, guilds: list[dict]) -> discord.Client:
+    """Create a client for the profile and feed it the gateway traffic its intents receive."""
+    client = discord.Client(**client_options(profile))
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data=user_payload(BOT_USER_ID))
+    for payload in guilds:
+        state._add_guild_from_data(payload)
+    if state._intents.guild_messages:
+        for payload in guilds:
+            for index in range(MESSAGES_PER_GUILD):
+                state.parse_message_create(message_payload(payload, index))
+    return client
+
+
+def measure(profile: ClientProfile, guilds: list[dict]) -> tuple[float, int]:
+    """Return the heap held by a loaded client in MiB and its cached member count."""
+    gc.collect()
+    tracemalloc.start()
+    client = load_client(profile, guilds)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    members = sum(len(guild.members) for guild in client.guilds)
+    return size / (1024 * 1024), members
+
+
+def main() -> None:
+    print(f"{'guilds':>8} {'profile':>8} {'heap MiB':>9} {'KiB/guild':>10} {'members':>8} {'saving':>7}")
+    for guild_count in GUILD_COUNTS:
+        guilds = [guild_payload(index) for index in range(guild_count)]
+        full_mib, full_members = measure(ClientProfile.full, guilds)
+        lean_mib, lean_members = measure(ClientProfile.lean, guilds)
+        for profile, mib, members in ((ClientProfile.full, full_mib, full_members), (ClientProfile.lean, lean_mib, lean_members)):
+            saving = f"{(1 - mib / full_mib) * 100:>6.0f}%" if profile == ClientProfile.lean else ""
+            print(f"{guild_count:>8} {profile.value:>8} {mib:>9.1f} {mib * 1024 / guild_count:>10.1f} {members:>8} {saving:>7}")
+
+
+if __name__ == "__main__":
+    main()
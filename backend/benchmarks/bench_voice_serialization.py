@@ -0,0 +1,104 @@
+"""
+Microbenchmark for voice catalog DTO construction and serialization.
+
+Compares, for catalogs of 1k, 10k and 100k samples:
+    - response_model: what FastAPI 0.115 does with a returned DTO (dump, re-validate
+      against response_model, encode to JSON-able python, json.dumps)
+    - trusted: the same DTOs rendered by TrustedJSONResponse, skipping re-validation
+    - construct: DTOs built with model_construct instead of validated constructors
+
+Run from the backend directory:
+    python -m benchmarks.bench_voice_serialization
+"""
+
+import json
+import time
+from types import SimpleNamespace
+
+from pydantic import TypeAdapter
+
+from app.api.responses import TrustedJSONResponse
+from app.models import ListVoicesResponseDTO, VoiceDetailDTO, VoiceSampleDTO
+from app.services.elevenlabs_client import ElevenLabsAPIClient
+
+SAMPLE_COUNTS = [1_000, 10_000, 100_000]
+SAMPLES_PER_VOICE = 10
+RESPONSE_ADAPTER = TypeAdapter(ListVoicesResponseDTO)
+
+
+def make_raw_voices(sample_count: int) -> list[SimpleNamespace]:
+    """Build SDK-like voice objects holding sample_count samples in total."""
+    voice_count = max(1, sample_count // SAMPLES_PER_VOICE)
+    return [
+        SimpleNamespace(
+            voice_id=f"voice_{v}",
+            name=f"Voice {v}",
+            description="A warm, slightly raspy narrator voice with a calm pace",
+            created_at_unix=1_700_000_000 + v,
+            samples=[
+                SimpleNamespace(sample_id=f"sample_{v}_{s}", file_name=f"sample_{s}.mp3")
+                for s in range(SAMPLES_PER_VOICE)
+            ]
+        )
+        for v in range(voice_count)
+    ]
+
+
+def response_model_path(voices: list[VoiceDetailDTO]) -> bytes:
+    """Serialize like FastAPI does for an endpoint with response_model."""
+    response = ListVoicesResponseDTO(items=voices, version=1)
+    validated = RESPONSE_ADAPTER.validate_python(response.model_dump(by_alias=True))
+    content = RESPONSE_ADAPTER.dump_python(validated, mode="json", by_alias=True)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def trusted_path(voices: list[VoiceDetailDTO]) -> bytes:
+    """Serialize through TrustedJSONResponse as the voices router does."""
+    return TrustedJSONResponse(ListVoicesResponseDTO(items=voices, version=1)).body
+
+
+def construct_voices(raw_voices: list[SimpleNamespace]) -> list[VoiceDetailDTO]:
+    """Build DTOs with model_construct, skipping validation entirely."""
+    return [
+        VoiceDetailDTO.model_construct(
+            id=raw.voice_id,
+            name=raw.name,
+            prompt=raw.description,
+            created_at=raw.created_at_unix,
+            samples=[
+                VoiceSampleDTO.model_construct(id=sample.sample_id, text=sample.file_name, audio_url="")
+                for sample in raw.samples
+            ]
+        )
+        for raw in raw_voices
+    ]
+
+
+def best_of(func, *args, repeat: int = 3) -> float:
+    """Return the best wall-clock time of several runs in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main() -> None:
+    client = ElevenLabsAPIClient(api_key="benchmark")
+    print(f"{'samples':>10} {'map ms':>8} {'construct ms':>13} {'response_model ms':>18} {'trusted ms':>11} {'speedup':>8}")
+    for sample_count in SAMPLE_COUNTS:
+        raw_voices = make_raw_voices(sample_count)
+        voices = [client._map_voice_to_dto(raw) for raw in raw_voices]
+        map_ms = best_of(lambda: [client._map_voice_to_dto(raw) for raw in raw_voices])
+        construct_ms = best_of(construct_voices, raw_voices)
+        response_model_ms = best_of(response_model_path, voices)
+        trusted_ms = best_of(trusted_path, voices)
+        print(
+            f"{sample_count:>10} {map_ms:>8.1f} {construct_ms:>13.1f} {response_model_ms:>18.1f} "
+            f"{trusted_ms:>11.1f} {response_model_ms / trusted_ms:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+VoiceBot Discord worker - Runs the Discord client and voice sessions in their own process.
+
+API processes started with DISCORD_BOT_MODE=worker forward bot operations here
+over the Unix socket at DISCORD_BOT_IPC_PATH, so API load does not delay the
+voice send loop, and API restarts do not drop voice connections.
+
+This process also owns the state the API workers share, so uvicorn can run
+several of them:
+    - the ElevenLabs rate limiter and quota ledger, which also admit the TTS for /play
+    - jobs, so GET /jobs/{id} and its events answer on any worker
+    - the voice catalog, so versions from /voices mean the same on every worker
+
+Run from the backend directory:
+    python bot_worker.py
+"""
+
+import asyncio
+import logging
+import os
+import signal
+from dotenv import load_dotenv
+from app.services.bot_ipc import BotIPCServer, get_ipc_path
+from app.services.discord_bot_service import discord_bot_manager
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    discord_token = os.getenv("DISCORD_BOT_TOKEN")
+    if not discord_token:
+        raise SystemExit("DISCORD_BOT_TOKEN not found in environment variables")
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopped.set)
+
+    await discord_bot_manager.initialize(discord_token)
+    server = BotIPCServer(discord_bot_manager, get_ipc_path())
+    await server.start()
+    logger.info("Discord bot worker started")
+
+    await stopped.wait()
+
+    logger.info("Shutting down Discord bot worker...")
+    await server.close()
+    await discord_bot_manager.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
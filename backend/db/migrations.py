@@ -33,6 +33,15 @@ class Migration:
             )
         """)
         
+        # Create prompt_cache table
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS prompt_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        
         self.db.commit()
     
     def create_indexes(self) -> None:
@@ -53,7 +62,7 @@ class Migration:
     def drop_tables(self) -> None:
         """Drop all tables (for testing or rollback)"""
         
-        tables = ["generation_metrics", "error_logs"]
+        tables = ["generation_metrics", "error_logs", "prompt_cache"]
         
         for table in tables:
             self.db.execute(f"DROP TABLE IF EXISTS {table}")
@@ -11,7 +11,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.voices import router as voices_router
 from app.api.prompt_router import router as prompt_router
 from app.api.discord_bot_router import router as discord_bot_router
-from app.services.discord_bot_service import get_discord_bot_manager
+from app.api.metrics_router import router as metrics_router
+from app.api.jobs_router import router as jobs_router
+from app.services.discord_bot_service import bot_runs_in_worker, get_discord_bot_manager
+from app.services.prompt_service import get_openai_client, close_openai_client
+from app.services.prompt_cache import close_prompt_cache
+from app.services.job_service import shutdown_job_manager
+from app.services.shared_state import use_bot_process_state
 
 # Load environment variables from .env file
 load_dotenv()
@@ -29,9 +35,20 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting VoiceBot API...")
     
-    # Initialize Discord bot if token is provided
+    # Create the shared OpenAI client so prompt endpoints reuse pooled connections
+    try:
+        get_openai_client()
+        logger.info("OpenAI client initialized successfully")
+    except Exception as e:
+        logger.warning(f"OpenAI client not initialized: {str(e)}")
+    
+    # Initialize Discord bot if token is provided, unless a separate bot worker process runs it
     discord_token = os.getenv("DISCORD_BOT_TOKEN")
-    if discord_token:
+    if bot_runs_in_worker():
+        logger.info("Discord bot runs in the bot worker process (python bot_worker.py)")
+        # Limits, jobs and catalog versions then hold across all API workers
+        await use_bot_process_state(get_discord_bot_manager())
+    elif discord_token:
         try:
             discord_manager = get_discord_bot_manager()
             await discord_manager.initialize(discord_token)
@@ -46,12 +63,23 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down VoiceBot API...")
+    try:
+        await shutdown_job_manager()
+    except Exception as e:
+        logger.error(f"Error shutting down background jobs: {str(e)}")
+    
     try:
         discord_manager = get_discord_bot_manager()
         await discord_manager.shutdown()
         logger.info("Discord bot shut down successfully")
     except Exception as e:
         logger.error(f"Error during Discord bot shutdown: {str(e)}")
+    
+    try:
+        await close_openai_client()
+        close_prompt_cache()
+    except Exception as e:
+        logger.error(f"Error closing OpenAI client: {str(e)}")
 
 
 # Create FastAPI application
@@ -77,6 +105,8 @@ app.add_middleware(
 app.include_router(voices_router)
 app.include_router(prompt_router)
 app.include_router(discord_bot_router)
+app.include_router(metrics_router)
+app.include_router(jobs_router)
 
 # Health check endpoint
 @app.get("/health")
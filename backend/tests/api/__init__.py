@@ -0,0 +1 @@
+# Tests api package
@@ -0,0 +1,64 @@
+"""
+Unit tests for the WebSocket control channel.
+"""
+
+from unittest.mock import AsyncMock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.discord_bot_router import router
+from app.services.discord_bot_service import DiscordBotManager
+
+
+class TestControlSocket:
+    """Test cases for the /discord-bot/control WebSocket."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        app = FastAPI()
+        app.include_router(router)
+        self.client = TestClient(app)
+        self.manager = DiscordBotManager()
+
+    def _receive_reply(self, websocket) -> dict:
+        """Receive the next command reply, skipping forwarded bot events."""
+        while True:
+            message = websocket.receive_json()
+            if message["type"] == "reply":
+                return message
+
+    def test_play_is_acknowledged_then_completed(self):
+        """Test that a play command gets an accepted and a completed reply with its ID."""
+        self.manager.play_audio = AsyncMock()
+
+        with patch('app.services.discord_bot_service.get_discord_bot_manager', return_value=self.manager):
+            with self.client.websocket_connect("/discord-bot/control") as websocket:
+                assert websocket.receive_json()["type"] == "snapshot"
+                websocket.send_json({"id": "1", "action": "play", "play": {"voiceId": "v1", "text": "Hi"}})
+
+                assert self._receive_reply(websocket) == {"type": "reply", "id": "1", "status": "accepted", "statusCode": None, "detail": None}
+                assert self._receive_reply(websocket)["status"] == "completed"
+
+        command = self.manager.play_audio.call_args.args[0]
+        assert command.voice_id == "v1"
+        assert command.text == "Hi"
+
+    def test_failures_use_rest_status_codes(self):
+        """Test that failed commands report the status code the REST API would return."""
+        with patch('app.services.discord_bot_service.get_discord_bot_manager', return_value=self.manager):
+            with self.client.websocket_connect("/discord-bot/control") as websocket:
+                websocket.send_json({"id": "1", "action": "skip"})
+                assert self._receive_reply(websocket)["status"] == "accepted"
+                reply = self._receive_reply(websocket)
+                assert reply["status"] == "failed"
+                assert reply["statusCode"] == 503
+
+                websocket.send_json({"id": "2", "action": "volume", "volume": 5})
+                reply = self._receive_reply(websocket)
+                assert reply["id"] == "2"
+                assert reply["statusCode"] == 422
+
+                websocket.send_json({"id": "3", "action": "volume", "volume": 0.5})
+                assert self._receive_reply(websocket)["status"] == "accepted"
+                assert self._receive_reply(websocket)["status"] == "completed"
+
+        assert self.manager._volume == 0.5
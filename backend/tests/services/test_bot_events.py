@@ -0,0 +1,159 @@
+"""
+Unit tests for bot state events.
+"""
+
+import asyncio
+import threading
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+from app.services.bot_events import BotEventBroadcaster
+from app.services.discord_bot_service import DiscordBotManager
+from app.models import BotEventDTO, BotEventType, DiscordBotStatusDTO, PlayCommand
+
+
+def make_event(event_type: BotEventType) -> BotEventDTO:
+    return BotEventDTO(type=event_type, status=DiscordBotStatusDTO(connected=True), created_at=datetime.now(timezone.utc))
+
+
+class TestBotEventBroadcaster:
+    """Test cases for BotEventBroadcaster class."""
+
+    @pytest.mark.asyncio
+    async def test_events_reach_every_subscriber(self):
+        """Test fan-out to all subscribers, starting with the snapshot."""
+        broadcaster = BotEventBroadcaster()
+        first = broadcaster.subscribe(snapshot=lambda: make_event(BotEventType.snapshot))
+        second = broadcaster.subscribe()
+
+        assert (await anext(first)).type == BotEventType.snapshot
+        pending = asyncio.ensure_future(anext(second))
+        await asyncio.sleep(0)
+        broadcaster.publish(make_event(BotEventType.playback_started))
+
+        assert (await anext(first)).type == BotEventType.playback_started
+        assert (await pending).type == BotEventType.playback_started
+
+        await first.aclose()
+        await second.aclose()
+        assert broadcaster.subscriber_count == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_drops_oldest(self):
+        """Test that a full queue keeps the newest events."""
+        broadcaster = BotEventBroadcaster(queue_size=2)
+        subscription = broadcaster.subscribe(snapshot=lambda: make_event(BotEventType.snapshot))
+        await anext(subscription)
+
+        for event_type in (BotEventType.playback_started, BotEventType.playback_finished, BotEventType.queue_changed):
+            broadcaster.publish(make_event(event_type))
+
+        assert (await anext(subscription)).type == BotEventType.playback_finished
+        assert (await anext(subscription)).type == BotEventType.queue_changed
+        await subscription.aclose()
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_when_idle(self):
+        """Test that an idle subscription yields None as heartbeat."""
+        broadcaster = BotEventBroadcaster()
+        subscription = broadcaster.subscribe(heartbeat_seconds=0.01)
+
+        assert await anext(subscription) is None
+        await subscription.aclose()
+
+
+class TestManagerEvents:
+    """Test cases for events published by DiscordBotManager."""
+
+    def setup_method(self):
+        self.manager = DiscordBotManager()
+
+    def _mock_voice_client(self):
+        voice_client = Mock()
+        voice_client.is_connected.return_value = True
+        voice_client.is_playing.return_value = False
+        voice_client.guild.id = 42
+        voice_client.channel.id = 7
+        mock_client = Mock()
+        mock_client.is_ready.return_value = True
+        mock_client.voice_clients = [voice_client]
+        self.manager._client = mock_client
+        return voice_client
+
+    @pytest.mark.asyncio
+    async def test_playback_lifecycle_events(self):
+        """Test queue, started and finished events of a play request."""
+        voice_client = self._mock_voice_client()
+        events = self.manager.stream_events()
+        snapshot = await anext(events)
+        assert snapshot.status.channel_id == "7"
+
+        async def synthesize(command, deadline):
+            return b"audio"
+
+        with patch('app.services.discord_bot_service.synthesize_speech', synthesize), \
+             patch('app.services.discord_bot_service.discord.FFmpegPCMAudio'), \
+             patch('app.services.discord_bot_service.TrackedAudioSource'):
+            await self.manager.play_audio(PlayCommand(voice_id="v1", text="Hello"))
+
+        # The player calls back from its own thread when the audio ends
+        after = voice_client.play.call_args.kwargs["after"]
+        thread = threading.Thread(target=after, args=(None,))
+        thread.start()
+        thread.join()
+
+        received = [await anext(events) for _ in range(4)]
+        assert [event.type for event in received] == [
+            BotEventType.queue_changed,
+            BotEventType.playback_started,
+            BotEventType.queue_changed,
+            BotEventType.playback_finished
+        ]
+        assert [event.queue_depth for event in received] == [1, 1, 0, 0]
+        assert received[1].guild_id == "42"
+        await events.aclose()
+
+    @pytest.mark.asyncio
+    async def test_failed_play_publishes_event(self):
+        """Test that a failed play request is reported with its error."""
+        self._mock_voice_client()
+        events = self.manager.stream_events()
+        await anext(events)
+
+        async def synthesize(command, deadline):
+            raise Exception("TTS generation failed: boom")
+
+        with patch('app.services.discord_bot_service.synthesize_speech', synthesize):
+            with pytest.raises(Exception, match="Failed to play audio"):
+                await self.manager.play_audio(PlayCommand(voice_id="v1", text="Hello"))
+
+        received = [await anext(events) for _ in range(3)]
+        assert received[-1].type == BotEventType.playback_failed
+        assert "boom" in received[-1].detail
+        await events.aclose()
+
+    @pytest.mark.asyncio
+    async def test_voice_state_events(self):
+        """Test that the bot's own voice moves are published, other members' are not."""
+        manager = self.manager
+        with patch('app.services.discord_bot_service.asyncio.create_task', side_effect=lambda coro: coro.close()):
+            client = await manager.initialize("test_token")
+        client._connection.user = Mock(id=99)
+        events = manager.stream_events()
+        await anext(events)
+
+        channel = Mock(id=7)
+        member = Mock(id=99)
+        member.guild.id = 42
+        await client.on_voice_state_update(Mock(id=5), Mock(channel=None), Mock(channel=channel))
+        await client.on_voice_state_update(member, Mock(channel=None), Mock(channel=channel))
+        await client.on_voice_state_update(member, Mock(channel=channel), Mock(channel=None))
+
+        connected = await anext(events)
+        disconnected = await anext(events)
+        assert connected.type == BotEventType.voice_connected
+        assert connected.status.channel_id == "7"
+        assert disconnected.type == BotEventType.voice_disconnected
+        assert disconnected.status.channel_id is None
+        await events.aclose()
+        manager._client = None
@@ -0,0 +1,321 @@
+"""
+Unit tests for the bot IPC command bus.
+"""
+
+import asyncio
+import threading
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock, patch
+from app.services.bot_ipc import BotIPCServer, RemoteDiscordBotManager
+from app.services.deadline import Deadline, DeadlineExceededError, OperationCancelledError
+from app.services.job_service import JobManager
+from app.services.quota_service import QuotaExceededError, QuotaLedger
+from app.services.rate_limiter import Priority, PriorityRateLimiter
+from app.services.shared_state import WORKER_LOST_ERROR, RemoteJobRegistry, RemoteQuotaLedger, RemoteRateLimiter, RemoteVoiceCatalog
+from app.services.voice_catalog import VoiceCatalog
+from app.models import BotConfigResponseDTO, BotEventDTO, BotEventType, DesignVoiceResponseDTO, DiscordBotStatusDTO, JobKind, JobStatus, PlayCommand, VoiceChannelDTO, VoiceDetailDTO
+
+
+class TestBotIPC:
+    """Test cases for BotIPCServer and RemoteDiscordBotManager."""
+
+    async def start(self, tmp_path, manager) -> tuple[BotIPCServer, RemoteDiscordBotManager]:
+        server = BotIPCServer(manager, str(tmp_path / "bot.sock"))
+        await server.start()
+        return server, RemoteDiscordBotManager(server.path)
+
+    async def stop(self, server: BotIPCServer, remote: RemoteDiscordBotManager) -> None:
+        await remote.shutdown()
+        await server.close()
+
+    @pytest.mark.asyncio
+    async def test_calls_return_dtos(self, tmp_path):
+        """Test that results cross the process boundary as the same DTOs."""
+        manager = Mock()
+        manager.get_status = AsyncMock(return_value=DiscordBotStatusDTO(connected=True, channel_id="123"))
+        manager.list_channels = AsyncMock(return_value=[VoiceChannelDTO(id="1", name="Guild - General", guild_id="9")])
+        server, remote = await self.start(tmp_path, manager)
+        try:
+            assert await remote.get_status() == DiscordBotStatusDTO(connected=True, channel_id="123")
+            channels = await remote.list_channels(guild_id="9", page=2, limit=10)
+        finally:
+            await self.stop(server, remote)
+
+        assert channels == [VoiceChannelDTO(id="1", name="Guild - General", guild_id="9")]
+        manager.list_channels.assert_awaited_once_with("9", 2, 10)
+
+    @pytest.mark.asyncio
+    async def test_response_reader_is_kept_until_shutdown(self, tmp_path):
+        """Test that the task reading bot responses stays referenced and ends with the manager."""
+        manager = Mock()
+        manager.get_status = AsyncMock(return_value=DiscordBotStatusDTO(connected=True))
+        server, remote = await self.start(tmp_path, manager)
+        try:
+            await remote.get_status()
+            assert len(remote._tasks) == 1
+        finally:
+            await self.stop(server, remote)
+
+        assert remote._tasks == set()
+
+    @pytest.mark.asyncio
+    async def test_errors_keep_type_and_message(self, tmp_path):
+        """Test that the API sees the bot's errors as if the bot ran in-process."""
+        manager = Mock()
+        manager.play_audio = AsyncMock(side_effect=OperationCancelledError("speech synthesis", "superseded"))
+        manager.skip = AsyncMock(side_effect=Exception("Bot is not connected to a voice channel"))
+        server, remote = await self.start(tmp_path, manager)
+        try:
+            with pytest.raises(OperationCancelledError) as error:
+                await remote.play_audio(PlayCommand(voice_id="v1", text="Hi"), Deadline.after(5))
+            with pytest.raises(Exception, match="not connected"):
+                await remote.skip()
+        finally:
+            await self.stop(server, remote)
+
+        assert error.value.reason == "superseded"
+        command, deadline = manager.play_audio.call_args.args
+        assert command.text == "Hi"
+        assert 0 < deadline.remaining() <= 5
+
+    @pytest.mark.asyncio
+    async def test_cancelled_call_cancels_bot_work(self, tmp_path):
+        """Test that abandoning a call stops the work in the bot process."""
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def play_audio(command, deadline):
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        manager = Mock()
+        manager.play_audio = play_audio
+        server, remote = await self.start(tmp_path, manager)
+        try:
+            call = asyncio.create_task(remote.play_audio(PlayCommand(voice_id="v1", text="Hi")))
+            await started.wait()
+            call.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await call
+            await asyncio.wait_for(cancelled.wait(), 1)
+        finally:
+            await self.stop(server, remote)
+
+    @pytest.mark.asyncio
+    async def test_update_config_reports_progress(self, tmp_path):
+        """Test that progress callbacks and avatar bytes cross the process boundary."""
+        async def update_config(nickname, avatar_bytes, on_progress):
+            on_progress(0.5)
+            on_progress(1.0)
+            return BotConfigResponseDTO(nickname=nickname, avatar_url="", avatar_updated=avatar_bytes == b"\x89PNG")
+
+        manager = Mock()
+        manager.update_config = update_config
+        progress = []
+        server, remote = await self.start(tmp_path, manager)
+        try:
+            result = await remote.update_config("Bot", b"\x89PNG", on_progress=progress.append)
+        finally:
+            await self.stop(server, remote)
+
+        assert result.avatar_updated
+        assert progress == [0.5, 1.0]
+
+    @pytest.mark.asyncio
+    async def test_stream_events(self, tmp_path):
+        """Test that bot events are forwarded to subscribers in the API process."""
+        event = BotEventDTO(type=BotEventType.snapshot, status=DiscordBotStatusDTO(connected=True), created_at=datetime.now(timezone.utc))
+
+        async def stream_events():
+            yield event
+            await asyncio.sleep(10)
+
+        manager = Mock()
+        manager.stream_events = stream_events
+        server, remote = await self.start(tmp_path, manager)
+        try:
+            events = remote.stream_events(heartbeat_seconds=0.05)
+            assert await anext(events) == event
+            assert await anext(events) is None
+            await events.aclose()
+        finally:
+            await self.stop(server, remote)
+
+    @pytest.mark.asyncio
+    async def test_bot_process_down(self, tmp_path):
+        """Test that a missing bot process reads as a bot that is not ready."""
+        remote = RemoteDiscordBotManager(str(tmp_path / "missing.sock"))
+
+        assert await remote.get_status() == DiscordBotStatusDTO(connected=False, channel_id=None)
+        with pytest.raises(Exception, match="not ready"):
+            await remote.connect("123")
+
+
+class TestSharedState:
+    """Test cases for the state API workers share through the bot process."""
+
+    async def start(self, tmp_path, workers: int = 2) -> tuple[BotIPCServer, list[RemoteDiscordBotManager]]:
+        server = BotIPCServer(Mock(), str(tmp_path / "bot.sock"))
+        await server.start()
+        remotes = [RemoteDiscordBotManager(server.path) for _ in range(workers)]
+        for remote in remotes:
+            remote.bind_loop(asyncio.get_running_loop())
+        return server, remotes
+
+    async def stop(self, server: BotIPCServer, remotes: list[RemoteDiscordBotManager]) -> None:
+        for remote in remotes:
+            await remote.shutdown()
+        await server.close()
+
+    @pytest.mark.asyncio
+    async def test_rate_limiter_slots_are_shared(self, tmp_path):
+        """Test that one worker holding the only slot makes another wait, until it disconnects."""
+        limiter = PriorityRateLimiter("elevenlabs", max_concurrency=1, requests_per_second=1000)
+        holding = threading.Event()
+        done = threading.Event()
+
+        def hold(remote_limiter: RemoteRateLimiter) -> None:
+            with remote_limiter.acquire(Priority.background):
+                holding.set()
+                done.wait(5)
+
+        def wait_for_slot(remote_limiter: RemoteRateLimiter, seconds: float) -> None:
+            with remote_limiter.acquire(Priority.realtime, Deadline.after(seconds)):
+                pass
+
+        with patch('app.services.shared_state.get_elevenlabs_rate_limiter', return_value=limiter):
+            server, (first, second) = await self.start(tmp_path)
+            try:
+                holder = asyncio.create_task(asyncio.to_thread(hold, RemoteRateLimiter(first)))
+                await asyncio.to_thread(holding.wait, 5)
+                with pytest.raises(DeadlineExceededError):
+                    await asyncio.to_thread(wait_for_slot, RemoteRateLimiter(second), 0.2)
+
+                # A worker that goes away frees its slot
+                await first.shutdown()
+                await asyncio.to_thread(wait_for_slot, RemoteRateLimiter(second), 2)
+                done.set()
+                await holder
+            finally:
+                done.set()
+                await self.stop(server, [first, second])
+
+        assert limiter._in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_quota_is_admitted_against_one_ledger(self, tmp_path):
+        """Test that spend committed on one worker counts against requests on another."""
+        ledger = QuotaLedger(daily_limit=100, soft_limit_ratio=1.0)
+
+        def spend(remote_ledger: RemoteQuotaLedger) -> None:
+            reservation = remote_ledger.reserve("v1", 50)
+            reservation.record_actual(40)
+            reservation.record_actual(30)
+            remote_ledger.commit(reservation)
+
+        with patch('app.services.shared_state.get_quota_ledger', return_value=ledger):
+            server, (first, second) = await self.start(tmp_path)
+            try:
+                await asyncio.to_thread(spend, RemoteQuotaLedger(first))
+                with pytest.raises(QuotaExceededError):
+                    await asyncio.to_thread(RemoteQuotaLedger(second).reserve, "v2", 40)
+                await asyncio.to_thread(RemoteQuotaLedger(second).reserve, "v2", 20)
+
+                # The worker that reserved disconnects before committing
+                await second.shutdown()
+                await asyncio.sleep(0.05)
+                status = await asyncio.to_thread(RemoteQuotaLedger(first).status)
+            finally:
+                await self.stop(server, [first, second])
+
+        overall = next(usage for usage in status.usages if usage.scope == "overall" and usage.period.value == "daily")
+        assert overall.used == 70
+        assert overall.reserved == 0
+
+    @pytest.mark.asyncio
+    async def test_jobs_are_visible_on_every_worker(self, tmp_path):
+        """Test that a job submitted on one worker can be looked up and followed on another."""
+        registry = JobManager()
+        release = asyncio.Event()
+
+        async def work(job_id: str) -> DesignVoiceResponseDTO:
+            await release.wait()
+            return DesignVoiceResponseDTO(previews=[], text="Sample")
+
+        with patch('app.services.shared_state.get_job_manager', return_value=registry):
+            server, (first, second) = await self.start(tmp_path)
+            running = JobManager(registry=RemoteJobRegistry(first))
+            other = JobManager(registry=RemoteJobRegistry(second))
+            try:
+                job = await running.submit(JobKind.design_voice, work)
+                assert (await other.get(job.id)).kind == JobKind.design_voice
+
+                events = other.subscribe(job.id)
+                assert (await anext(events)).id == job.id
+                release.set()
+                statuses = [event.status async for event in events]
+            finally:
+                await running.shutdown()
+                await other.shutdown()
+                await self.stop(server, [first, second])
+
+        assert statuses[-1] == JobStatus.succeeded
+        assert (await registry.get(job.id)).result.text == "Sample"
+        await registry.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_jobs_of_a_lost_worker_fail(self, tmp_path):
+        """Test that unfinished jobs fail when their worker disconnects, instead of staying pending."""
+        registry = JobManager()
+
+        async def work(job_id: str) -> DesignVoiceResponseDTO:
+            await asyncio.Event().wait()
+
+        with patch('app.services.shared_state.get_job_manager', return_value=registry):
+            server, (worker,) = await self.start(tmp_path, workers=1)
+            running = JobManager(registry=RemoteJobRegistry(worker))
+            try:
+                job = await running.submit(JobKind.design_voice, work)
+                await running.shutdown()
+                await worker.shutdown()
+                await asyncio.sleep(0.05)
+            finally:
+                await self.stop(server, [worker])
+
+        lost = await registry.get(job.id)
+        assert lost.status == JobStatus.failed
+        assert lost.error == WORKER_LOST_ERROR
+        await registry.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_catalog_versions_match_across_workers(self, tmp_path):
+        """Test that a change made through one worker is what the other reports."""
+        catalog = VoiceCatalog(epoch=1000)
+        voice = VoiceDetailDTO(id="v1", name="Narrator", prompt="A calm narrator", created_at=datetime.now(timezone.utc), samples=[])
+
+        with patch('app.services.shared_state.get_voice_catalog', return_value=catalog):
+            server, (first, second) = await self.start(tmp_path)
+            try:
+                version = await asyncio.to_thread(RemoteVoiceCatalog(first).upsert, voice)
+                other_version = await asyncio.to_thread(lambda: RemoteVoiceCatalog(second).version)
+                changes = await asyncio.to_thread(RemoteVoiceCatalog(second).changes_since, 1000)
+            finally:
+                await self.stop(server, [first, second])
+
+        assert version == other_version == catalog.version
+        assert [changed.id for changed in changes.upserted] == ["v1"]
+
+    @pytest.mark.asyncio
+    async def test_threadsafe_calls_refuse_the_event_loop(self, tmp_path):
+        """Test that a blocking call from the event loop fails instead of deadlocking it."""
+        server, (worker,) = await self.start(tmp_path, workers=1)
+        try:
+            with pytest.raises(RuntimeError, match="worker thread"):
+                RemoteQuotaLedger(worker).is_degraded()
+        finally:
+            await self.stop(server, [worker])
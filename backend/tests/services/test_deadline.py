@@ -0,0 +1,147 @@
+"""
+Unit tests for deadline propagation.
+"""
+
+import asyncio
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+from app.services.deadline import Deadline, DeadlineExceededError, OperationCancelledError
+from app.services.rate_limiter import PriorityRateLimiter, Priority
+from app.services.resilience import ResilientCaller, RetryPolicy
+from app.services.elevenlabs_client import ElevenLabsAPIClient
+from app.services.voice_service import synthesize_speech
+from app.services.quota_service import QuotaLedger
+from app.services.audio_cache import AudioCache
+from app.models import TextToSpeechCommand
+
+
+def make_client() -> ElevenLabsAPIClient:
+    with patch('app.services.elevenlabs_client.ElevenLabs'):
+        return ElevenLabsAPIClient(
+            api_key="test-key",
+            rate_limiter=PriorityRateLimiter("test", max_concurrency=1, requests_per_second=1000),
+            resilience=ResilientCaller("test", policy=RetryPolicy(base_delay=0.01))
+        )
+
+
+def stub_speech(client: ElevenLabsAPIClient, chunks, headers: dict | None = None) -> MagicMock:
+    """Make the raw TTS response of the mocked SDK stream the given chunks."""
+    convert = client.client.text_to_speech.with_raw_response.convert
+    convert.return_value.__enter__.return_value = SimpleNamespace(headers=headers or {}, data=chunks)
+    return convert
+
+
+class TestDeadline:
+    """Test cases for Deadline class."""
+
+    @pytest.mark.asyncio
+    async def test_run_cancels_when_budget_runs_out(self):
+        """Test that run cancels the awaitable and raises with the stage name."""
+        cancelled = False
+
+        async def slow():
+            nonlocal cancelled
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+
+        with pytest.raises(DeadlineExceededError, match="speech synthesis"):
+            await Deadline.after(0.02).run(slow(), "speech synthesis")
+
+        assert cancelled
+
+    @pytest.mark.asyncio
+    async def test_run_fails_fast_when_already_expired(self):
+        """Test that an expired deadline does not start the work."""
+        started = False
+
+        async def work():
+            nonlocal started
+            started = True
+
+        with pytest.raises(DeadlineExceededError):
+            await Deadline.after(0).run(work(), "queue")
+
+        assert not started
+
+    def test_rate_limiter_wait_respects_deadline(self):
+        """Test that waiting for a limiter slot stops at the deadline."""
+        limiter = PriorityRateLimiter("test", max_concurrency=1, requests_per_second=1000)
+        with limiter.acquire(Priority.background):
+            started = time.monotonic()
+            with pytest.raises(DeadlineExceededError, match="rate limiter queue"):
+                with limiter.acquire(Priority.realtime, deadline=Deadline.after(0.05)):
+                    pass
+
+        assert time.monotonic() - started < 0.5
+
+
+class TestSpeechDeadline:
+    """Test cases for deadlines in speech synthesis."""
+
+    def test_sdk_timeout_comes_from_deadline(self):
+        """Test that the SDK request timeout is the remaining budget."""
+        client = make_client()
+        convert = stub_speech(client, iter([b"abc"]))
+
+        client.generate_speech("voice_1", "Hello", deadline=Deadline.after(4.2))
+
+        options = convert.call_args.kwargs["request_options"]
+        assert options["timeout_in_seconds"] == 5
+        assert options["max_retries"] == 0
+
+    def test_streaming_read_stops_at_deadline(self):
+        """Test that a slow audio stream is abandoned once the deadline passes."""
+        client = make_client()
+
+        def slow_stream():
+            while True:
+                time.sleep(0.02)
+                yield b"chunk"
+
+        convert = stub_speech(client, slow_stream())
+
+        with pytest.raises(DeadlineExceededError, match="audio download"):
+            client.generate_speech("voice_1", "Hello", deadline=Deadline.after(0.1))
+
+        # The caller's budget is gone, so the request is not retried
+        assert convert.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_synthesize_speech_raises_deadline_error(self):
+        """Test that synthesize_speech gives up at the deadline instead of hanging."""
+        client = MagicMock()
+        client.generate_speech.side_effect = lambda **kwargs: time.sleep(0.5)
+
+        with patch('app.services.voice_service.create_elevenlabs_client', return_value=client), \
+             patch('app.services.voice_service.get_quota_ledger', return_value=QuotaLedger()), \
+             patch('app.services.voice_service.get_audio_cache', return_value=AudioCache()):
+            started = time.monotonic()
+            with pytest.raises(DeadlineExceededError):
+                await synthesize_speech(TextToSpeechCommand(voice_id="voice_1", text="Hello"), Deadline.after(0.05))
+
+        assert time.monotonic() - started < 0.3
+
+    def test_cancel_aborts_streaming_read(self):
+        """Test that cancelling the deadline stops the download and closes the upstream stream."""
+        client = make_client()
+        deadline = Deadline.after(10)
+
+        def stream():
+            yield b"first"
+            deadline.cancel("superseded")
+            while True:
+                yield b"chunk"
+
+        convert = stub_speech(client, stream())
+
+        with pytest.raises(OperationCancelledError, match="superseded"):
+            client.generate_speech("voice_1", "Hello", deadline=deadline)
+
+        # Leaving the raw response context closes the HTTP stream
+        convert.return_value.__exit__.assert_called_once()
+        assert convert.call_count == 1
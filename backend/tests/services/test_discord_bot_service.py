@@ -2,10 +2,13 @@
 Unit tests for Discord Bot Service.
 """
 
+import asyncio
+import discord
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from app.services.discord_bot_service import DiscordBotManager, get_discord_bot_manager, get_status
-from app.models import DiscordBotStatusDTO, VoiceChannelDTO, BotConfigResponseDTO
+from app.services.deadline import Deadline, DeadlineExceededError, OperationCancelledError
+from app.models import DiscordBotStatusDTO, VoiceChannelDTO, BotConfigResponseDTO, PlayCommand
 
 
 class TestDiscordBotManager:
@@ -416,6 +419,134 @@ class TestDiscordBotManager:
         assert result.connected is True
         assert result.channel_id == "123456789"
     
+    def _mock_channel(self, channel_id: int, guild_id: int):
+        channel = Mock(spec=discord.VoiceChannel)
+        channel.id = channel_id
+        channel.name = f"Channel {channel_id}"
+        channel.guild.id = guild_id
+        channel.permissions_for.return_value.connect = True
+        return channel
+
+    def _mock_guild_voice_client(self, channel):
+        voice_client = Mock()
+        voice_client.is_connected.return_value = True
+        voice_client.guild.id = channel.guild.id
+        voice_client.channel = channel
+        voice_client.move_to = AsyncMock()
+        voice_client.disconnect = AsyncMock()
+        return voice_client
+
+    @pytest.mark.asyncio
+    async def test_connect_same_guild_moves_connection(self):
+        """Test that switching channels within a guild reuses the voice connection."""
+        current = self._mock_channel(1, guild_id=7)
+        target = self._mock_channel(2, guild_id=7)
+        voice_client = self._mock_guild_voice_client(current)
+        mock_client = Mock()
+        mock_client.is_ready.return_value = True
+        mock_client.get_channel.return_value = target
+        mock_client.voice_clients = [voice_client]
+        self.manager._client = mock_client
+
+        result = await self.manager.connect("2")
+
+        voice_client.move_to.assert_awaited_once_with(target)
+        voice_client.disconnect.assert_not_called()
+        target.connect.assert_not_called()
+        assert result.channel_id == "2"
+        assert self.manager._active_guild_id == 7
+
+    @pytest.mark.asyncio
+    async def test_connect_same_channel_is_noop(self):
+        """Test that connecting to the current channel keeps the connection as is."""
+        channel = self._mock_channel(1, guild_id=7)
+        voice_client = self._mock_guild_voice_client(channel)
+        mock_client = Mock()
+        mock_client.is_ready.return_value = True
+        mock_client.get_channel.return_value = channel
+        mock_client.voice_clients = [voice_client]
+        self.manager._client = mock_client
+
+        await self.manager.connect("1")
+
+        voice_client.move_to.assert_not_called()
+        channel.connect.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_connect_keeps_warm_connections(self):
+        """Test that other guilds stay connected with warm connections and the new guild becomes active."""
+        other = self._mock_guild_voice_client(self._mock_channel(1, guild_id=7))
+        target = self._mock_channel(2, guild_id=8)
+        new_voice_client = self._mock_guild_voice_client(target)
+        target.connect = AsyncMock(return_value=new_voice_client)
+        mock_client = Mock()
+        mock_client.is_ready.return_value = True
+        mock_client.get_channel.return_value = target
+        mock_client.voice_clients = [other]
+        self.manager._client = mock_client
+
+        with patch('app.services.discord_bot_service.WARM_VOICE_CONNECTIONS', True):
+            await self.manager.connect("2")
+        mock_client.voice_clients = [other, new_voice_client]
+
+        other.disconnect.assert_not_called()
+        assert (await self.manager.get_status()).channel_id == "2"
+
+    @pytest.mark.asyncio
+    async def test_connect_shard_down(self):
+        """Test that connecting fails fast when the guild's shard is disconnected."""
+        shard = Mock()
+        shard.is_closed.return_value = True
+        mock_client = Mock(spec=discord.AutoShardedClient)
+        mock_client.is_ready.return_value = True
+        mock_client.get_shard.return_value = shard
+        mock_channel = Mock(spec=discord.VoiceChannel)
+        mock_channel.guild.shard_id = 3
+        mock_channel.permissions_for.return_value.connect = True
+        mock_client.get_channel.return_value = mock_channel
+        self.manager._client = mock_client
+
+        with pytest.raises(Exception, match="shard 3 is not connected"):
+            await self.manager.connect("123")
+
+        mock_channel.connect.assert_not_called()
+        mock_client.get_shard.assert_called_once_with(3)
+
+    @pytest.mark.asyncio
+    async def test_get_shards_sharded(self):
+        """Test that every shard is reported with its latency and guild count."""
+        shards = {}
+        for shard_id, closed, latency in ((1, True, float("inf")), (0, False, 0.0421)):
+            shard = Mock(shard_count=2, latency=latency)
+            shard.is_closed.return_value = closed
+            shards[shard_id] = shard
+        mock_client = Mock(spec=discord.AutoShardedClient)
+        mock_client.shards = shards
+        mock_client.shard_count = 2
+        mock_client.guilds = [Mock(shard_id=0), Mock(shard_id=0), Mock(shard_id=1)]
+        self.manager._client = mock_client
+
+        result = await self.manager.get_shards()
+
+        assert [shard.id for shard in result] == [0, 1]
+        assert result[0].connected and result[0].latency_ms == 42.1 and result[0].guild_count == 2
+        assert not result[1].connected and result[1].latency_ms is None and result[1].guild_count == 1
+
+    @pytest.mark.asyncio
+    async def test_get_shards_unsharded(self):
+        """Test that an unsharded client is reported as shard 0 of 1."""
+        mock_client = Mock()
+        mock_client.is_ready.return_value = True
+        mock_client.is_closed.return_value = False
+        mock_client.latency = 0.05
+        mock_client.guilds = [Mock(shard_id=0)]
+        self.manager._client = mock_client
+
+        result = await self.manager.get_shards()
+
+        assert len(result) == 1
+        assert result[0].shard_count == 1 and result[0].latency_ms == 50.0
+
     @pytest.mark.asyncio
     async def test_connect_invalid_channel_id(self):
         """Test connect with invalid channel ID."""
@@ -650,6 +781,412 @@ class TestDiscordBotManager:
         with pytest.raises(Exception, match="Rate limited"):
             await self.manager.update_config("TestBot", avatar_bytes)
 
+    def _mock_config_client(self, guild_count: int, nick: str | None = None):
+        mock_client = Mock()
+        mock_client.is_ready.return_value = True
+        mock_client.user.edit = AsyncMock()
+        mock_client.user.avatar = None
+        mock_client.guilds = []
+        for i in range(guild_count):
+            guild = Mock()
+            guild.name = f"Server {i}"
+            guild.me.nick = nick
+            guild.me.guild_permissions.change_nickname = True
+            guild.me.edit = AsyncMock()
+            mock_client.guilds.append(guild)
+        self.manager._client = mock_client
+        return mock_client
+
+    @pytest.mark.asyncio
+    async def test_update_config_skips_matching_nicknames(self):
+        """Test that guilds already using the nickname are not edited."""
+        mock_client = self._mock_config_client(3, nick="TestBot")
+        mock_client.guilds[0].me.nick = "OldName"
+
+        result = await self.manager.update_config("TestBot")
+
+        mock_client.guilds[0].me.edit.assert_called_once_with(nick="TestBot")
+        mock_client.guilds[1].me.edit.assert_not_called()
+        assert (result.updated_guilds, result.skipped_guilds, result.failed_guilds) == (1, 2, 0)
+
+    @pytest.mark.asyncio
+    async def test_update_config_skips_unchanged_avatar(self):
+        """Test that the same avatar bytes are uploaded only once."""
+        mock_client = self._mock_config_client(0)
+
+        first = await self.manager.update_config("TestBot", b"image")
+        second = await self.manager.update_config("TestBot", b"image")
+        third = await self.manager.update_config("TestBot", b"other image")
+
+        assert mock_client.user.edit.call_count == 2
+        assert (first.avatar_updated, second.avatar_updated, third.avatar_updated) == (True, False, True)
+
+    @pytest.mark.asyncio
+    async def test_update_config_edits_nicknames_concurrently(self):
+        """Test that nickname edits overlap but stay under the concurrency limit."""
+        mock_client = self._mock_config_client(12)
+        in_flight = 0
+        max_in_flight = 0
+
+        async def edit(nick):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        for guild in mock_client.guilds:
+            guild.me.edit = AsyncMock(side_effect=edit)
+        progress = []
+
+        with patch('app.services.discord_bot_service.NICKNAME_UPDATE_CONCURRENCY', 4):
+            result = await self.manager.update_config("TestBot", on_progress=progress.append)
+
+        assert result.updated_guilds == 12
+        assert max_in_flight == 4
+        assert progress[-1] == 1.0
+        assert progress == sorted(progress)
+
+    @pytest.mark.asyncio
+    async def test_submit_update_config_job_reports_result(self):
+        """Test that the background job runs the update and ends with full progress."""
+        from app.services.job_service import JobManager
+        from app.models import JobStatus
+
+        self._mock_config_client(2)
+        jobs = JobManager()
+
+        with patch('app.services.discord_bot_service.get_job_manager', return_value=jobs):
+            job = await self.manager.submit_update_config_job("TestBot")
+            updates = [update async for update in jobs.subscribe(job.id)]
+
+        assert updates[-1].status == JobStatus.succeeded
+        assert updates[-1].progress == 1.0
+        assert updates[-1].result.updated_guilds == 2
+        await jobs.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_submit_update_config_job_validates_first(self):
+        """Test that an invalid nickname is rejected before a job is queued."""
+        self._mock_config_client(1)
+
+        with pytest.raises(Exception, match="between 1 and 32"):
+            await self.manager.submit_update_config_job("x" * 33)
+
+    def _mock_voice_client(self):
+        voice_client = Mock()
+        voice_client.is_connected.return_value = True
+        voice_client.is_playing.return_value = False
+        voice_client.guild.id = 42
+        voice_client.channel.name = "General"
+
+        mock_client = Mock()
+        mock_client.is_ready.return_value = True
+        mock_client.voice_clients = [voice_client]
+        self.manager._client = mock_client
+        return voice_client
+
+    @pytest.mark.asyncio
+    async def test_play_audio_supersedes_in_flight_synthesis(self):
+        """Test that a newer play request cancels the older request's synthesis."""
+        voice_client = self._mock_voice_client()
+        started = asyncio.Event()
+        deadlines = []
+
+        async def synthesize(command, deadline):
+            deadlines.append(deadline)
+            if command.text == "first":
+                started.set()
+                await asyncio.sleep(10)
+            return b"audio"
+
+        with patch('app.services.discord_bot_service.synthesize_speech', synthesize), \
+             patch('app.services.discord_bot_service.discord.FFmpegPCMAudio'), \
+             patch('app.services.discord_bot_service.TrackedAudioSource'):
+            first = asyncio.create_task(self.manager.play_audio(PlayCommand(voice_id="v1", text="first")))
+            await started.wait()
+            await self.manager.play_audio(PlayCommand(voice_id="v1", text="second"))
+
+            with pytest.raises(OperationCancelledError, match="superseded"):
+                await first
+
+        assert deadlines[0].cancel_reason == "superseded"
+        voice_client.play.assert_called_once()
+        assert self.manager._synthesis == {}
+
+    @pytest.mark.asyncio
+    async def test_play_audio_cancelled_requester_cancels_synthesis(self):
+        """Test that abandoning the play request stops its synthesis and upstream read."""
+        self._mock_voice_client()
+        started = asyncio.Event()
+        synthesis_cancelled = False
+        deadlines = []
+
+        async def synthesize(command, deadline):
+            nonlocal synthesis_cancelled
+            deadlines.append(deadline)
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                synthesis_cancelled = True
+                raise
+
+        with patch('app.services.discord_bot_service.synthesize_speech', synthesize):
+            request = asyncio.create_task(self.manager.play_audio(PlayCommand(voice_id="v1", text="hello")))
+            await started.wait()
+            request.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await request
+            await asyncio.sleep(0)
+
+        assert synthesis_cancelled
+        assert deadlines[0].cancel_reason == "requester disconnected"
+
+    @pytest.mark.asyncio
+    async def test_disconnect_cancels_in_flight_synthesis(self):
+        """Test that leaving the voice channel cancels audio still being generated."""
+        voice_client = self._mock_voice_client()
+        voice_client.disconnect = AsyncMock()
+        started = asyncio.Event()
+
+        async def synthesize(command, deadline):
+            started.set()
+            await asyncio.sleep(10)
+
+        with patch('app.services.discord_bot_service.synthesize_speech', synthesize):
+            request = asyncio.create_task(self.manager.play_audio(PlayCommand(voice_id="v1", text="hello")))
+            await started.wait()
+            await self.manager.disconnect()
+
+            with pytest.raises(OperationCancelledError, match="voice disconnected"):
+                await request
+
+    @pytest.mark.asyncio
+    async def test_skip_stops_current_audio_only(self):
+        """Test that skip stops playback but leaves audio being synthesized queued."""
+        voice_client = self._mock_voice_client()
+        voice_client.is_playing.return_value = True
+        deadline = Deadline.after(10)
+        self.manager._synthesis[42] = (Mock(), deadline)
+
+        assert await self.manager.skip() is True
+
+        voice_client.stop.assert_called_once()
+        assert not deadline.cancelled
+        assert 42 in self.manager._synthesis
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_in_flight_synthesis(self):
+        """Test that stop cancels pending synthesis as well as the current audio."""
+        voice_client = self._mock_voice_client()
+        voice_client.is_paused.return_value = False
+        started = asyncio.Event()
+
+        async def synthesize(command, deadline):
+            started.set()
+            await asyncio.sleep(10)
+
+        with patch('app.services.discord_bot_service.synthesize_speech', synthesize):
+            request = asyncio.create_task(self.manager.play_audio(PlayCommand(voice_id="v1", text="hello")))
+            await started.wait()
+            assert await self.manager.stop() is True
+
+            with pytest.raises(OperationCancelledError, match="stopped"):
+                await request
+
+        voice_client.stop.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_skip_not_connected(self):
+        """Test that skip fails when the bot is not in a voice channel."""
+        mock_client = Mock()
+        mock_client.is_ready.return_value = True
+        mock_client.voice_clients = []
+        self.manager._client = mock_client
+
+        with pytest.raises(Exception, match="not connected"):
+            await self.manager.skip()
+
+    @pytest.mark.asyncio
+    async def test_set_volume_applies_to_current_audio(self):
+        """Test that a new volume changes the playing source and later sources."""
+        voice_client = self._mock_voice_client()
+        voice_client.source = Mock(spec=discord.PCMVolumeTransformer)
+
+        assert await self.manager.set_volume(0.5) == 0.5
+
+        assert voice_client.source.volume == 0.5
+        assert self.manager._volume == 0.5
+        with pytest.raises(ValueError, match="Volume"):
+            await self.manager.set_volume(3.0)
+
+    @pytest.mark.asyncio
+    async def test_dropped_playback_resumes_after_reconnect(self, tmp_path):
+        """Test that audio cut off by a dropped connection continues where it stopped."""
+        audio_file = tmp_path / "audio.mp3"
+        audio_file.write_bytes(b"audio")
+        self.manager._supervisors[42] = Mock()
+        source = Mock(finished=False, stopped=False, position=12.5)
+
+        self.manager._playback_ended(42, str(audio_file), source, None)
+
+        assert self.manager._interrupted[42] == (str(audio_file), 12.5, None)
+        assert audio_file.exists()
+
+        voice_client = self._mock_voice_client()
+        ffmpeg_source = Mock(spec=discord.AudioSource)
+        ffmpeg_source.is_opus.return_value = False
+        with patch('app.services.discord_bot_service.discord.FFmpegPCMAudio', return_value=ffmpeg_source) as ffmpeg:
+            await self.manager._resume_playback(voice_client)
+
+        ffmpeg.assert_called_once_with(str(audio_file), before_options="-ss 12.50")
+        resumed = voice_client.play.call_args.args[0]
+        assert resumed.position == 12.5
+        assert self.manager._interrupted == {}
+
+    @pytest.mark.asyncio
+    async def test_stopped_playback_is_not_resumed(self, tmp_path):
+        """Test that audio stopped on purpose is cleaned up rather than resumed."""
+        audio_file = tmp_path / "audio.mp3"
+        audio_file.write_bytes(b"audio")
+        self.manager._supervisors[42] = Mock()
+        source = Mock(finished=False, stopped=True, position=3.0)
+
+        self.manager._playback_ended(42, str(audio_file), source, None)
+
+        assert self.manager._interrupted == {}
+        assert not audio_file.exists()
+
+    @pytest.mark.asyncio
+    async def test_play_audio_while_reconnecting_waits_for_session(self):
+        """Test that audio requested during a reconnect plays once the session is back."""
+        mock_client = Mock()
+        mock_client.is_ready.return_value = True
+        mock_client.voice_clients = []
+        self.manager._client = mock_client
+        self.manager._active_guild_id = 42
+        self.manager._supervisors[42] = Mock(reconnecting=True)
+
+        with patch('app.services.discord_bot_service.synthesize_speech', AsyncMock(return_value=b"audio")):
+            request = asyncio.create_task(self.manager.play_audio(PlayCommand(voice_id="v1", text="hello")))
+            while 42 not in self.manager._interrupted:
+                await asyncio.sleep(0)
+            assert not request.done()
+
+            voice_client = self._mock_voice_client()
+            with patch.object(self.manager, '_create_audio_source'):
+                await self.manager._resume_playback(voice_client)
+            await request
+
+        voice_client.play.assert_called_once()
+        assert self.manager._interrupted == {}
+
+    @pytest.mark.asyncio
+    async def test_play_audio_while_reconnecting_respects_deadline(self):
+        """Test that audio parked for a reconnect is dropped when the request times out."""
+        mock_client = Mock()
+        mock_client.is_ready.return_value = True
+        mock_client.voice_clients = []
+        self.manager._client = mock_client
+        self.manager._active_guild_id = 42
+        self.manager._supervisors[42] = Mock(reconnecting=True)
+
+        with patch('app.services.discord_bot_service.synthesize_speech', AsyncMock(return_value=b"audio")):
+            with pytest.raises(DeadlineExceededError):
+                await self.manager.play_audio(PlayCommand(voice_id="v1", text="hello"), Deadline.after(0.05))
+
+        assert self.manager._interrupted == {}
+
+    @pytest.mark.asyncio
+    async def test_play_audio_after_supervision_gave_up(self):
+        """Test that a session the supervisor could not restore no longer accepts audio."""
+        mock_client = Mock()
+        mock_client.is_ready.return_value = True
+        mock_client.voice_clients = []
+        self.manager._client = mock_client
+        self.manager._active_guild_id = 42
+        self.manager._supervisors[42] = Mock(reconnecting=False)
+
+        self.manager._supervision_ended(42)
+
+        assert self.manager._supervisors == {}
+        assert self.manager._active_guild_id is None
+        with patch('app.services.discord_bot_service.synthesize_speech', AsyncMock(return_value=b"audio")):
+            with pytest.raises(Exception, match="not connected"):
+                await self.manager.play_audio(PlayCommand(voice_id="v1", text="hello"))
+        assert self.manager._interrupted == {}
+
+    @pytest.mark.asyncio
+    async def test_play_audio_connects_on_demand(self):
+        """Test that a play request with a channel connects to it while speech is synthesized."""
+        voice_client = self._mock_voice_client()
+        channel = Mock(spec=discord.VoiceChannel)
+        channel.guild.id = 42
+        self.manager._client.get_channel.return_value = channel
+        self.manager.connect = AsyncMock()
+
+        with patch('app.services.discord_bot_service.synthesize_speech', AsyncMock(return_value=b"audio")), \
+             patch('app.services.discord_bot_service.discord.FFmpegPCMAudio'), \
+             patch('app.services.discord_bot_service.TrackedAudioSource'):
+            await self.manager.play_audio(PlayCommand(voice_id="v1", text="hello", channel_id="7"))
+
+        self.manager.connect.assert_awaited_once_with("7")
+        voice_client.play.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_play_audio_connect_failure_cancels_synthesis(self):
+        """Test that speech is not synthesized for a channel the bot cannot join."""
+        self._mock_voice_client()
+        channel = Mock(spec=discord.VoiceChannel)
+        channel.guild.id = 42
+        self.manager._client.get_channel.return_value = channel
+        self.manager.connect = AsyncMock(side_effect=Exception("Bot does not have permission to connect"))
+        synthesis_cancelled = False
+
+        async def synthesize(command, deadline):
+            nonlocal synthesis_cancelled
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                synthesis_cancelled = True
+                raise
+
+        with patch('app.services.discord_bot_service.synthesize_speech', synthesize):
+            with pytest.raises(Exception, match="permission"):
+                await self.manager.play_audio(PlayCommand(voice_id="v1", text="hello", channel_id="7"))
+            await asyncio.sleep(0)
+
+        assert synthesis_cancelled
+
+    @pytest.mark.asyncio
+    async def test_connect_restarts_idle_timeout(self):
+        """Test that connecting to an already supervised session postpones its idle release."""
+        supervisor = Mock()
+        self.manager._supervisors[42] = supervisor
+
+        self.manager._supervise(42, 7)
+
+        supervisor.touch.assert_called_once()
+        supervisor.start.assert_called_once()
+        assert supervisor.channel_id == 7
+
+    @pytest.mark.asyncio
+    async def test_release_idle_session_disconnects(self):
+        """Test that an idle session is left and no longer supervised."""
+        voice_client = self._mock_voice_client()
+        voice_client.disconnect = AsyncMock()
+        supervisor = Mock()
+        self.manager._supervisors[42] = supervisor
+        self.manager._active_guild_id = 42
+
+        await self.manager._release_idle_session(42, "empty")
+
+        voice_client.disconnect.assert_awaited_once()
+        supervisor.stop.assert_called_once()
+        assert self.manager._supervisors == {}
+        assert self.manager._active_guild_id is None
+
 
 class TestServiceFunctions:
     """Test cases for service-level functions."""
@@ -658,6 +1195,17 @@ class TestServiceFunctions:
         """Test get_discord_bot_manager returns manager instance."""
         manager = get_discord_bot_manager()
         assert isinstance(manager, DiscordBotManager)
+
+    def test_get_discord_bot_manager_worker_mode(self):
+        """Test that API processes forward to the bot worker in worker mode."""
+        from app.services.bot_ipc import RemoteDiscordBotManager
+
+        with patch.dict('os.environ', {"DISCORD_BOT_MODE": "worker", "DISCORD_BOT_IPC_PATH": "/tmp/test-bot.sock"}), \
+             patch('app.services.discord_bot_service._remote_manager', None):
+            manager = get_discord_bot_manager()
+
+        assert isinstance(manager, RemoteDiscordBotManager)
+        assert manager.path == "/tmp/test-bot.sock"
     
     @pytest.mark.asyncio
     @patch('app.services.discord_bot_service.get_discord_bot_manager')
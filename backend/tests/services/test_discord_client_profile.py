@@ -0,0 +1,87 @@
+"""
+Unit tests for Discord client profiles.
+"""
+
+import discord
+import pytest
+from unittest.mock import patch
+from app.services.discord_client_profile import ClientProfile, client_options, create_client, get_client_profile, parse_shard_ids, shard_options
+
+
+class TestClientProfile:
+    """Test cases for client_options and get_client_profile."""
+
+    def test_lean_profile_subscribes_only_to_guild_and_voice_events(self):
+        """Test that the lean profile drops message and member caches."""
+        options = client_options(ClientProfile.lean)
+
+        intents = options["intents"]
+        assert intents.guilds and intents.voice_states
+        assert not intents.guild_messages
+        assert not intents.members
+        assert not intents.emojis_and_stickers
+        assert options["max_messages"] is None
+        assert options["chunk_guilds_at_startup"] is False
+        assert options["member_cache_flags"].voice
+        assert not options["member_cache_flags"].joined
+
+    def test_lean_profile_creates_client(self):
+        """Test that discord.py accepts the lean options."""
+        client = discord.Client(**client_options(ClientProfile.lean))
+
+        assert client._connection._messages is None
+
+    def test_full_profile_keeps_defaults(self):
+        """Test that the full profile keeps discord.py's default intents."""
+        intents = client_options(ClientProfile.full)["intents"]
+
+        assert intents.guild_messages
+        assert intents.voice_states
+
+    def test_profile_from_environment(self):
+        """Test that DISCORD_CLIENT_PROFILE selects the profile, lean by default."""
+        with patch.dict('os.environ', {}, clear=True):
+            assert get_client_profile() == ClientProfile.lean
+        with patch.dict('os.environ', {"DISCORD_CLIENT_PROFILE": "full"}):
+            assert get_client_profile() == ClientProfile.full
+        with patch.dict('os.environ', {"DISCORD_CLIENT_PROFILE": "tiny"}):
+            with pytest.raises(ValueError):
+                get_client_profile()
+
+
+class TestSharding:
+    """Test cases for shard configuration."""
+
+    def test_parse_shard_ids(self):
+        """Test that shard lists accept single IDs and inclusive ranges."""
+        assert parse_shard_ids("0-3,8") == [0, 1, 2, 3, 8]
+        assert parse_shard_ids(" 5, 2 ") == [2, 5]
+        with pytest.raises(ValueError):
+            parse_shard_ids("3-1")
+
+    def test_shard_options_from_environment(self):
+        """Test that sharding is off unless DISCORD_SHARD_COUNT is set."""
+        with patch.dict('os.environ', {}, clear=True):
+            assert shard_options() is None
+        with patch.dict('os.environ', {"DISCORD_SHARD_COUNT": "auto"}, clear=True):
+            assert shard_options() == {}
+        with patch.dict('os.environ', {"DISCORD_SHARD_COUNT": "8", "DISCORD_SHARD_IDS": "0-3"}, clear=True):
+            assert shard_options() == {"shard_count": 8, "shard_ids": [0, 1, 2, 3]}
+
+    def test_shard_ids_need_numeric_count(self):
+        """Test that shard ranges outside the shard count are rejected."""
+        with patch.dict('os.environ', {"DISCORD_SHARD_COUNT": "auto", "DISCORD_SHARD_IDS": "0"}, clear=True):
+            with pytest.raises(ValueError):
+                shard_options()
+        with patch.dict('os.environ', {"DISCORD_SHARD_COUNT": "4", "DISCORD_SHARD_IDS": "2-4"}, clear=True):
+            with pytest.raises(ValueError):
+                shard_options()
+
+    def test_create_client_sharded(self):
+        """Test that a shard count creates an AutoShardedClient."""
+        with patch.dict('os.environ', {"DISCORD_SHARD_COUNT": "4", "DISCORD_SHARD_IDS": "0,1"}, clear=True):
+            client = create_client()
+
+        assert isinstance(client, discord.AutoShardedClient)
+        assert client.shard_count == 4
+        assert client.shard_ids == [0, 1]
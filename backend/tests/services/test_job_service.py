@@ -0,0 +1,106 @@
+"""
+Unit tests for Job Service.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+from app.services.job_service import JobManager
+from app.models import JobKind, JobStatus, DesignVoiceResponseDTO
+
+
+def design_result() -> DesignVoiceResponseDTO:
+    return DesignVoiceResponseDTO(previews=[], text="Sample")
+
+
+class TestJobManager:
+    """Test cases for JobManager class."""
+
+    @pytest.mark.asyncio
+    async def test_submit_returns_pending_and_completes(self):
+        """Test that submit returns immediately and the job finishes in the background."""
+        manager = JobManager()
+
+        async def work(job_id: str) -> DesignVoiceResponseDTO:
+            return await manager.run_in_worker(design_result)
+
+        job = await manager.submit(JobKind.design_voice, work)
+        assert job.status == JobStatus.pending
+
+        events = [event async for event in manager.subscribe(job.id)]
+
+        assert events[-1].status == JobStatus.succeeded
+        assert (await manager.get(job.id)).result.text == "Sample"
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_failed_job_records_error(self):
+        """Test that exceptions mark the job as failed."""
+        manager = JobManager()
+
+        async def work(job_id: str):
+            raise ValueError("ElevenLabs API rate limit exceeded")
+
+        job = await manager.submit(JobKind.create_voice, work)
+        events = [event async for event in manager.subscribe(job.id)]
+
+        assert events[-1].status == JobStatus.failed
+        assert "rate limit" in events[-1].error
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_is_bounded(self):
+        """Test that no more than max_workers jobs run at once."""
+        manager = JobManager(max_workers=2)
+        running = 0
+        peak = 0
+
+        async def work(job_id: str) -> DesignVoiceResponseDTO:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return design_result()
+
+        jobs = [await manager.submit(JobKind.design_voice, work) for _ in range(5)]
+        for job in jobs:
+            async for _ in manager.subscribe(job.id):
+                pass
+
+        assert peak == 2
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        """Test that submit fails fast once max_pending jobs are waiting."""
+        manager = JobManager(max_workers=1, max_pending=1)
+        release = asyncio.Event()
+
+        async def work(job_id: str) -> DesignVoiceResponseDTO:
+            await release.wait()
+            return design_result()
+
+        await manager.submit(JobKind.design_voice, work)
+        with pytest.raises(ValueError, match="queue is full"):
+            await manager.submit(JobKind.design_voice, work)
+
+        release.set()
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_finished_jobs_expire(self):
+        """Test that finished jobs are dropped after the TTL."""
+        manager = JobManager(ttl_seconds=10)
+
+        async def work(job_id: str) -> DesignVoiceResponseDTO:
+            return design_result()
+
+        with patch('app.services.job_service.time.monotonic', return_value=100.0):
+            job = await manager.submit(JobKind.design_voice, work)
+            async for _ in manager.subscribe(job.id):
+                pass
+
+        with patch('app.services.job_service.time.monotonic', return_value=111.0):
+            assert (await manager.get(job.id)) is None
+        await manager.shutdown()
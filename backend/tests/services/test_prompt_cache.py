@@ -0,0 +1,81 @@
+"""
+Unit tests for Prompt Cache.
+"""
+
+import sqlite3
+from unittest.mock import patch
+from app.services.prompt_cache import PromptCache
+
+
+class TestPromptCache:
+    """Test cases for PromptCache class."""
+
+    def test_key_depends_on_every_component(self):
+        """Test that operation, instruction, model and text all change the key."""
+        cache = PromptCache()
+        base = cache.make_key("translate", "instruction", "model", "text")
+
+        assert base == cache.make_key("translate", "instruction", "model", "text")
+        assert base != cache.make_key("improve", "instruction", "model", "text")
+        assert base != cache.make_key("translate", "edited instruction", "model", "text")
+        assert base != cache.make_key("translate", "instruction", "other-model", "text")
+        assert base != cache.make_key("translate", "instruction", "model", "other text")
+
+    def test_evicts_least_recently_used(self):
+        """Test that the cache stays within max_entries."""
+        cache = PromptCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+
+        assert cache.get("a") == "1"
+        assert cache.get("b") is None
+        assert cache.get("c") == "3"
+
+    def test_entries_expire(self):
+        """Test that entries older than the TTL are not returned."""
+        cache = PromptCache(ttl_seconds=10)
+        with patch('app.services.prompt_cache.time.time', return_value=1000.0):
+            cache.set("a", "1")
+        with patch('app.services.prompt_cache.time.time', return_value=1011.0):
+            assert cache.get("a") is None
+
+    def test_sqlite_persistence(self, tmp_path):
+        """Test that entries survive a new cache instance on the same database."""
+        db_path = str(tmp_path / "cache.db")
+        cache = PromptCache(db_path=db_path)
+        cache.set("a", "persisted")
+        cache.close()
+
+        reopened = PromptCache(db_path=db_path)
+        assert reopened.get("a") == "persisted"
+        reopened.close()
+
+    def test_database_errors_are_misses(self, tmp_path):
+        """Test that a locked or broken database never fails a lookup."""
+        cache = PromptCache(ttl_seconds=10, db_path=str(tmp_path / "cache.db"))
+        with patch('app.services.prompt_cache.time.time', return_value=1000.0):
+            cache.set("a", "1")
+
+        with patch.object(cache._db, 'execute', side_effect=sqlite3.OperationalError("database is locked")):
+            assert cache.get("b") is None
+            with patch('app.services.prompt_cache.time.time', return_value=1011.0):
+                assert cache.get("a") is None
+            cache.set("c", "3")
+            cache.clear()
+        cache.close()
+
+    def test_persisted_entries_are_pruned(self, tmp_path):
+        """Test that expired and surplus rows are removed from the database."""
+        cache = PromptCache(max_entries=2, ttl_seconds=10, db_path=str(tmp_path / "cache.db"))
+        with patch('app.services.prompt_cache.time.time', return_value=1000.0):
+            cache.set("expired", "0")
+        for offset, key in enumerate(["a", "b", "c"]):
+            with patch('app.services.prompt_cache.time.time', return_value=2000.0 + offset):
+                cache._next_prune = 0.0
+                cache.set(key, key)
+
+        rows = cache._db.fetch_all("SELECT key FROM prompt_cache ORDER BY key")
+        assert [row["key"] for row in rows] == ["b", "c"]
+        cache.close()
@@ -0,0 +1,145 @@
+"""
+Unit tests for Prompt Service.
+"""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock, AsyncMock, patch
+from app.services import prompt_service
+from app.services.prompt_cache import PromptCache
+from app.services.metrics import MetricsRegistry
+from app.models import PromptImprovementCommand, TranslateVoiceDescriptionCommand, GenerateSampleTextCommand
+
+
+def make_usage(prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=cached_tokens)
+    )
+
+
+def make_completion(content: str, usage: SimpleNamespace | None = None) -> SimpleNamespace:
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage)
+
+
+def make_chunk(content: str | None) -> SimpleNamespace:
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))], usage=None)
+
+
+def make_usage_chunk(usage: SimpleNamespace) -> SimpleNamespace:
+    return SimpleNamespace(choices=[], usage=usage)
+
+
+async def async_iter(items):
+    for item in items:
+        yield item
+
+
+class TestPromptService:
+    """Test cases for prompt service functions."""
+
+    @pytest.fixture(autouse=True)
+    def isolated_cache(self):
+        """Give every test an empty prompt cache."""
+        self.cache = PromptCache()
+        self.metrics = MetricsRegistry()
+        with patch('app.services.prompt_service.get_prompt_cache', return_value=self.cache), \
+             patch('app.services.prompt_service.get_metrics_registry', return_value=self.metrics):
+            yield
+
+    @pytest.mark.asyncio
+    @patch('app.services.prompt_service.get_openai_client')
+    async def test_improve_prompt_success(self, mock_get_client):
+        """Test that the shared client is awaited and the response is stripped."""
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(return_value=make_completion("  Better prompt \n"))
+        mock_get_client.return_value = mock_client
+
+        result = await prompt_service.improve_prompt(PromptImprovementCommand(prompt="A voice"))
+
+        assert result == "Better prompt"
+        kwargs = mock_client.chat.completions.create.call_args.kwargs
+        assert kwargs["model"] == prompt_service.OPENAI_MODEL
+        assert kwargs["messages"][1]["content"].endswith("A voice")
+
+    @pytest.mark.asyncio
+    @patch('app.services.prompt_service.log_error')
+    @patch('app.services.prompt_service.get_openai_client')
+    async def test_improve_prompt_api_failure(self, mock_get_client, mock_log_error):
+        """Test that OpenAI failures are logged and mapped to External API failure."""
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=RuntimeError("boom"))
+        mock_get_client.return_value = mock_client
+
+        with pytest.raises(Exception, match="External API failure"):
+            await prompt_service.improve_prompt(PromptImprovementCommand(prompt="A voice"))
+
+        mock_log_error.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch('app.services.prompt_service.get_openai_client')
+    async def test_stream_translate_yields_deltas(self, mock_get_client):
+        """Test that streaming yields only non-empty content deltas."""
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(
+            return_value=async_iter([make_chunk("Warm"), make_chunk(None), make_chunk(" voice")])
+        )
+        mock_get_client.return_value = mock_client
+
+        cmd = TranslateVoiceDescriptionCommand(voice_description="Ciepły głos")
+        deltas = [delta async for delta in prompt_service.stream_translate_voice_description(cmd)]
+
+        assert deltas == ["Warm", " voice"]
+        assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+
+    @pytest.mark.asyncio
+    @patch('app.services.prompt_service.get_openai_client')
+    async def test_translate_served_from_cache(self, mock_get_client):
+        """Test that repeated translations hit the cache and fresh bypasses it."""
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(return_value=make_completion("Warm voice"))
+        mock_get_client.return_value = mock_client
+
+        cmd = TranslateVoiceDescriptionCommand(voice_description="Ciepły głos")
+        assert await prompt_service.translate_voice_description(cmd) == "Warm voice"
+        assert await prompt_service.translate_voice_description(cmd) == "Warm voice"
+        assert mock_client.chat.completions.create.await_count == 1
+
+        fresh_cmd = TranslateVoiceDescriptionCommand(voice_description="Ciepły głos", fresh=True)
+        await prompt_service.translate_voice_description(fresh_cmd)
+        assert mock_client.chat.completions.create.await_count == 2
+
+    @pytest.mark.asyncio
+    @patch('app.services.prompt_service.get_openai_client')
+    async def test_records_cached_prompt_tokens(self, mock_get_client):
+        """Test that cached prompt tokens are recorded per operation."""
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(
+            return_value=make_completion("Better prompt", usage=make_usage(2000, 1792, 120))
+        )
+        mock_get_client.return_value = mock_client
+
+        await prompt_service.improve_prompt(PromptImprovementCommand(prompt="A voice"))
+
+        labels = {"operation": "improve_prompt", "model": prompt_service.OPENAI_MODEL}
+        assert self.metrics.get("openai_requests_total", **labels) == 1
+        assert self.metrics.get("openai_prompt_tokens_total", **labels) == 2000
+        assert self.metrics.get("openai_cached_prompt_tokens_total", **labels) == 1792
+
+    @pytest.mark.asyncio
+    @patch('app.services.prompt_service.get_openai_client')
+    async def test_stream_records_usage_from_final_chunk(self, mock_get_client):
+        """Test that streamed calls request and record usage."""
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(
+            return_value=async_iter([make_chunk("Text"), make_usage_chunk(make_usage(300, 0, 40))])
+        )
+        mock_get_client.return_value = mock_client
+
+        cmd = GenerateSampleTextCommand(voice_description="A deep, calm narrator voice")
+        deltas = [delta async for delta in prompt_service.stream_generate_sample_text(cmd)]
+
+        assert deltas == ["Text"]
+        assert mock_client.chat.completions.create.call_args.kwargs["stream_options"] == {"include_usage": True}
+        assert self.metrics.get("openai_completion_tokens_total", operation="generate_sample_text", model=prompt_service.OPENAI_MODEL) == 40
@@ -0,0 +1,212 @@
+"""
+Unit tests for Quota Service.
+"""
+
+import asyncio
+import threading
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+from app.services.quota_service import QuotaLedger, QuotaExceededError
+from app.services.audio_cache import AudioCache
+from app.services.deadline import Deadline, DeadlineExceededError
+from app.services.voice_service import synthesize_speech, design_voice, ElevenLabsSpeechBackend
+from app.services.speech_backends import SpeechBackendRouter
+from app.models import TextToSpeechCommand, DesignVoiceCommand, QuotaPeriod
+
+
+class TestQuotaLedger:
+    """Test cases for QuotaLedger class."""
+
+    def test_reservation_counts_until_released(self):
+        """Test that in-flight reservations count against the budget."""
+        ledger = QuotaLedger(daily_limit=100, soft_limit_ratio=1.0)
+        reservation = ledger.reserve("voice_1", 60)
+
+        with pytest.raises(QuotaExceededError, match="overall, daily"):
+            ledger.reserve("voice_2", 50)
+
+        ledger.release(reservation)
+        ledger.reserve("voice_2", 50)
+
+    def test_commit_uses_actual_characters(self):
+        """Test that committed spend is reconciled with the billed characters."""
+        ledger = QuotaLedger(monthly_limit=1000)
+        reservation = ledger.reserve("voice_1", 100)
+        reservation.record_actual(80)
+        ledger.commit(reservation)
+
+        usage = next(u for u in ledger.status().usages if u.period == QuotaPeriod.monthly)
+        assert usage.used == 80
+        assert usage.reserved == 0
+
+    def test_retried_attempts_add_up(self):
+        """Test that every billed attempt of a retried request is counted."""
+        ledger = QuotaLedger(monthly_limit=1000)
+        reservation = ledger.reserve("voice_1", 100)
+        reservation.record_actual(80)
+        reservation.record_actual(80)
+        ledger.commit(reservation)
+
+        usage = next(u for u in ledger.status().usages if u.period == QuotaPeriod.monthly)
+        assert usage.used == 160
+
+    def test_per_voice_budget(self):
+        """Test that one voice exhausting its budget does not block others."""
+        ledger = QuotaLedger(voice_daily_limit=100, soft_limit_ratio=1.0)
+        ledger.commit(ledger.reserve("voice_1", 90))
+
+        with pytest.raises(QuotaExceededError, match="voice voice_1"):
+            ledger.reserve("voice_1", 20)
+        ledger.reserve("voice_2", 20)
+
+    def test_soft_limit_leaves_headroom(self):
+        """Test that requests are refused before the budget is fully spent."""
+        ledger = QuotaLedger(daily_limit=1000, soft_limit_ratio=0.9)
+        ledger.commit(ledger.reserve(None, 850))
+
+        with pytest.raises(QuotaExceededError):
+            ledger.reserve(None, 100)
+        assert not ledger.is_degraded()
+
+        ledger.commit(ledger.reserve(None, 50))
+        assert ledger.is_degraded()
+
+    def test_subscription_usage_is_enforced(self):
+        """Test that ElevenLabs-reported usage limits admission."""
+        ledger = QuotaLedger(soft_limit_ratio=1.0)
+        ledger.sync_subscription(character_count=9950, character_limit=10000)
+
+        with pytest.raises(QuotaExceededError, match="subscription"):
+            ledger.reserve("voice_1", 100)
+        ledger.reserve("voice_1", 50)
+
+    def test_subscription_refresh_is_claimed_once(self):
+        """Test that only one caller refreshes stale subscription usage."""
+        ledger = QuotaLedger()
+
+        assert ledger.begin_subscription_refresh()
+        assert not ledger.begin_subscription_refresh()
+        ledger.sync_subscription(character_count=0, character_limit=10000)
+        assert not ledger.begin_subscription_refresh()
+
+
+class TestQuotaAwareSynthesis:
+    """Test cases for quota admission in voice_service."""
+
+    @pytest.fixture(autouse=True)
+    def elevenlabs_only(self):
+        """Keep the local engine out, so quota rejections reach the caller."""
+        with patch('app.services.voice_service.get_speech_backend_router', return_value=SpeechBackendRouter([ElevenLabsSpeechBackend()])):
+            yield
+
+    def make_client(self, audio: bytes = b"audio", character_count: int | None = None) -> MagicMock:
+        client = MagicMock()
+
+        def generate_speech(voice_id, text, deadline, on_character_count, model_id, first_audio_deadline=None, on_first_audio=None):
+            if character_count is not None:
+                on_character_count(character_count)
+            return audio
+
+        client.generate_speech.side_effect = generate_speech
+        client.get_subscription_usage.return_value = {"character_count": 0, "character_limit": 1_000_000}
+        return client
+
+    @pytest.mark.asyncio
+    async def test_reconciles_with_billed_characters_and_caches(self):
+        """Test that synthesis commits billed characters and repeats are served from cache."""
+        ledger = QuotaLedger(daily_limit=1000)
+        client = self.make_client(character_count=3)
+        command = TextToSpeechCommand(voice_id="voice_1", text="Hello")
+
+        with patch('app.services.voice_service.create_elevenlabs_client', return_value=client), \
+             patch('app.services.voice_service.get_quota_ledger', return_value=ledger), \
+             patch('app.services.voice_service.get_audio_cache', return_value=AudioCache()):
+            assert await synthesize_speech(command) == b"audio"
+            assert await synthesize_speech(command) == b"audio"
+
+        assert client.generate_speech.call_count == 1
+        daily = next(u for u in ledger.status().usages if u.scope == "overall" and u.period == QuotaPeriod.daily)
+        assert daily.used == 3
+
+    @pytest.mark.asyncio
+    async def test_degraded_mode_serves_only_cached_audio(self):
+        """Test that a nearly exhausted budget still plays cached phrases but refuses new ones."""
+        ledger = QuotaLedger(daily_limit=100, soft_limit_ratio=1.0)
+        cache = AudioCache()
+        client = self.make_client()
+
+        with patch('app.services.voice_service.create_elevenlabs_client', return_value=client), \
+             patch('app.services.voice_service.get_quota_ledger', return_value=ledger), \
+             patch('app.services.voice_service.get_audio_cache', return_value=cache):
+            await synthesize_speech(TextToSpeechCommand(voice_id="voice_1", text="a" * 95))
+
+            assert await synthesize_speech(TextToSpeechCommand(voice_id="voice_1", text="a" * 95)) == b"audio"
+            with pytest.raises(QuotaExceededError):
+                await synthesize_speech(TextToSpeechCommand(voice_id="voice_1", text="b" * 10))
+
+        assert client.generate_speech.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_request_releases_reservation(self):
+        """Test that characters are not counted when the upstream call fails."""
+        ledger = QuotaLedger(daily_limit=1000)
+        client = self.make_client()
+        client.generate_speech.side_effect = Exception("Failed to generate speech: boom")
+
+        with patch('app.services.voice_service.create_elevenlabs_client', return_value=client), \
+             patch('app.services.voice_service.get_quota_ledger', return_value=ledger), \
+             patch('app.services.voice_service.get_audio_cache', return_value=AudioCache()):
+            with pytest.raises(Exception, match="TTS generation failed"):
+                await synthesize_speech(TextToSpeechCommand(voice_id="voice_1", text="Hello"))
+
+        daily = next(u for u in ledger.status().usages if u.scope == "overall")
+        assert daily.used == 0
+        assert daily.reserved == 0
+
+    @pytest.mark.asyncio
+    async def test_request_finishing_after_timeout_is_committed(self):
+        """Test that characters billed after the caller timed out are still counted."""
+        ledger = QuotaLedger(daily_limit=1000)
+        client = self.make_client(character_count=5)
+        release = threading.Event()
+        finished = threading.Event()
+        generate_speech = client.generate_speech.side_effect
+
+        def slow_generate_speech(**kwargs):
+            release.wait(5)
+            try:
+                return generate_speech(**kwargs)
+            finally:
+                finished.set()
+
+        client.generate_speech.side_effect = slow_generate_speech
+
+        with patch('app.services.voice_service.create_elevenlabs_client', return_value=client), \
+             patch('app.services.voice_service.get_quota_ledger', return_value=ledger), \
+             patch('app.services.voice_service.get_audio_cache', return_value=AudioCache()):
+            with pytest.raises(DeadlineExceededError):
+                await synthesize_speech(TextToSpeechCommand(voice_id="voice_1", text="Hello"), Deadline.after(0.05))
+
+            daily = next(u for u in ledger.status().usages if u.scope == "overall")
+            assert daily.reserved == 5
+            release.set()
+            await asyncio.to_thread(finished.wait, 5)
+            await asyncio.sleep(0.05)
+
+        daily = next(u for u in ledger.status().usages if u.scope == "overall")
+        assert daily.used == 5
+        assert daily.reserved == 0
+
+    def test_design_voice_is_admitted_against_quota(self):
+        """Test that voice design reserves characters and commits the sample text length."""
+        ledger = QuotaLedger(daily_limit=1000, soft_limit_ratio=1.0)
+        client = MagicMock()
+        client.design_voice.return_value = {"previews": [], "text": "t" * 120}
+
+        with patch('app.services.voice_service.create_elevenlabs_client', return_value=client), \
+             patch('app.services.voice_service.get_quota_ledger', return_value=ledger):
+            design_voice(DesignVoiceCommand(prompt="A deep, calm narrator voice"))
+
+        daily = next(u for u in ledger.status().usages if u.period == QuotaPeriod.daily)
+        assert daily.used == 120
@@ -0,0 +1,190 @@
+"""
+Unit tests for the priority rate limiter.
+"""
+
+import asyncio
+import threading
+import time
+import httpx
+import pytest
+from unittest.mock import patch, MagicMock
+from app.services.rate_limiter import PriorityRateLimiter, Priority
+from app.services.deadline import Deadline, DeadlineExceededError
+from app.services.elevenlabs_client import ElevenLabsAPIClient
+from app.services.resilience import ResilientCaller, RetryPolicy
+
+
+class TestPriorityRateLimiter:
+    """Test cases for PriorityRateLimiter class."""
+
+    def test_concurrency_is_capped(self):
+        """Test that no more than max_concurrency requests run at once."""
+        limiter = PriorityRateLimiter("test", max_concurrency=2, requests_per_second=1000, burst=10)
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def call():
+            nonlocal active, peak
+            with limiter.acquire(Priority.interactive):
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.02)
+                with lock:
+                    active -= 1
+
+        threads = [threading.Thread(target=call) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak == 2
+
+    def test_higher_priority_is_served_first(self):
+        """Test that queued realtime requests overtake queued background requests."""
+        limiter = PriorityRateLimiter("test", max_concurrency=1, requests_per_second=1000, burst=10)
+        order = []
+        release = threading.Event()
+
+        def blocker():
+            with limiter.acquire(Priority.background):
+                release.wait()
+
+        def call(priority: Priority):
+            with limiter.acquire(priority):
+                order.append(priority)
+
+        holder = threading.Thread(target=blocker)
+        holder.start()
+        time.sleep(0.01)
+
+        waiters = [threading.Thread(target=call, args=(Priority.background,)) for _ in range(3)]
+        waiters.append(threading.Thread(target=call, args=(Priority.realtime,)))
+        for thread in waiters:
+            thread.start()
+            time.sleep(0.01)
+
+        release.set()
+        holder.join()
+        for thread in waiters:
+            thread.join()
+
+        assert order[0] == Priority.realtime
+
+    def test_token_bucket_limits_rate(self):
+        """Test that requests beyond the burst wait for tokens."""
+        limiter = PriorityRateLimiter("test", max_concurrency=10, requests_per_second=50, burst=1)
+
+        started = time.monotonic()
+        for _ in range(3):
+            with limiter.acquire(Priority.realtime):
+                pass
+
+        # Two refills at 50/s take at least ~40ms
+        assert time.monotonic() - started >= 0.035
+
+    def test_pause_holds_back_requests(self):
+        """Test that pause delays the next admission."""
+        limiter = PriorityRateLimiter("test", max_concurrency=1, requests_per_second=1000, burst=1)
+        limiter.pause(0.05)
+
+        started = time.monotonic()
+        with limiter.acquire(Priority.realtime):
+            pass
+
+        assert time.monotonic() - started >= 0.045
+
+    @pytest.mark.asyncio
+    async def test_async_waiters_share_the_queue(self):
+        """Test that slots held on the event loop count against threads and give up at their deadline."""
+        limiter = PriorityRateLimiter("test", max_concurrency=1, requests_per_second=1000, burst=10)
+
+        def call():
+            with limiter.acquire(Priority.realtime, Deadline.after(0.05)):
+                pass
+
+        async with limiter.acquire_async(Priority.background):
+            with pytest.raises(DeadlineExceededError):
+                await asyncio.to_thread(call)
+            with pytest.raises(DeadlineExceededError):
+                async with limiter.acquire_async(Priority.realtime, Deadline.after(0.05)):
+                    pass
+
+        async with limiter.acquire_async(Priority.realtime):
+            pass
+        assert limiter._in_flight == 0
+        assert limiter._waiters == []
+
+
+class TestElevenLabsClientRateLimiting:
+    """Test cases for rate limiting in ElevenLabsAPIClient."""
+
+    @pytest.fixture
+    def client(self):
+        limiter = PriorityRateLimiter("test", max_concurrency=1, requests_per_second=1000)
+        with patch('app.services.elevenlabs_client.ElevenLabs'):
+            client = ElevenLabsAPIClient(
+                api_key="test-key",
+                rate_limiter=limiter,
+                resilience=ResilientCaller("test", policy=RetryPolicy(max_attempts=1))
+            )
+        return client
+
+    def test_calls_go_through_limiter(self, client):
+        """Test that API calls acquire the limiter with their priority."""
+        raw_response = client.client.text_to_speech.with_raw_response.convert.return_value.__enter__.return_value
+        raw_response.headers = {}
+        raw_response.data = iter([b"abc"])
+        priorities = []
+        acquire = client.rate_limiter.acquire
+
+        def tracking_acquire(priority, deadline=None):
+            priorities.append(priority)
+            return acquire(priority, deadline=deadline)
+
+        with patch.object(client.rate_limiter, 'acquire', tracking_acquire):
+            assert client.generate_speech("voice_1", "Hello") == b"abc"
+            client.delete_voice("voice_1")
+
+        assert priorities == [Priority.realtime, Priority.interactive]
+
+    def test_429_pauses_for_retry_after(self, client):
+        """Test that a 429 response pauses the limiter for the Retry-After period."""
+        error = Exception("status_code: 429, rate limit")
+        error.status_code = 429
+        error.headers = {"retry-after": "2"}
+        client.client.voices.delete.side_effect = error
+        client.rate_limiter.pause = MagicMock()
+
+        with pytest.raises(Exception, match="rate limit exceeded"):
+            client.delete_voice("voice_1")
+
+        client.rate_limiter.pause.assert_called_once_with(2.0)
+
+    def test_billed_speech_is_not_retried(self):
+        """Test that a download failing after the request was billed is not sent again."""
+        limiter = PriorityRateLimiter("test", max_concurrency=1, requests_per_second=1000)
+        with patch('app.services.elevenlabs_client.ElevenLabs'):
+            client = ElevenLabsAPIClient(
+                api_key="test-key",
+                rate_limiter=limiter,
+                resilience=ResilientCaller("test", policy=RetryPolicy(max_attempts=3, base_delay=0.0))
+            )
+        convert = client.client.text_to_speech.with_raw_response.convert
+        raw_response = convert.return_value.__enter__.return_value
+        raw_response.headers = {"x-character-count": "5"}
+
+        def broken_download():
+            yield b"ab"
+            raise httpx.ReadError("connection reset")
+
+        raw_response.data = broken_download()
+        billed = []
+
+        with pytest.raises(Exception, match="Failed to generate speech"):
+            client.generate_speech("voice_1", "Hello", on_character_count=billed.append)
+
+        assert convert.call_count == 1
+        assert billed == [5]
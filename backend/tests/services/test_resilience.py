@@ -0,0 +1,244 @@
+"""
+Unit tests for the resilience layer, run against a local fake upstream server.
+"""
+
+import json
+import threading
+import time
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from openai import AsyncOpenAI
+from app.services.elevenlabs_client import ElevenLabsAPIClient
+from app.services.rate_limiter import PriorityRateLimiter
+from app.services.deadline import DeadlineExceededError, OperationCancelledError
+from app.services.resilience import ResilientCaller, RetryPolicy, CircuitBreaker, CircuitOpenError, CircuitState
+from app.services import prompt_service
+from app.models import PromptImprovementCommand
+
+
+VOICES_BODY = {"voices": [], "has_more": False, "total_count": 0}
+COMPLETION_BODY = {
+    "id": "chatcmpl-1",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4.1-mini",
+    "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "Improved prompt"}}],
+    "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+}
+
+
+class FakeUpstream:
+    """
+    HTTP server answering with scripted responses, the last one repeating forever.
+    """
+
+    def __init__(self, responses: list[tuple[int, dict, dict]]):
+        self.responses = list(responses)
+        self.requests: list[str] = []
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+                upstream.requests.append(self.path)
+                status, headers, body = upstream.responses.pop(0) if len(upstream.responses) > 1 else upstream.responses[0]
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_DELETE = _respond
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def make_caller(max_attempts: int = 3, failure_threshold: int = 5) -> ResilientCaller:
+    return ResilientCaller(
+        "test",
+        policy=RetryPolicy(max_attempts=max_attempts, base_delay=0.01, max_delay=1.0),
+        breaker=CircuitBreaker("test", failure_threshold=failure_threshold, reset_timeout=60)
+    )
+
+
+def make_client(url: str, caller: ResilientCaller) -> ElevenLabsAPIClient:
+    return ElevenLabsAPIClient(
+        api_key="test-key",
+        base_url=url,
+        rate_limiter=PriorityRateLimiter("test", max_concurrency=4, requests_per_second=1000),
+        resilience=caller
+    )
+
+
+class TestElevenLabsResilience:
+    """Test cases for ElevenLabsAPIClient retries and circuit breaking."""
+
+    def test_retries_transient_failure(self):
+        """Test that a 503 is retried and the next success is returned."""
+        with FakeUpstream([(503, {}, {"detail": "busy"}), (200, {}, VOICES_BODY)]) as upstream:
+            voices = make_client(upstream.url, make_caller()).list_voices()
+
+        assert voices == []
+        assert len(upstream.requests) == 2
+
+    def test_honors_retry_after(self):
+        """Test that the Retry-After header sets the retry delay."""
+        with FakeUpstream([(429, {"Retry-After": "0.2"}, {"detail": "slow down"}), (200, {}, VOICES_BODY)]) as upstream:
+            started = time.monotonic()
+            make_client(upstream.url, make_caller()).list_voices()
+
+        assert time.monotonic() - started >= 0.2
+        assert len(upstream.requests) == 2
+
+    def test_client_errors_are_not_retried(self):
+        """Test that a 404 fails immediately."""
+        with FakeUpstream([(404, {}, {"detail": "missing"})]) as upstream:
+            with pytest.raises(Exception, match="not found"):
+                make_client(upstream.url, make_caller()).delete_voice("voice_1")
+
+        assert len(upstream.requests) == 1
+
+    def test_non_idempotent_calls_are_not_retried_on_server_error(self):
+        """Test that voice creation is not repeated after a 500."""
+        with FakeUpstream([(500, {}, {"detail": "boom"})]) as upstream:
+            with pytest.raises(Exception, match="Failed to create voice"):
+                make_client(upstream.url, make_caller()).create_voice_from_preview("Voice", "d" * 20, "gen_1")
+
+        assert len(upstream.requests) == 1
+
+    def test_circuit_opens_after_repeated_failures(self):
+        """Test that calls fail fast without reaching the upstream once the circuit is open."""
+        caller = make_caller(max_attempts=1, failure_threshold=2)
+        with FakeUpstream([(503, {}, {"detail": "down"})]) as upstream:
+            client = make_client(upstream.url, caller)
+            for _ in range(2):
+                with pytest.raises(Exception, match="Failed to retrieve voices"):
+                    client.list_voices()
+
+            with pytest.raises(CircuitOpenError, match="temporarily unavailable"):
+                client.list_voices()
+
+        assert caller.breaker.state == CircuitState.open
+        assert len(upstream.requests) == 2
+
+    def test_caller_deadline_does_not_open_circuit(self):
+        """Test that requests the caller ran out of time for or cancelled do not count as upstream failures."""
+        caller = make_caller(max_attempts=1, failure_threshold=2)
+        errors = [DeadlineExceededError("rate limiter queue"), DeadlineExceededError("download"), OperationCancelledError("download", "superseded")]
+
+        for error in errors:
+            def fail():
+                raise error
+            with pytest.raises(type(error)):
+                caller.call("synthesize", fail)
+
+        assert caller.breaker.state == CircuitState.closed
+
+    def test_cancelled_probe_does_not_close_circuit(self):
+        """Test that a half-open probe the caller abandoned leaves the verdict to the next probe."""
+        caller = make_caller(max_attempts=1, failure_threshold=1)
+        caller.breaker.reset_timeout = 10
+
+        def cancelled():
+            raise OperationCancelledError("download", "requester disconnected")
+
+        with patch('app.services.resilience.time.monotonic', return_value=100.0):
+            caller.breaker.record_failure()
+        with patch('app.services.resilience.time.monotonic', return_value=111.0):
+            with pytest.raises(OperationCancelledError):
+                caller.call("synthesize", cancelled)
+
+            assert caller.breaker.state == CircuitState.half_open
+            caller.breaker.before_call()
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker class."""
+
+    def test_half_open_probe_closes_circuit(self):
+        """Test that a successful probe after the reset timeout closes the circuit."""
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10)
+        with patch('app.services.resilience.time.monotonic', return_value=100.0):
+            breaker.record_failure()
+            with pytest.raises(CircuitOpenError):
+                breaker.before_call()
+
+        with patch('app.services.resilience.time.monotonic', return_value=111.0):
+            breaker.before_call()
+            # Only one probe at a time
+            with pytest.raises(CircuitOpenError):
+                breaker.before_call()
+            breaker.record_success()
+
+        assert breaker.state == CircuitState.closed
+
+
+class TestHedging:
+    """Test cases for hedged reads."""
+
+    def test_slow_request_is_hedged(self):
+        """Test that a second request is sent when the first exceeds the tracked p95."""
+        caller = make_caller()
+        for _ in range(20):
+            caller._tracker("list_voices").record(0.01)
+
+        calls = 0
+        lock = threading.Lock()
+
+        def read():
+            nonlocal calls
+            with lock:
+                calls += 1
+                slow = calls == 1
+            time.sleep(0.5 if slow else 0.01)
+            return "slow" if slow else "fast"
+
+        started = time.monotonic()
+        result = caller.call("list_voices", read, hedge=True)
+
+        assert result == "fast"
+        assert calls == 2
+        assert time.monotonic() - started < 0.3
+
+    def test_no_hedge_without_latency_history(self):
+        """Test that hedging waits until enough latency samples exist."""
+        caller = make_caller()
+        calls = []
+
+        assert caller.call("list_voices", lambda: calls.append(1) or "ok", hedge=True) == "ok"
+        assert len(calls) == 1
+
+
+class TestOpenAIResilience:
+    """Test cases for prompt_service retries."""
+
+    @pytest.mark.asyncio
+    async def test_completion_is_retried(self):
+        """Test that a transient OpenAI failure is retried transparently."""
+        with FakeUpstream([(502, {}, {"error": {"message": "bad gateway"}}), (200, {}, COMPLETION_BODY)]) as upstream:
+            client = AsyncOpenAI(api_key="test-key", base_url=upstream.url, max_retries=0)
+            with patch('app.services.prompt_service.get_openai_client', return_value=client), \
+                 patch('app.services.prompt_service.get_openai_resilience', return_value=make_caller()):
+                result = await prompt_service.improve_prompt(PromptImprovementCommand(prompt="Opis głosu", fresh=True))
+            await client.close()
+
+        assert result == "Improved prompt"
+        assert len(upstream.requests) == 2
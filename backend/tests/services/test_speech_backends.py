@@ -0,0 +1,204 @@
+"""
+Unit tests for Speech Backends.
+"""
+
+import asyncio
+import os
+import stat
+import time
+from collections import deque
+import pytest
+from unittest.mock import patch
+from app.services.speech_backends import FirstAudio, SpeechBackend, SpeechBackendRouter, EspeakSpeechBackend, TIMEOUTS_BEFORE_SKIP
+from app.services.deadline import Deadline
+from app.services.resilience import CircuitOpenError
+from app.services.audio_cache import AudioCache
+from app.services.voice_service import synthesize_speech
+from app.models import TextToSpeechCommand
+
+
+class FakeBackend(SpeechBackend):
+    """Backend streaming audio after a delay until the first chunk and a duration in total, or failing with an error."""
+
+    def __init__(self, name: str, delay: float = 0, error: Exception | None = None, available: bool = True, cacheable: bool = True, duration: float = 0):
+        self.name = name
+        self.delay = delay
+        self.duration = duration
+        self.error = error
+        self.available = available
+        self.cacheable = cacheable
+        self.calls = 0
+        self.deadlines: list[Deadline] = []
+        self.first_audio: list[FirstAudio | None] = []
+
+    def is_available(self) -> bool:
+        return self.available
+
+    async def synthesize(self, voice_id: str, text: str, model_id: str, deadline: Deadline, first_audio: FirstAudio | None = None) -> bytes:
+        self.calls += 1
+        self.deadlines.append(deadline)
+        self.first_audio.append(first_audio)
+        if self.delay:
+            first_audio_deadline = first_audio.deadline if first_audio is not None else deadline
+            await first_audio_deadline.run(asyncio.sleep(self.delay), f"{self.name} first audio")
+        if self.error:
+            raise self.error
+        if first_audio is not None:
+            first_audio.received()
+        if self.duration:
+            await deadline.run(asyncio.sleep(self.duration), f"{self.name} synthesis")
+        return self.name.encode()
+
+
+class TestSpeechBackendRouter:
+    """Test cases for SpeechBackendRouter class."""
+
+    @pytest.mark.asyncio
+    async def test_falls_back_on_outage(self):
+        """Test that the next backend speaks while the preferred one is down."""
+        primary = FakeBackend("elevenlabs", error=CircuitOpenError("ElevenLabs"))
+        router = SpeechBackendRouter([primary, FakeBackend("local")])
+
+        audio, backend = await router.synthesize("voice_1", "Hello", "model", Deadline.after(5))
+
+        assert audio == b"local"
+        assert backend.name == "local"
+
+    @pytest.mark.asyncio
+    async def test_does_not_fall_back_on_invalid_request(self):
+        """Test that errors any backend would hit reach the caller."""
+        local = FakeBackend("local")
+        router = SpeechBackendRouter([FakeBackend("elevenlabs", error=Exception("Voice with ID voice_1 not found")), local])
+
+        with pytest.raises(Exception, match="not found"):
+            await router.synthesize("voice_1", "Hello", "model", Deadline.after(5))
+
+        assert local.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_reports_preferred_error_when_all_fail(self):
+        """Test that the first backend's error explains why there is no speech."""
+        router = SpeechBackendRouter([
+            FakeBackend("elevenlabs", error=CircuitOpenError("ElevenLabs")),
+            FakeBackend("local", error=Exception("Local speech synthesis failed"))
+        ])
+
+        with pytest.raises(CircuitOpenError):
+            await router.synthesize("voice_1", "Hello", "model", Deadline.after(5))
+
+    @pytest.mark.asyncio
+    async def test_slow_backend_is_abandoned_at_latency_budget(self):
+        """Test that a slow upstream is given up after the budget, not the request deadline."""
+        primary = FakeBackend("elevenlabs", delay=2)
+        router = SpeechBackendRouter([primary, FakeBackend("local")], latency_budget=0.05)
+
+        started = time.monotonic()
+        audio, _ = await router.synthesize("voice_1", "Hello", "model", Deadline.after(5))
+
+        assert audio == b"local"
+        assert time.monotonic() - started < 0.5
+        assert primary.first_audio[0].deadline.expired
+        # The real latency is unknown, the budget is not recorded in its place
+        assert router._latencies["elevenlabs"]._samples == deque()
+        assert router._timeouts["elevenlabs"] == 1
+
+    @pytest.mark.asyncio
+    async def test_streaming_backend_may_finish_after_latency_budget(self):
+        """Test that long text is not abandoned once its first audio arrived within the budget."""
+        primary = FakeBackend("elevenlabs", duration=0.2)
+        router = SpeechBackendRouter([primary, FakeBackend("local")], latency_budget=0.05)
+
+        audio, _ = await router.synthesize("voice_1", "Long text " * 100, "model", Deadline.after(5))
+
+        assert audio == b"elevenlabs"
+        assert router._latencies["elevenlabs"]._samples[0] < 0.05
+
+    @pytest.mark.asyncio
+    async def test_backend_timing_out_repeatedly_is_skipped(self):
+        """Test that consecutive first audio timeouts make the router skip a backend."""
+        primary = FakeBackend("elevenlabs", delay=2)
+        router = SpeechBackendRouter([primary, FakeBackend("local")], latency_budget=0.01, probe_interval=100)
+
+        for _ in range(TIMEOUTS_BEFORE_SKIP + 2):
+            await router.synthesize("voice_1", "Hello", "model", Deadline.after(5))
+
+        assert primary.calls == TIMEOUTS_BEFORE_SKIP
+
+    @pytest.mark.asyncio
+    async def test_unavailable_backend_is_skipped(self):
+        """Test that a backend reporting itself unavailable is not called."""
+        primary = FakeBackend("elevenlabs", available=False)
+        router = SpeechBackendRouter([primary, FakeBackend("local")])
+
+        audio, _ = await router.synthesize("voice_1", "Hello", "model", Deadline.after(5))
+
+        assert audio == b"local"
+        assert primary.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_backend_is_skipped_but_probed(self):
+        """Test that a backend slower than the budget is only tried by periodic probes."""
+        primary = FakeBackend("elevenlabs")
+        router = SpeechBackendRouter([primary, FakeBackend("local")], latency_budget=1, probe_interval=5)
+        for _ in range(20):
+            router._latencies["elevenlabs"].record(2)
+
+        for _ in range(10):
+            await router.synthesize("voice_1", "Hello", "model", Deadline.after(5))
+
+        assert primary.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_request_cancellation_reaches_backend(self):
+        """Test that cancelling the request deadline cancels the backend's child deadline."""
+        deadline = Deadline.after(5)
+        child = deadline.within(1)
+
+        deadline.cancel("superseded")
+
+        assert child.cancelled
+        assert child.cancel_reason == "superseded"
+        assert child.expires_at <= deadline.expires_at
+
+
+class TestEspeakSpeechBackend:
+    """Test cases for EspeakSpeechBackend class."""
+
+    @pytest.fixture
+    def fake_espeak(self, tmp_path):
+        """Executable that echoes its arguments and stdin, standing in for espeak-ng."""
+        script = tmp_path / "espeak-ng"
+        script.write_text('#!/bin/sh\necho "$@"\ncat\n')
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        return str(script)
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(os.name != "posix", reason="uses a shell script as fake engine")
+    async def test_text_is_passed_on_stdin(self, fake_espeak):
+        """Test that text is never parsed as command line options."""
+        backend = EspeakSpeechBackend(binary=fake_espeak, voice="de")
+
+        audio = await backend.synthesize("voice_1", "--help me", "model", Deadline.after(5))
+
+        assert audio == b"-v de --stdout\n--help me"
+
+    def test_unavailable_without_binary(self):
+        """Test that a missing engine is reported unavailable."""
+        assert not EspeakSpeechBackend(binary="definitely-not-installed-tts").is_available()
+
+
+class TestSynthesisFallback:
+    """Test cases for backend routing in synthesize_speech."""
+
+    @pytest.mark.asyncio
+    async def test_fallback_audio_is_not_cached(self):
+        """Test that robotic fallback audio is not served once ElevenLabs is back."""
+        router = SpeechBackendRouter([FakeBackend("local", cacheable=False)])
+        cache = AudioCache()
+
+        with patch('app.services.voice_service.get_speech_backend_router', return_value=router), \
+             patch('app.services.voice_service.get_audio_cache', return_value=cache):
+            audio = await synthesize_speech(TextToSpeechCommand(voice_id="voice_1", text="Hello"))
+
+        assert audio == b"local"
+        assert cache._size == 0
@@ -0,0 +1,71 @@
+"""
+Unit tests for TTS Model Router.
+"""
+
+import pytest
+from unittest.mock import patch, MagicMock
+from app.services.tts_model_router import TTSModelRouter, detect_script, LOW_LATENCY_TTS_MODEL
+from app.services.elevenlabs_client import DEFAULT_TTS_MODEL, NEW_TTS_MODEL
+from app.services.quota_service import QuotaLedger
+from app.services.audio_cache import AudioCache
+from app.services.voice_service import synthesize_speech
+from app.models import SpeechQuality, TextToSpeechCommand
+
+
+class TestTTSModelRouter:
+    """Test cases for TTSModelRouter class."""
+
+    def test_short_text_uses_low_latency_model(self):
+        """Test that short interactive lines go to the low-latency model."""
+        router = TTSModelRouter(short_text_characters=50)
+
+        assert router.select("Hello there!") == LOW_LATENCY_TTS_MODEL
+
+    def test_long_text_uses_quality_model(self):
+        """Test that long-form text goes to the quality model."""
+        router = TTSModelRouter(short_text_characters=50)
+
+        assert router.select("word " * 20) == DEFAULT_TTS_MODEL
+
+    def test_quality_hint_overrides_length(self):
+        """Test that the per-request hint wins over the length rule."""
+        router = TTSModelRouter(short_text_characters=50)
+
+        assert router.select("Hello there!", SpeechQuality.high) == DEFAULT_TTS_MODEL
+        assert router.select("word " * 20, SpeechQuality.fast) == LOW_LATENCY_TTS_MODEL
+
+    def test_unsupported_script_uses_wide_language_model(self):
+        """Test that text the other models cannot speak goes to the widest-coverage model."""
+        router = TTSModelRouter()
+
+        assert router.select("שלום עולם", SpeechQuality.fast) == NEW_TTS_MODEL
+        assert router.select("Привет, мир") == LOW_LATENCY_TTS_MODEL
+
+    def test_detect_script(self):
+        """Test dominant script detection."""
+        assert detect_script("Hello, world") == "LATIN"
+        assert detect_script("こんにちは") == "HIRAGANA"
+        assert detect_script("안녕하세요 OK") == "HANGUL"
+        assert detect_script("123 !?") is None
+
+
+class TestModelRoutedSynthesis:
+    """Test cases for model routing in synthesize_speech."""
+
+    @pytest.mark.asyncio
+    async def test_model_is_part_of_cache_key(self):
+        """Test that audio cached for one model is not served for another."""
+        client = MagicMock()
+        client.generate_speech.return_value = b"audio"
+        client.get_subscription_usage.return_value = {"character_count": 0, "character_limit": 1_000_000}
+        command = TextToSpeechCommand(voice_id="voice_1", text="Hello")
+
+        with patch('app.services.voice_service.create_elevenlabs_client', return_value=client), \
+             patch('app.services.voice_service.get_quota_ledger', return_value=QuotaLedger()), \
+             patch('app.services.voice_service.get_audio_cache', return_value=AudioCache()):
+            await synthesize_speech(command)
+            await synthesize_speech(command)
+            await synthesize_speech(command.model_copy(update={"quality": SpeechQuality.high}))
+
+        models = [call.kwargs["model_id"] for call in client.generate_speech.call_args_list]
+        assert models == [LOW_LATENCY_TTS_MODEL, DEFAULT_TTS_MODEL]
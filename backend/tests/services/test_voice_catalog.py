@@ -0,0 +1,100 @@
+"""
+Unit tests for Voice Catalog.
+"""
+
+import time
+from datetime import datetime
+from app.services.voice_catalog import VoiceCatalog
+from app.models import VoiceDetailDTO
+
+
+def make_voice(voice_id: str, name: str = "Voice") -> VoiceDetailDTO:
+    return VoiceDetailDTO(
+        id=voice_id,
+        name=name,
+        prompt="A calm narrator voice",
+        created_at=datetime(2025, 1, 1),
+        samples=[]
+    )
+
+
+class TestVoiceCatalog:
+    """Test cases for VoiceCatalog class."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.catalog = VoiceCatalog(epoch=0)
+
+    def test_changes_since_zero_returns_full_sync(self):
+        """Test that version 0 returns the whole catalog."""
+        self.catalog.sync([make_voice("v1"), make_voice("v2")])
+
+        result = self.catalog.changes_since(0)
+
+        assert result.full_sync is True
+        assert result.version == 1
+        assert {voice.id for voice in result.upserted} == {"v1", "v2"}
+
+    def test_sync_without_changes_keeps_version(self):
+        """Test that re-syncing an identical listing does not bump the version."""
+        self.catalog.sync([make_voice("v1")])
+
+        assert self.catalog.sync([make_voice("v1")]) == 1
+
+    def test_changes_since_returns_only_delta(self):
+        """Test that only voices changed after the given version are returned."""
+        version = self.catalog.sync([make_voice("v1"), make_voice("v2")])
+
+        self.catalog.upsert(make_voice("v3"))
+        self.catalog.remove("v1")
+
+        result = self.catalog.changes_since(version)
+
+        assert result.full_sync is False
+        assert result.version == version + 2
+        assert [voice.id for voice in result.upserted] == ["v3"]
+        assert result.deleted == ["v1"]
+
+    def test_sync_records_updates_and_deletions(self):
+        """Test that a sync diffs against the cached library."""
+        version = self.catalog.sync([make_voice("v1"), make_voice("v2")])
+
+        self.catalog.sync([make_voice("v1", name="Renamed")])
+
+        result = self.catalog.changes_since(version)
+
+        assert [voice.name for voice in result.upserted] == ["Renamed"]
+        assert result.deleted == ["v2"]
+
+    def test_changes_since_future_version_returns_full_sync(self):
+        """Test that a version from before a restart forces a full sync."""
+        self.catalog.sync([make_voice("v1")])
+
+        result = self.catalog.changes_since(42)
+
+        assert result.full_sync is True
+        assert [voice.id for voice in result.upserted] == ["v1"]
+
+    def test_changes_since_version_of_previous_process_returns_full_sync(self):
+        """Test that a version issued before a restart is never diffed against, even if it is small."""
+        previous = VoiceCatalog(epoch=1_000)
+        previous.sync([make_voice("v1"), make_voice("v2")])
+        version = previous.upsert(make_voice("v3"))
+
+        restarted = VoiceCatalog(epoch=2_000)
+        restarted.sync([make_voice("v1")])
+        restarted.upsert(make_voice("v4"))
+
+        result = restarted.changes_since(version)
+
+        assert result.full_sync is True
+        assert {voice.id for voice in result.upserted} == {"v1", "v4"}
+
+    def test_default_epoch_follows_the_clock(self):
+        """Test that a catalog created later starts above every version of an earlier one."""
+        earlier = VoiceCatalog()
+        earlier_version = earlier.upsert(make_voice("v1"))
+        time.sleep(0.001)
+
+        assert VoiceCatalog().version > earlier_version
+        assert earlier_version < 2 ** 53
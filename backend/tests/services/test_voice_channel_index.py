@@ -0,0 +1,133 @@
+"""
+Unit tests for Voice Channel Index.
+"""
+
+import pytest
+from unittest.mock import Mock, patch
+import discord
+from app.services.voice_channel_index import VoiceChannelIndex
+from app.services.discord_bot_service import DiscordBotManager
+
+
+def make_channel(channel_id: int, name: str, connect: bool = True) -> Mock:
+    channel = Mock(spec=discord.VoiceChannel)
+    channel.id = channel_id
+    channel.name = name
+    channel.permissions_for.return_value.connect = connect
+    return channel
+
+
+def make_guild(guild_id: int, name: str, channels: list[Mock]) -> Mock:
+    guild = Mock()
+    guild.id = guild_id
+    guild.name = name
+    guild.voice_channels = channels
+    for channel in channels:
+        channel.guild = guild
+    return guild
+
+
+class TestVoiceChannelIndex:
+    """Test cases for VoiceChannelIndex class."""
+
+    def test_lists_connectable_channels(self):
+        """Test that only channels the bot may join are listed, with their guild."""
+        index = VoiceChannelIndex()
+        index.rebuild([make_guild(1, "Server", [make_channel(10, "General"), make_channel(11, "Private", connect=False)])])
+
+        channels = index.channels()
+
+        assert [(c.id, c.name, c.guild_id) for c in channels] == [("10", "Server - General", "1")]
+
+    def test_pagination_and_guild_filter(self):
+        """Test paging across guilds and filtering by guild."""
+        index = VoiceChannelIndex()
+        index.rebuild([
+            make_guild(1, "A", [make_channel(10, "one"), make_channel(11, "two")]),
+            make_guild(2, "B", [make_channel(20, "three")])
+        ])
+
+        assert [c.id for c in index.channels(page=1, limit=2)] == ["10", "11"]
+        assert [c.id for c in index.channels(page=2, limit=2)] == ["20"]
+        assert index.channels(page=3, limit=2) == []
+        assert [c.id for c in index.channels(guild_id="2")] == ["20"]
+        assert index.channels(guild_id="3") == []
+
+    def test_listing_does_not_check_permissions(self):
+        """Test that listing is served from the index without touching guilds."""
+        channel = make_channel(10, "General")
+        index = VoiceChannelIndex()
+        index.rebuild([make_guild(1, "A", [channel])])
+        channel.permissions_for.reset_mock()
+
+        for _ in range(5):
+            index.channels()
+
+        channel.permissions_for.assert_not_called()
+
+    def test_guild_changes_only_reindex_that_guild(self):
+        """Test updating and removing single guilds."""
+        guild_a = make_guild(1, "A", [make_channel(10, "one")])
+        guild_b = make_guild(2, "B", [make_channel(20, "two")])
+        index = VoiceChannelIndex()
+        index.rebuild([guild_a, guild_b])
+
+        guild_a.voice_channels[0].permissions_for.return_value.connect = False
+        index.index_guild(guild_a)
+        assert [c.id for c in index.channels()] == ["20"]
+
+        index.remove_guild(guild_b)
+        assert index.channels() == []
+
+
+class TestChannelIndexEvents:
+    """Test cases for gateway events updating the index of DiscordBotManager."""
+
+    async def make_manager(self) -> DiscordBotManager:
+        """Manager with a real, never started client so its event handlers can be called directly."""
+        manager = DiscordBotManager()
+        with patch('app.services.discord_bot_service.asyncio.create_task', side_effect=lambda coro: coro.close()):
+            client = await manager.initialize("test_token")
+        client.is_ready = Mock(return_value=True)
+        client._connection.user = Mock(id=99)
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_events_keep_listing_current(self):
+        """Test that joins, channel changes and role changes show up in the listing."""
+        manager = await self.make_manager()
+        client = manager.client
+        guild = make_guild(1, "A", [make_channel(10, "one")])
+        manager._channel_index.rebuild([])
+
+        await client.on_guild_join(guild)
+        assert [c.id for c in await manager.list_channels()] == ["10"]
+
+        created = make_channel(11, "two")
+        created.guild = guild
+        guild.voice_channels = guild.voice_channels + [created]
+        await client.on_guild_channel_create(created)
+        assert [c.id for c in await manager.list_channels()] == ["10", "11"]
+
+        # A role change that takes away the bot's connect permission
+        created.permissions_for.return_value.connect = False
+        await client.on_guild_role_update(Mock(), Mock(guild=guild))
+        assert [c.id for c in await manager.list_channels()] == ["10"]
+
+        await client.on_guild_remove(guild)
+        assert await manager.list_channels() == []
+
+    @pytest.mark.asyncio
+    async def test_other_members_do_not_trigger_reindex(self):
+        """Test that role changes of other members are ignored."""
+        manager = await self.make_manager()
+        client = manager.client
+        guild = make_guild(1, "A", [make_channel(10, "one")])
+        manager._channel_index.rebuild([guild])
+        guild.voice_channels[0].permissions_for.reset_mock()
+
+        await client.on_member_update(Mock(roles=[1]), Mock(id=5, roles=[2], guild=guild))
+        guild.voice_channels[0].permissions_for.assert_not_called()
+
+        await client.on_member_update(Mock(roles=[1]), Mock(id=99, roles=[2], guild=guild))
+        guild.voice_channels[0].permissions_for.assert_called_once()
@@ -0,0 +1,190 @@
+"""
+Unit tests for Voice Service.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from app.services.voice_service import run_design_wizard, design_voice_variants
+from app.models import DesignWizardCommand, DesignVoiceResponseDTO, WizardStage, DesignVoiceCommand, DesignVariant, VoicePreviewDTO
+
+
+class TestDesignWizard:
+    """Test cases for the design wizard pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_runs_sample_text_concurrently_with_prompt_branch(self):
+        """Test that sample text generation overlaps with improve/translate."""
+        running = set()
+        overlapped = []
+
+        async def step(name: str, result: str) -> str:
+            running.add(name)
+            await asyncio.sleep(0.01)
+            overlapped.append(len(running) > 1)
+            running.discard(name)
+            return result
+
+        def design(command):
+            return DesignVoiceResponseDTO(previews=[], text=command.sample_text)
+
+        with patch('app.services.prompt_service.improve_prompt', lambda cmd: step("improve", "Improved voice description text")), \
+             patch('app.services.prompt_service.translate_voice_description', lambda cmd: step("translate", "Translated voice description text")), \
+             patch('app.services.prompt_service.generate_sample_text', lambda cmd: step("sample", "s" * 150)), \
+             patch('app.services.voice_service.design_voice', design):
+            stages = [stage async for stage in run_design_wizard(DesignWizardCommand(prompt="Opis głosu narratora"))]
+
+        assert any(overlapped)
+        assert [stage.stage for stage in stages][-1] == WizardStage.design
+        assert {stage.stage for stage in stages} == set(WizardStage)
+        assert stages[-1].design.text == "s" * 150
+
+    @pytest.mark.asyncio
+    async def test_skips_disabled_stages(self):
+        """Test that provided sample text and disabled steps make no LLM calls."""
+        def design(command):
+            return DesignVoiceResponseDTO(previews=[], text=command.prompt)
+
+        with patch('app.services.voice_service.design_voice', design):
+            command = DesignWizardCommand(
+                prompt="A deep, calm narrator voice",
+                sample_text="t" * 120,
+                improve_prompt=False,
+                translate=False
+            )
+            stages = [stage async for stage in run_design_wizard(command)]
+
+        assert [stage.stage for stage in stages] == [WizardStage.design]
+        assert stages[0].design.text == "A deep, calm narrator voice"
+
+    @pytest.mark.asyncio
+    async def test_stage_failure_is_raised(self):
+        """Test that a failing stage propagates its exception."""
+        async def fail(cmd):
+            raise Exception("External API failure")
+
+        with patch('app.services.prompt_service.improve_prompt', fail), \
+             patch('app.services.prompt_service.generate_sample_text', fail):
+            with pytest.raises(Exception, match="External API failure"):
+                async for _ in run_design_wizard(DesignWizardCommand(prompt="Opis głosu narratora")):
+                    pass
+
+    @pytest.mark.asyncio
+    async def test_failing_branch_cancels_the_other(self):
+        """Test that a failing stage stops the concurrent branch instead of orphaning it."""
+        cancelled = asyncio.Event()
+
+        async def fail(cmd):
+            raise Exception("External API failure")
+
+        async def slow_sample_text(cmd):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with patch('app.services.prompt_service.improve_prompt', fail), \
+             patch('app.services.prompt_service.generate_sample_text', slow_sample_text):
+            with pytest.raises(Exception, match="External API failure"):
+                async for _ in run_design_wizard(DesignWizardCommand(prompt="Opis głosu narratora")):
+                    pass
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+
+class TestDesignVoiceVariants:
+    """Test cases for multi-variant voice design."""
+
+    @pytest.mark.asyncio
+    async def test_variants_run_concurrently_and_merge_in_order(self):
+        """Test that variants are designed in parallel and merged in request order."""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def design(command):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            # Later variants finish first
+            time.sleep(0.05 if command.loudness < 0 else 0.01)
+            with lock:
+                active -= 1
+            preview = VoicePreviewDTO(
+                generated_voice_id=f"gen_{command.loudness}",
+                audio_base64="",
+                media_type="audio/mp3",
+                duration_secs=1.0,
+                loudness=command.loudness,
+                creativity=command.creativity
+            )
+            return DesignVoiceResponseDTO(previews=[preview], text="Sample")
+
+        command = DesignVoiceCommand(
+            prompt="A deep, calm narrator voice",
+            variants=[DesignVariant(loudness=-0.5, creativity=5), DesignVariant(loudness=0.5, creativity=20)]
+        )
+        with patch('app.services.voice_service.design_voice', design):
+            response = await design_voice_variants(command)
+
+        assert peak == 2
+        assert [preview.generated_voice_id for preview in response.previews] == ["gen_-0.5", "gen_0.5"]
+        assert [preview.creativity for preview in response.previews] == [5, 20]
+        assert response.text == "Sample"
+
+    @pytest.mark.asyncio
+    async def test_each_preview_keeps_its_variant_text(self):
+        """Test that auto-generated texts stay with their previews and are not merged."""
+        def design(command):
+            text = f"Text for {command.loudness}"
+            preview = VoicePreviewDTO(
+                generated_voice_id=f"gen_{command.loudness}",
+                audio_base64="",
+                media_type="audio/mp3",
+                duration_secs=1.0,
+                loudness=command.loudness,
+                creativity=command.creativity,
+                text=text
+            )
+            return DesignVoiceResponseDTO(previews=[preview], text=text)
+
+        command = DesignVoiceCommand(
+            prompt="A deep, calm narrator voice",
+            variants=[DesignVariant(loudness=-0.5), DesignVariant(loudness=0.5)]
+        )
+        with patch('app.services.voice_service.design_voice', design):
+            response = await design_voice_variants(command)
+
+        assert [preview.text for preview in response.previews] == ["Text for -0.5", "Text for 0.5"]
+        assert response.text == ""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        """Test that no more than DESIGN_VARIANT_CONCURRENCY designs run at once."""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def design(command):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return DesignVoiceResponseDTO(previews=[], text="Sample")
+
+        command = DesignVoiceCommand(
+            prompt="A deep, calm narrator voice",
+            variants=[DesignVariant(loudness=0.1 * i) for i in range(5)]
+        )
+        with patch('app.services.voice_service.design_voice', design), \
+             patch('app.services.voice_service.DESIGN_VARIANT_CONCURRENCY', 2):
+            await design_voice_variants(command)
+
+        assert peak == 2
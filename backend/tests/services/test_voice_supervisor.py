@@ -0,0 +1,186 @@
+"""
+Unit tests for the voice session supervisor.
+"""
+
+import discord
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+from app.services.metrics import MetricsRegistry
+from app.services.resilience import RetryPolicy
+from app.services.voice_supervisor import VoiceSessionSupervisor, SLOW_CHECKS_BEFORE_RECONNECT
+
+
+class TestVoiceSessionSupervisor:
+    """Test cases for VoiceSessionSupervisor."""
+
+    def setup_method(self):
+        """Set up a ready client whose channel 7 in guild 42 accepts connections."""
+        self.voice_client = Mock()
+        self.voice_client.guild.id = 42
+        self.voice_client.is_connected.return_value = True
+        self.voice_client.latency = 0.05
+        self.voice_client.disconnect = AsyncMock()
+
+        self.new_voice_client = Mock()
+        self.channel = Mock(spec=discord.VoiceChannel)
+        self.channel.name = "General"
+        self.channel.permissions_for.return_value.connect = True
+        self.channel.connect = AsyncMock(return_value=self.new_voice_client)
+
+        self.client = Mock()
+        self.client.is_ready.return_value = True
+        self.client.voice_clients = [self.voice_client]
+        self.client.get_channel.return_value = self.channel
+
+        self.on_reconnected = AsyncMock()
+        self.supervisor = VoiceSessionSupervisor(
+            42,
+            7,
+            get_client=lambda: self.client,
+            on_reconnected=self.on_reconnected,
+            policy=RetryPolicy(max_attempts=3, base_delay=0.0, max_delay=0.0)
+        )
+        self.metrics = MetricsRegistry()
+        self.metrics_patch = patch('app.services.voice_supervisor.get_metrics_registry', return_value=self.metrics)
+        self.metrics_patch.start()
+
+    def teardown_method(self):
+        self.metrics_patch.stop()
+
+    def test_check_healthy_connection(self):
+        """Test that a connected session with normal latency is left alone."""
+        assert self.supervisor.check() is False
+
+    def test_check_dropped_connection(self):
+        """Test that a missing or disconnected voice client needs a reconnect."""
+        self.voice_client.is_connected.return_value = False
+        assert self.supervisor.check() is True
+
+        self.client.voice_clients = []
+        assert self.supervisor.check() is True
+
+    def test_check_waits_for_gateway(self):
+        """Test that nothing is reconnected while the gateway itself is down."""
+        self.client.is_ready.return_value = False
+        self.client.voice_clients = []
+
+        assert self.supervisor.check() is False
+
+    def test_check_sustained_high_latency(self):
+        """Test that only repeated slow heartbeats trigger a reconnect."""
+        self.voice_client.latency = 5.0
+
+        results = [self.supervisor.check() for _ in range(SLOW_CHECKS_BEFORE_RECONNECT)]
+
+        assert results[-1] is True
+        assert not any(results[:-1])
+
+    @pytest.mark.asyncio
+    async def test_reconnect_replaces_stale_connection(self):
+        """Test that the stale client is dropped and playback is handed the new one."""
+        assert await self.supervisor.reconnect() is True
+
+        self.voice_client.disconnect.assert_awaited_once_with(force=True)
+        self.channel.connect.assert_awaited_once()
+        self.on_reconnected.assert_awaited_once_with(self.new_voice_client)
+        assert self.supervisor.reconnecting is False
+        assert self.metrics.get("voice_reconnects_total", result="success") == 1
+
+    @pytest.mark.asyncio
+    async def test_reconnect_retries_with_backoff(self):
+        """Test that failed attempts are retried until one succeeds."""
+        self.client.voice_clients = []
+        self.channel.connect.side_effect = [TimeoutError(), self.new_voice_client]
+
+        with patch('app.services.voice_supervisor.asyncio.sleep', AsyncMock()) as sleep:
+            assert await self.supervisor.reconnect() is True
+
+        sleep.assert_awaited_once()
+        assert self.metrics.get("voice_reconnects_total", result="failure") == 1
+        assert self.metrics.get("voice_reconnects_total", result="success") == 1
+
+    @pytest.mark.asyncio
+    async def test_reconnect_gives_up_after_max_attempts(self):
+        """Test that supervision ends once the retry policy is exhausted."""
+        self.client.voice_clients = []
+        self.channel.connect.side_effect = TimeoutError()
+
+        with patch('app.services.voice_supervisor.asyncio.sleep', AsyncMock()):
+            assert await self.supervisor.reconnect() is False
+
+        assert self.channel.connect.await_count == 3
+        self.on_reconnected.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_reconnect_gives_up_without_permission(self):
+        """Test that a channel the bot may no longer join is not retried."""
+        self.channel.permissions_for.return_value.connect = False
+
+        assert await self.supervisor.reconnect() is False
+
+        self.channel.connect.assert_not_awaited()
+        assert self.metrics.get("voice_reconnects_total", result="failure") == 1
+
+    def _idle_supervisor(self, idle_timeout: float = 0.0, empty_timeout: float = 0.0) -> VoiceSessionSupervisor:
+        human = Mock(bot=False)
+        self.voice_client.is_playing.return_value = False
+        self.voice_client.channel.members = [human]
+        return VoiceSessionSupervisor(
+            42,
+            7,
+            get_client=lambda: self.client,
+            on_reconnected=self.on_reconnected,
+            on_idle=AsyncMock(),
+            idle_timeout=idle_timeout,
+            empty_timeout=empty_timeout
+        )
+
+    def test_idle_after_inactivity(self):
+        """Test that a session nothing was played in for idle_timeout is released."""
+        supervisor = self._idle_supervisor(idle_timeout=60)
+        assert supervisor.idle_reason() is None
+
+        supervisor.last_activity -= 61
+        assert supervisor.idle_reason() == "inactive"
+
+    def test_playing_counts_as_activity(self):
+        """Test that long playback does not count as inactivity."""
+        supervisor = self._idle_supervisor(idle_timeout=60)
+        supervisor.last_activity -= 61
+        self.voice_client.is_playing.return_value = True
+
+        assert supervisor.idle_reason() is None
+
+    def test_idle_when_channel_has_no_humans(self):
+        """Test that a channel with only bots left is released after empty_timeout."""
+        supervisor = self._idle_supervisor(empty_timeout=30)
+        self.voice_client.channel.members = [Mock(bot=True)]
+
+        with patch('app.services.voice_supervisor.time.monotonic', side_effect=[100.0, 120.0, 131.0]):
+            assert supervisor.idle_reason() is None
+            assert supervisor.idle_reason() is None
+            assert supervisor.idle_reason() == "empty"
+
+    @pytest.mark.asyncio
+    async def test_run_releases_idle_session(self):
+        """Test that supervision hands an idle session to on_idle and ends."""
+        supervisor = self._idle_supervisor(idle_timeout=60)
+        supervisor.check_interval = 0
+        supervisor.last_activity -= 61
+
+        await supervisor._run()
+
+        supervisor.on_idle.assert_awaited_once_with("inactive")
+
+    @pytest.mark.asyncio
+    async def test_run_reports_giving_up(self):
+        """Test that the owner learns when a session cannot be restored."""
+        on_gave_up = Mock()
+        self.supervisor.on_gave_up = on_gave_up
+        self.supervisor.check_interval = 0
+        self.channel.permissions_for.return_value.connect = False
+        self.client.voice_clients = []
+
+        await self.supervisor._run()
+
+        on_gave_up.assert_called_once_with()
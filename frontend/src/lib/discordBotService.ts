@@ -8,7 +8,9 @@ import type {
   ConnectBotCommand, 
   BotConfigCommand, 
   BotConfigResponseDTO,
-  PlayCommand 
+  PlayCommand,
+  BotEventDTO,
+  BotEventType
 } from '../types';
 
 const API_BASE_URL = '/api'; // Proxy to backend
@@ -428,4 +430,31 @@ export async function playAudio(command: PlayCommand): Promise<void> {
       error instanceof Error ? error : undefined
     );
   }
-} 
\ No newline at end of file
+}
+
+const BOT_EVENT_TYPES: BotEventType[] = [
+  'snapshot',
+  'gateway_ready',
+  'gateway_disconnected',
+  'voice_connected',
+  'voice_disconnected',
+  'playback_started',
+  'playback_finished',
+  'playback_failed',
+  'queue_changed',
+];
+
+/**
+ * Subscribe to bot and playback state changes pushed by the server
+ * 
+ * The browser reconnects automatically, and every (re)connection starts with a snapshot event.
+ * 
+ * @param onEvent Called with every event, each one carrying the current bot status
+ * @returns Function that closes the subscription
+ */
+export function subscribeToBotEvents(onEvent: (event: BotEventDTO) => void): () => void {
+  const source = new EventSource(`${API_BASE_URL}/discord-bot/events`);
+  const listener = (message: MessageEvent<string>) => onEvent(JSON.parse(message.data));
+  BOT_EVENT_TYPES.forEach((type) => source.addEventListener(type, listener));
+  return () => source.close();
+}
@@ -14,6 +14,7 @@ import {
   disconnectDiscordBot as disconnectBotApi,
   updateDiscordBotConfig as updateConfigApi,
   playAudio as playAudioApi,
+  subscribeToBotEvents,
   DiscordBotServiceError 
 } from '../discordBotService';
 
@@ -54,6 +55,9 @@ export function useBotStatus(): UseBotStatusResult {
     setStatus(newStatus);
   }, []);
 
+  // The server pushes every state change, so the status stays current without polling
+  useEffect(() => subscribeToBotEvents((event) => setStatus(event.status)), []);
+
   return {
     status,
     isLoading,
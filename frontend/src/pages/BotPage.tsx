@@ -1,4 +1,4 @@
-import { useEffect } from 'react';
+import { useEffect, useState } from 'react';
 import { toast } from 'sonner';
 import { useBotStatus, useChannels, useBotConnection, useBotConfig, usePlaySpeech } from '../lib/hooks/useDiscordBot';
 import { useFetchVoices } from '../lib/hooks/useVoices';
@@ -27,6 +27,9 @@ export default function BotPage() {
   // Audio playback management
   const playAudio = usePlaySpeech();
 
+  // Channel last connected to; the bot leaves idle channels and /play reconnects to it on demand
+  const [playChannelId, setPlayChannelId] = useState<string | null>(null);
+
   // Load initial data
   useEffect(() => {
     const loadInitialData = async () => {
@@ -50,6 +53,7 @@ export default function BotPage() {
   const handleConnectBot = async (command: ConnectBotCommand) => {
     try {
       await botConnection.connectBot(command);
+      setPlayChannelId(command.channelId);
       await botStatus.fetchStatus();
       toast.success('Bot podłączony do kanału głosowego');
     } catch (error) {
@@ -62,6 +66,7 @@ export default function BotPage() {
   const handleDisconnectBot = async () => {
     try {
       const updatedStatus = await botConnection.disconnectBot();
+      setPlayChannelId(null);
       botStatus.updateStatus(updatedStatus);
       toast.success('Bot odłączony od kanału głosowego');
     } catch (error) {
@@ -86,7 +91,8 @@ export default function BotPage() {
   // Handle audio playback
   const handlePlayAudio = async (command: PlayCommand) => {
     try {
-      await playAudio.playAudio(command);
+      const channelId = botStatus.status?.channelId ?? playChannelId;
+      await playAudio.playAudio(channelId ? { ...command, channelId } : command);
       toast.success('Audio odtwarzane przez bota');
     } catch (error) {
       console.error('Failed to play audio:', error);
@@ -162,6 +162,7 @@ export interface DiscordBotStatusDTO {
 export interface VoiceChannelDTO {
   id: string;
   name: string;
+  guildId?: string;
 }
 
 export interface ConnectBotCommand {
@@ -176,9 +177,51 @@ export interface BotConfigCommand {
 export interface BotConfigResponseDTO {
   nickname: string;
   avatarUrl: string;
+  updatedGuilds?: number;
+  skippedGuilds?: number;
+  failedGuilds?: number;
+  avatarUpdated?: boolean;
 }
 
 export interface PlayCommand {
   voiceId: string;
   text: string;
-} 
\ No newline at end of file
+  channelId?: string;
+}
+
+export type BotEventType =
+  | 'snapshot'
+  | 'gateway_ready'
+  | 'gateway_disconnected'
+  | 'voice_connected'
+  | 'voice_disconnected'
+  | 'playback_started'
+  | 'playback_finished'
+  | 'playback_failed'
+  | 'queue_changed';
+
+export interface BotEventDTO {
+  type: BotEventType;
+  status: DiscordBotStatusDTO;
+  queueDepth: number;
+  guildId?: string;
+  detail?: string;
+  createdAt: string;
+}
+
+export type ControlAction = 'play' | 'skip' | 'stop' | 'volume';
+
+export interface ControlCommand {
+  id: string;
+  action: ControlAction;
+  play?: PlayCommand;
+  volume?: number;
+}
+
+export interface ControlReplyDTO {
+  type: 'reply';
+  id: string | null;
+  status: 'accepted' | 'completed' | 'failed';
+  statusCode: number | null;
+  detail: string | null;
+}